@@ -1,44 +1,34 @@
 import sys
-from src.components.data_ingestion import DataIngestion
-from src.components.data_transformation import DataTransformation
-from src.components.data_validation import DataValidation
+import argparse
 from src.config.configuration import Configuration
 from src.exception.exception import CustomException
 from src.logging.logger import logger
+from src.pipeline.runner import PipelineRunner
+from src.pipeline.stages import build_pipeline_stages
 
 
 if __name__ == '__main__':
     try:
-        # Load the configuration file
-        config = Configuration("config/config.yaml")
-
-         # ----------------------- Data Ingestion Phase -----------------------
-        # data_ingestion=DataIngestion(config)
-        # logger.info("Initiate the data ingestion")
-        # data_ingestion.initiate_data_ingestion()
-        # logger.info("✅ Data Initiation Completed")
+        parser = argparse.ArgumentParser(description="Run the network intrusion detection training pipeline.")
+        parser.add_argument("--config", default="config/config.yaml", help="Path to the config file.")
+        parser.add_argument(
+            "--from-stage",
+            default=None,
+            help="Resume at this stage and run everything downstream of it (default: pipeline.from_stage)."
+        )
+        args = parser.parse_args()
 
-        # ----------------------- Data Validation Phase -----------------------
-        logger.info("🔍 Initiating Data Validation...")
-        data_validation = DataValidation(config)
-        data_validation.initiate_data_validation()
-        logger.info("✅ Data Validation completed successfully.")
+        # Load the configuration file
+        config = Configuration(args.config)
 
-        # ----------------------- Data Transformation Phase -----------------------
-        logger.info("🔧 Starting Data Transformation...")
-        data_transformation = DataTransformation(config)
-        data_transformation.initiate_data_transformation()
-        logger.info("✅ Data Transformation completed successfully.")
+        # Stages declare their input/output artifacts; independent stages run concurrently
+        # and stages whose inputs, config and schema are unchanged reuse their cached outputs
+        runner = PipelineRunner(config, build_pipeline_stages(config))
+        report = runner.run(from_stage=args.from_stage or config.get_value("pipeline", "from_stage"))
 
-        # ----------------------- Model Training Phase (Uncomment when needed) -----------------------
-        # logger.info("🏋️‍♂️ Starting Model Training...")
-        # model_trainer_config = ModelTrainerConfig(trainingpipelineconfig)
-        # model_trainer = ModelTrainer(
-        #     model_trainer_config=model_trainer_config,
-        #     data_transformation_artifact=data_transformation_artifact
-        # )
-        # model_trainer_artifact = model_trainer.initiate_model_trainer()
-        # logger.info("✅ Model Training completed and artifact created.")
+        for stage_name, metrics in report.items():
+            logger.info(f"✅ {stage_name}: {metrics['seconds']}s, peak RSS {metrics['peak_rss_mb']} MB"
+                        f"{' (cached)' if metrics['cached'] else ''}")
 
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
@@ -1,12 +1,26 @@
 import os, sys
+import json
 import pandas as pd
-import certifi
-from pymongo.mongo_client import MongoClient
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Iterator, List
+from pymongo import ReadPreference
 from sklearn.model_selection import train_test_split
 
 from src.config.configuration import Configuration
+from src.config.schema import Schema
 from src.logging.logger import logger
 from src.exception.exception import CustomException
+from src.utils.mongo_client import get_mongo_client
+from src.utils.push_data_to_db import INGESTED_AT_FIELD
+from src.utils.streaming_split import StreamingSplitter
+from src.utils.utils import DataFrameWriter, iter_dataframe_chunks, save_dataframe
+
+# Sampling hashes each document's _id into this many buckets
+SAMPLE_BUCKETS = 2 ** 30
+
+# Temporary field holding a document's sample key; dropped by the final projection
+SAMPLE_KEY_FIELD = "_sample_key"
 
 
 class DataIngestion:
@@ -16,10 +30,185 @@ class DataIngestion:
         """
         try:
             self.configuration: Configuration = configuration
+            self.schema = Schema(self.configuration.get_value("validation", "schema_file"))
+            self.downcast_dtypes = bool(self.configuration.get_value("artifacts", "downcast_dtypes"))
+            # One dtype per column for every streamed file, whatever the values in each chunk
+            self.storage_dtypes = self.schema.get_storage_dtypes() if self.downcast_dtypes else self.schema.get_dtypes()
+            self._export_cutoff = None
             logger.info("Initialized DataIngestion class successfully.")
         except Exception as e:
             raise CustomException(e, sys)
 
+    def get_export_filter(self) -> dict:
+        """
+        Build the MongoDB filter for this export.
+
+        With `ingestion.incremental` enabled, only documents ingested up to a
+        cutoff `ingestion.watermark_lag_seconds` before now are selected, and
+        with a previous export recorded in `ingestion.state_file`, only those
+        ingested after that export's cutoff. Documents are stamped when their
+        batch is sent, so a batch still in flight at export time commits with a
+        timestamp inside the lag and is picked up by the next export instead of
+        falling behind the watermark. Without incremental exports the whole
+        collection is selected.
+        """
+        try:
+            if not self.configuration.get_value("ingestion", "incremental"):
+                return {}
+
+            lag_seconds = self.configuration.get_value("ingestion", "watermark_lag_seconds") or 0
+            self._export_cutoff = datetime.now(timezone.utc) - timedelta(seconds=lag_seconds)
+            bounds = {"$lte": self._export_cutoff}
+
+            state_file = self.configuration.get_value("ingestion", "state_file")
+            if os.path.exists(state_file):
+                with open(state_file, "r") as file:
+                    bounds["$gt"] = datetime.fromisoformat(json.load(file)["last_ingested_at"])
+            logger.info(f"Incremental export: selecting documents ingested in {bounds}.")
+            return {INGESTED_AT_FIELD: bounds}
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_collection(self):
+        """
+        The source collection on the shared client.
+
+        Incremental exports read from the primary: a lagging secondary could
+        miss documents that are already behind the cutoff.
+        """
+        client = get_mongo_client(self.configuration)
+        collection = client[self.configuration.get_db_value('database')][self.configuration.get_db_value('collection')]
+        if self.configuration.get_value("ingestion", "incremental"):
+            collection = collection.with_options(read_preference=ReadPreference.PRIMARY)
+        return collection
+
+    def get_query_filter(self) -> dict:
+        """
+        Combine the incremental export filter with the configured query.
+
+        `ingestion.filter` is passed to MongoDB as-is (e.g. a label subset) and
+        `ingestion.time_window` restricts the ingestion timestamp to an
+        ISO-formatted `start`/`end` range, so unwanted documents never leave
+        the server.
+        """
+        try:
+            conditions = [self.get_export_filter(), self.configuration.get_value("ingestion", "filter") or {}]
+
+            time_window = self.configuration.get_value("ingestion", "time_window") or {}
+            bounds = {}
+            if time_window.get("start"):
+                bounds["$gte"] = datetime.fromisoformat(str(time_window["start"]))
+            if time_window.get("end"):
+                bounds["$lt"] = datetime.fromisoformat(str(time_window["end"]))
+            if bounds:
+                conditions.append({INGESTED_AT_FIELD: bounds})
+
+            conditions = [condition for condition in conditions if condition]
+            if len(conditions) > 1:
+                return {"$and": conditions}
+            return conditions[0] if conditions else {}
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_projection(self) -> dict:
+        """
+        Server-side projection of the schema columns plus the ingestion timestamp.
+
+        '_id' and any fields outside the schema are never transferred.
+        """
+        projection = {column: 1 for column in self.schema.column_names}
+        projection[INGESTED_AT_FIELD] = 1
+        projection["_id"] = 0
+        return projection
+
+    def get_sampling_stages(self) -> List[dict]:
+        """
+        Aggregation stages for the configured sampling, run on the server.
+
+        Sampling is seeded by `training.random_state`, so a sampled export can
+        be reproduced: each document gets a sample key in [0, SAMPLE_BUCKETS)
+        from its `_id` (the loader's 64-bit content hash, see
+        NetworkDataHandler.compute_document_ids) rotated by the seed, the same
+        kind of hash threshold the streaming split uses.
+        `ingestion.sample_fractions` keeps each document of a listed label whose
+        key falls below its fraction of the buckets (labels not listed are kept
+        in full), which gives a stratified sample without transferring the
+        dropped rows. `ingestion.sample_size` then keeps the documents with the
+        smallest keys.
+        """
+        target_column = self.configuration.get_value("training", "target_columns")
+        random_state = self.configuration.get_value("training", "random_state") or 0
+        sample_fractions = self.configuration.get_value("ingestion", "sample_fractions") or {}
+        sample_size = self.configuration.get_value("ingestion", "sample_size")
+        if not sample_fractions and not sample_size:
+            return []
+
+        # _id mod SAMPLE_BUCKETS, shifted by the seed's offset and brought back into [0, SAMPLE_BUCKETS)
+        offset = (int(random_state) * 2654435761) % SAMPLE_BUCKETS
+        sample_key = {"$mod": [{"$add": [{"$mod": ["$_id", SAMPLE_BUCKETS]}, SAMPLE_BUCKETS + offset]}, SAMPLE_BUCKETS]}
+        stages = [{"$addFields": {SAMPLE_KEY_FIELD: sample_key}}]
+        if sample_fractions:
+            fraction = {
+                "$switch": {
+                    "branches": [
+                        {"case": {"$eq": [f"${target_column}", label]}, "then": float(value)}
+                        for label, value in sample_fractions.items()
+                    ],
+                    "default": 1.0
+                }
+            }
+            stages.append({"$match": {"$expr": {"$lt": [f"${SAMPLE_KEY_FIELD}", {"$multiply": [fraction, SAMPLE_BUCKETS]}]}}})
+        if sample_size:
+            stages.append({"$sort": {SAMPLE_KEY_FIELD: 1, "_id": 1}})
+            stages.append({"$limit": int(sample_size)})
+        return stages
+
+    def open_cursor(self, collection, batch_size: int):
+        """
+        Open a cursor over the documents selected for this export.
+
+        Plain exports run `find` with the filter and projection. When sampling
+        stages or a custom `ingestion.pipeline` are configured, the same filter
+        and projection are wrapped in an aggregation pipeline instead:
+        $match -> sampling -> custom stages -> $project.
+        """
+        try:
+            query_filter = self.get_query_filter()
+            projection = self.get_projection()
+            stages = self.get_sampling_stages() + list(self.configuration.get_value("ingestion", "pipeline") or [])
+
+            if not stages:
+                logger.info(f"Querying MongoDB with filter {query_filter} and a {len(projection) - 1}-field projection.")
+                return collection.find(query_filter, projection).batch_size(batch_size)
+
+            pipeline = ([{"$match": query_filter}] if query_filter else []) + stages + [{"$project": projection}]
+            logger.info(f"Running MongoDB aggregation pipeline: {[next(iter(stage)) for stage in pipeline]}")
+            return collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save_export_state(self) -> None:
+        """
+        Record this export's cutoff, so the next incremental export only pulls
+        documents ingested after it.
+        """
+        try:
+            if self._export_cutoff is None:
+                logger.info("No incremental export ran; export state left unchanged.")
+                return
+
+            state_file = self.configuration.get_value("ingestion", "state_file")
+            os.makedirs(os.path.dirname(state_file), exist_ok=True)
+            with open(state_file, "w") as file:
+                json.dump({"last_ingested_at": self._export_cutoff.isoformat()}, file)
+            logger.info(f"Export state saved to: {state_file}")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def read_data_db(self) -> pd.DataFrame:
         """
         Connect to MongoDB, read data from the specified collection, 
@@ -28,25 +217,11 @@ class DataIngestion:
         try:
             logger.info("Reading data from MongoDB collection.")
 
-            # Get database details from config
-            database_name = self.configuration.get_db_value('database')
-            collection_name = self.configuration.get_db_value('collection')
-            mongo_uri = self.configuration.get_db_value('uri_env_key')
-
-            # Load SSL certificate authority file path for a secure TLS connection
-            ca: str = certifi.where()
+            # Reuse the process-wide MongoDB client
+            collection = self.get_collection()
 
-            # Connect to MongoDB
-            client = MongoClient(
-                mongo_uri,
-                tlsCAFile=ca,
-                connectTimeoutMS=100000,  
-                socketTimeoutMS=100000   
-            )
-            collection = client[database_name][collection_name]
-
-            # Fetch all records from collection
-            data_cursor = collection.find({}).batch_size(10000)
+            # Fetch the selected records (only new ones, for incremental exports) from collection
+            data_cursor = self.open_cursor(collection, batch_size=10000)
             data_list = list(data_cursor)
 
             # Convert list of documents to DataFrame
@@ -57,31 +232,100 @@ class DataIngestion:
                 data_df.drop('_id', axis=1, inplace=True)
                 logger.info("Dropped '_id' column from the DataFrame.")
 
-            logger.info(f"Successfully read {len(data_df)} records from MongoDB.")
+            # The ingestion timestamp is bookkeeping, not a feature
+            if INGESTED_AT_FIELD in data_df.columns:
+                data_df.drop(INGESTED_AT_FIELD, axis=1, inplace=True)
 
-            # Close the MongoDB connection
-            client.close()
+            logger.info(f"Successfully read {len(data_df)} records from MongoDB.")
 
             return data_df
 
         except Exception as e:
             raise CustomException(e, sys)
 
+    def read_data_db_in_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Stream the MongoDB collection as typed DataFrame chunks.
+
+        Documents are pulled from the cursor in batches of `ingestion.chunk_size`
+        and turned straight into a DataFrame with the schema columns and dtypes
+        (downcast when `artifacts.downcast_dtypes` is set), so peak memory is
+        bounded by the chunk size rather than the collection size.
+        """
+        try:
+            logger.info("Streaming data from MongoDB collection in chunks.")
+
+            chunk_size = self.configuration.get_value("ingestion", "chunk_size")
+
+            # Reuse the process-wide MongoDB client
+            collection = self.get_collection()
+            data_cursor = self.open_cursor(collection, batch_size=chunk_size)
+
+            try:
+                total_records = 0
+                while True:
+                    # Pull at most one chunk of documents off the cursor
+                    documents = list(islice(data_cursor, chunk_size))
+                    if not documents:
+                        break
+
+                    # Only the schema columns are kept, which also drops the ingestion timestamp
+                    chunk_df = pd.DataFrame.from_records(documents, columns=self.schema.column_names)
+                    del documents
+
+                    chunk_df = self.schema.cast(chunk_df)
+                    if self.downcast_dtypes:
+                        chunk_df = self.schema.downcast(chunk_df)
+
+                    total_records += len(chunk_df)
+                    logger.info(f"Read chunk of {len(chunk_df)} records ({total_records} so far).")
+                    yield chunk_df
+
+                logger.info(f"Successfully streamed {total_records} records from MongoDB.")
+            finally:
+                # Release the server-side cursor even if the consumer stops early
+                data_cursor.close()
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def export_chunks_into_feature_store(self, chunks: Iterator[pd.DataFrame]) -> int:
+        """
+        Write DataFrame chunks to the feature store one at a time, in the configured artifact format.
+
+        Returns:
+            int: Total number of records written.
+        """
+        try:
+            logger.info("Exporting data chunks to feature store.")
+
+            # Fetch feature store file path from config
+            feature_store_path = self.configuration.get_artifact_path("file_paths", "feature_store")
+            compression = self.configuration.get_value("artifacts", "compression")
+
+            with DataFrameWriter(feature_store_path, compression=compression, dtypes=self.storage_dtypes) as writer:
+                for chunk_df in chunks:
+                    writer.write(chunk_df)
+
+            logger.info(f"Exported {writer.rows_written} records to feature store at: {feature_store_path}")
+            return writer.rows_written
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def export_data_into_feature_store(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Save the ingested data as a CSV file into a local feature store directory.
+        Save the ingested data into a local feature store directory, in the configured artifact format.
         """
         try:
             logger.info("Exporting data to feature store.")
 
             # Fetch feature store file path from config
-            feature_store_path = self.configuration.get_value("file_paths", "feature_store")
-
-            # Create directories if they don't exist
-            os.makedirs(os.path.dirname(feature_store_path), exist_ok=True)
+            feature_store_path = self.configuration.get_artifact_path("file_paths", "feature_store")
+            compression = self.configuration.get_value("artifacts", "compression")
 
-            # Export data as CSV
-            df.to_csv(feature_store_path, index=False, header=True)
+            # Export data in the configured artifact format
+            save_dataframe(feature_store_path, df, compression=compression)
             logger.info(f"Data exported successfully to feature store at: {feature_store_path}")
 
             return df
@@ -91,7 +335,7 @@ class DataIngestion:
 
     def split_train_test(self, df: pd.DataFrame) -> None:
         """
-        Split the data into train and test datasets, and save them as separate CSV files.
+        Split the data into train and test datasets, and save them as separate artifact files.
         """
         try:
             logger.info("Performing train-test split.")
@@ -106,20 +350,75 @@ class DataIngestion:
             logger.info(f"Train set size: {len(train_set)}, Test set size: {len(test_set)}")
 
             # Get file paths for train and test data
-            train_path = self.configuration.get_value("file_paths", "train_data")
-            test_path = self.configuration.get_value("file_paths", "test_data")
+            train_path = self.configuration.get_artifact_path("file_paths", "train_data")
+            test_path = self.configuration.get_artifact_path("file_paths", "test_data")
+            compression = self.configuration.get_value("artifacts", "compression")
+
+            # Export train and test sets in the configured artifact format
+            save_dataframe(train_path, train_set, compression=compression)
+            save_dataframe(test_path, test_set, compression=compression)
+
+            logger.info(f"Train data saved to: {train_path}")
+            logger.info(f"Test data saved to: {test_path}")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def split_train_test_in_chunks(self, read_chunks: Callable[[], Iterator[pd.DataFrame]]) -> int:
+        """
+        Split a stream of chunks into train and test files without materializing the dataset.
 
-            # Create directories if needed
-            os.makedirs(os.path.dirname(train_path), exist_ok=True)
-            os.makedirs(os.path.dirname(test_path), exist_ok=True)
+        Rows are assigned by a hash of their contents and `training.random_state`
+        (see StreamingSplitter), stratified on the target column when
+        `ingestion.stratify_split` is set, and appended to both files chunk by
+        chunk. The assignment does not depend on how the data is chunked.
 
-            # Export train and test sets as CSV files
-            train_set.to_csv(train_path, index=False, header=True)
-            test_set.to_csv(test_path, index=False, header=True)
+        Args:
+            read_chunks (Callable[[], Iterator[pd.DataFrame]]): Returns a fresh
+                iterator over the data; a stratified split reads it twice, once
+                to fit the per-class thresholds.
 
+        Returns:
+            int: Total number of records split.
+        """
+        try:
+            logger.info("Performing streaming train-test split.")
+
+            # Get split parameters from config
+            test_size = self.configuration.get_value("training", "test_size")
+            random_state = self.configuration.get_value("training", "random_state")
+            stratify_column = None
+            if self.configuration.get_value("ingestion", "stratify_split"):
+                stratify_column = self.configuration.get_value("training", "target_columns")
+            splitter = StreamingSplitter(
+                test_size,
+                random_state=random_state,
+                stratify_column=stratify_column,
+                exact_class_rows=self.configuration.get_value("ingestion", "split_exact_class_rows") or 100000
+            )
+            if stratify_column is not None:
+                splitter.fit(read_chunks())
+
+            # Get file paths for train and test data
+            train_path = self.configuration.get_artifact_path("file_paths", "train_data")
+            test_path = self.configuration.get_artifact_path("file_paths", "test_data")
+            compression = self.configuration.get_value("artifacts", "compression")
+
+            with DataFrameWriter(train_path, compression=compression, dtypes=self.storage_dtypes) as train_writer, \
+                    DataFrameWriter(test_path, compression=compression, dtypes=self.storage_dtypes) as test_writer:
+                for chunk_df in read_chunks():
+                    train_chunk, test_chunk = splitter.split(chunk_df)
+                    train_writer.write(train_chunk)
+                    test_writer.write(test_chunk)
+
+            logger.info(f"Train set size: {train_writer.rows_written}, Test set size: {test_writer.rows_written}")
+            if stratify_column is not None:
+                logger.info(f"Test rows per class: {splitter.test_rows}")
             logger.info(f"Train data saved to: {train_path}")
             logger.info(f"Test data saved to: {test_path}")
 
+            return train_writer.rows_written + test_writer.rows_written
+
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -129,18 +428,45 @@ class DataIngestion:
         1. Read data from MongoDB.
         2. Export raw data to feature store.
         3. Split data into train and test files.
+        4. Record the export state when `ingestion.incremental` is enabled.
+
+        With `ingestion.streaming` enabled, every step runs chunk by chunk: the
+        feature store is written as chunks arrive and then re-read in chunks for
+        a hash-based split, so memory stays bounded by `ingestion.chunk_size`.
+        In incremental mode the feature store and splits only hold the documents
+        ingested since the previous export.
         """
         try:
             logger.info("Starting data ingestion process.")
 
-            # 1. Read data from database
-            dataframe = self.read_data_db()
-
-            # 2. Export raw data to feature store
-            dataframe = self.export_data_into_feature_store(dataframe)
-
-            # 3: Split the data into train and test sets
-            self.split_train_test(dataframe)
+            if self.configuration.get_value("ingestion", "streaming"):
+                # 1-2. Stream database chunks straight into the feature store
+                exported_records = self.export_chunks_into_feature_store(self.read_data_db_in_chunks())
+                if exported_records == 0:
+                    logger.info("No documents to export; skipping the train-test split.")
+                    return
+
+                # 3. Split the feature store into train and test sets chunk by chunk
+                feature_store_path = self.configuration.get_artifact_path("file_paths", "feature_store")
+                chunk_size = self.configuration.get_value("ingestion", "chunk_size")
+                self.split_train_test_in_chunks(lambda: iter_dataframe_chunks(feature_store_path, chunk_size))
+            else:
+                # 1. Read data from database
+                dataframe = self.read_data_db()
+
+                # 2. Export raw data to feature store
+                dataframe = self.export_data_into_feature_store(dataframe)
+
+                if dataframe.empty:
+                    logger.info("No documents to export; skipping the train-test split.")
+                    return
+
+                # 3: Split the data into train and test sets
+                self.split_train_test(dataframe)
+
+            # 4. Remember what was exported, for the next incremental run
+            if self.configuration.get_value("ingestion", "incremental"):
+                self.save_export_state()
 
             logger.info("Data ingestion process completed successfully.")
 
@@ -1,15 +1,21 @@
 
 import sys, os
+import json
 import numpy as np
 import pandas as pd
+from typing import List, Optional
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import FunctionTransformer, LabelEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 from src.config.configuration import Configuration
+from src.config.schema import Schema
 from src.exception.exception import CustomException
 from src.logging.logger import logger
-from src.utils.utils import save_numpy_array_data, save_object
+from src.models.fused_preprocessor import FusedPreprocessor, nonfinite_to_nan
+from src.utils.artifact_loader import get_artifact_loader
+from src.utils.streaming_stats import StreamingColumnStats
+from src.utils.utils import count_rows, create_numpy_memmap, iter_dataframe_chunks, save_object
 
 class DataTransformation:
 
@@ -19,21 +25,32 @@ class DataTransformation:
         """
         try:
             self.configuration: Configuration = configuration
+            self.schema = Schema(self.configuration.get_value("validation", "schema_file"))
             logger.info("Initialized DataTransformation class successfully.")
         except Exception as e:
             raise CustomException(e, sys)
 
     def read_data(self, file_path: str) -> pd.DataFrame:
         """
-        Reads a CSV file and returns a DataFrame.
+        Reads a tabular artifact, typed (and optionally downcast) by the schema, and returns a DataFrame.
         """
         try:
             logger.info(f"Reading data from: {file_path}")
-            df = pd.read_csv(file_path)
+            downcast = bool(self.configuration.get_value("artifacts", "downcast_dtypes"))
+            df = self.schema.read_dataframe(file_path, downcast=downcast)
             return df
         except Exception as e:
             raise CustomException(e, sys)
 
+    def get_precision(self) -> str:
+        """
+        Compute and storage dtype of the transformed features ('float32' or 'float64').
+        """
+        precision = self.configuration.get_value("transformation", "precision") or "float64"
+        if precision not in ("float32", "float64"):
+            raise ValueError(f"Unsupported transformation precision: {precision}")
+        return precision
+
     def get_data_transformer_object(self, input_df: pd.DataFrame):
         """
         Creates and returns a ColumnTransformer object containing 
@@ -43,11 +60,15 @@ class DataTransformation:
             logger.info("Creating data transformation pipeline.")
 
             # Identify numerical columns
-            numerical_cols = input_df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+            numerical_cols = input_df.select_dtypes(include="number").columns.tolist()
             logger.info(f"Numerical columns: {numerical_cols}")
 
-            # Numerical pipeline: median imputation + standard scaling
+            # Numerical pipeline: cast to the compute precision + median imputation + standard scaling.
+            # The cast is part of the saved transformer, so inference runs in the same precision;
+            # it also turns +/-inf into NaN so infinite values are imputed like missing ones.
+            precision = self.get_precision()
             num_pipeline = Pipeline(steps=[
+                ("cast", FunctionTransformer(nonfinite_to_nan, kw_args={"dtype": precision}, feature_names_out="one-to-one")),
                 ("imputer", SimpleImputer(strategy="median")),
                 ("scaler", StandardScaler())
             ])
@@ -62,6 +83,199 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def read_datasets(self, file_paths: List[str]) -> List[pd.DataFrame]:
+        """
+        Read several artifacts concurrently through the shared artifact loader.
+
+        Frames already parsed in this process (e.g. by data validation) with the
+        same schema and dtype settings are reused, so they must not be modified in place.
+        """
+        try:
+            downcast = bool(self.configuration.get_value("artifacts", "downcast_dtypes"))
+            reader_key = f"{self.schema.schema_file_path}|downcast={downcast}"
+            return get_artifact_loader(self.configuration).load(file_paths, self.read_data, reader_key)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def read_data_in_chunks(self, file_path: str, chunk_size: int):
+        """
+        Reads a tabular artifact as chunks typed (and optionally downcast) by the schema.
+        """
+        try:
+            downcast = bool(self.configuration.get_value("artifacts", "downcast_dtypes"))
+            for chunk_df in iter_dataframe_chunks(file_path, chunk_size, dtypes=self.schema.get_dtypes()):
+                yield self.schema.downcast(chunk_df) if downcast else chunk_df
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def fit_transformer_in_chunks(self, file_path: str, target_column: str, chunk_size: int):
+        """
+        Fits the preprocessing pipeline and label encoder in one streaming pass.
+
+        Per-column means and variances are accumulated with partial_fit-style
+        updates and medians with quantile sketches (see StreamingColumnStats);
+        the mean and variance the scaler would see after median imputation are
+        then derived analytically. The pipeline from get_data_transformer_object
+        is fitted on a single row of medians, which gives the same fitted
+        structure, and its learned statistics are overwritten with the streamed ones.
+
+        Returns:
+            Tuple[ColumnTransformer, LabelEncoder, int]: Fitted preprocessor, fitted encoder and row count.
+        """
+        try:
+            logger.info(f"Fitting data transformation pipeline out of core on: {file_path}")
+            sketch_size = self.configuration.get_value("transformation", "sketch_size") or 2048
+
+            stats = None
+            labels = set()
+            for chunk_df in self.read_data_in_chunks(file_path, chunk_size):
+                input_features = chunk_df.drop(columns=[target_column])
+                if stats is None:
+                    first_rows = input_features.iloc[:1]
+                    numerical_cols = input_features.select_dtypes(include="number").columns.tolist()
+                    stats = StreamingColumnStats(len(numerical_cols), sketch_size=sketch_size, seed=0)
+
+                values = input_features[numerical_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+                values[np.isinf(values)] = np.nan
+                stats.update(values)
+                labels.update(chunk_df[target_column].dropna().astype(str).unique().tolist())
+
+            if stats is None:
+                raise ValueError(f"No rows to fit the transformer on in: {file_path}")
+
+            medians = stats.medians()
+            mean, var = stats.imputed_moments(medians)
+
+            # Fit on one row of medians; all-missing columns are dropped exactly as in a full fit
+            fit_frame = first_rows.copy()
+            fit_frame[numerical_cols] = medians.reshape(1, -1)
+            preprocessor = self.get_data_transformer_object(fit_frame)
+            preprocessor.fit(fit_frame)
+
+            num_pipeline = preprocessor.named_transformers_["num_pipeline"]
+            num_pipeline.named_steps["imputer"].statistics_ = medians
+            kept = ~np.isnan(medians)
+            scaler = num_pipeline.named_steps["scaler"]
+            scale = np.sqrt(var[kept])
+            scale[scale == 0.0] = 1.0
+            scaler.mean_, scaler.var_, scaler.scale_ = mean[kept], var[kept], scale
+            scaler.n_samples_seen_ = stats.n_rows
+
+            target_encoder = LabelEncoder()
+            target_encoder.classes_ = np.array(sorted(labels), dtype=object)
+
+            logger.info(f"Fitted transformer on {stats.n_rows} rows and {len(numerical_cols)} numerical columns.")
+            return preprocessor, target_encoder, stats.n_rows
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_output_paths(self, split: str):
+        """
+        Output .npy paths of the transformed 'train' or 'test' set.
+
+        With `transformation.array_layout: separate`, features and encoded labels
+        go to their own files; with `combined`, one file holds the features with
+        the label as the last column.
+
+        Returns:
+            Tuple[str, Optional[str]]: (features_path, labels_path); labels_path is None for the combined layout.
+        """
+        if self.configuration.get_value("transformation", "array_layout") == "separate":
+            return (
+                self.configuration.get_value("transformation", f"transformed_{split}_features"),
+                self.configuration.get_value("transformation", f"transformed_{split}_labels")
+            )
+        return self.configuration.get_value("transformation", f"transformed_{split}_data"), None
+
+    def get_input_paths(self) -> List[str]:
+        """
+        Train and test data as validation left them, from `validation.manifest_file`.
+
+        A split with quarantined rows is read from its filtered copy. Otherwise
+        the split file itself is read: a linked or referenced valid copy has the
+        same content, and the artifact loader can reuse the frame validation
+        parsed. Without a manifest (validation has not run) the split files are read.
+        """
+        try:
+            input_paths = [
+                self.configuration.get_artifact_path("file_paths", "train_data"),
+                self.configuration.get_artifact_path("file_paths", "test_data"),
+            ]
+            manifest_path = self.configuration.get_value("validation", "manifest_file")
+            if not manifest_path or not os.path.exists(manifest_path):
+                logger.warning("No validation manifest found; transforming the unvalidated train and test data.")
+                return input_paths
+
+            with open(manifest_path, "r") as file:
+                artifacts = json.load(file)["artifacts"]
+            return [
+                artifacts[split]["path"] if artifacts[split].get("quarantined_rows") else artifacts[split]["source"]
+                for split in ("train", "test")
+            ]
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_artifact_paths(self) -> List[str]:
+        """
+        Artifacts written by initiate_data_transformation.
+        """
+        artifact_paths = [
+            self.configuration.get_value("transformation", "transformer_object"),
+            self.configuration.get_value("transformation", "target_object"),
+        ]
+        if self.configuration.get_value("transformation", "fused_preprocessor_object"):
+            artifact_paths.append(self.configuration.get_value("transformation", "fused_preprocessor_object"))
+        for split in ("train", "test"):
+            artifact_paths.extend(path for path in self.get_output_paths(split) if path is not None)
+        return artifact_paths
+
+    def transform_in_chunks(
+        self,
+        chunks,
+        n_rows: int,
+        preprocessor,
+        target_encoder: LabelEncoder,
+        target_column: str,
+        features_path: str,
+        labels_path: Optional[str] = None
+    ) -> None:
+        """
+        Transforms DataFrame chunks straight into preallocated memory-mapped .npy files.
+
+        Each chunk is transformed and written into its slice of the output, so
+        neither the full transformed matrix nor a features+label copy of it is
+        ever built in memory. Without `labels_path` the encoded label is written
+        as the last column of the features file.
+        """
+        try:
+            n_features = len(preprocessor.get_feature_names_out())
+            precision = self.get_precision()
+            if labels_path is None:
+                features = create_numpy_memmap(features_path, (n_rows, n_features + 1), dtype=precision)
+                labels = features[:, n_features]
+            else:
+                features = create_numpy_memmap(features_path, (n_rows, n_features), dtype=precision)
+                labels = create_numpy_memmap(labels_path, (n_rows,), dtype=np.int32)
+
+            offset = 0
+            for chunk_df in chunks:
+                end = offset + len(chunk_df)
+                features[offset:end, :n_features] = preprocessor.transform(chunk_df.drop(columns=[target_column]))
+                labels[offset:end] = target_encoder.transform(chunk_df[target_column].astype(str))
+                offset = end
+
+            if offset != n_rows:
+                raise ValueError(f"Expected {n_rows} rows but transformed {offset}")
+
+            features.flush()
+            if labels_path is not None:
+                labels.flush()
+            logger.info(f"Transformed {n_rows} rows into: {features_path}" + (f" and {labels_path}" if labels_path else ""))
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def initiate_data_transformation(self):
         """
         Executes the complete data transformation workflow:
@@ -78,39 +292,45 @@ class DataTransformation:
             # Fetch target column name from config
             TARGET_COLUMN = self.configuration.get_value("training", "target_columns")
 
-            # Read train and test datasets
-            train_df = self.read_data(self.configuration.get_value("file_paths", "train_data"))
-            test_df = self.read_data(self.configuration.get_value("file_paths", "test_data"))
+            # Read the validated data, without any quarantined rows
+            train_path, test_path = self.get_input_paths()
 
-            # Separate input features and target labels
-            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
-            target_feature_train_df = train_df[TARGET_COLUMN]
+            chunk_size = self.configuration.get_value("transformation", "chunk_size")
 
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
-            target_feature_test_df = test_df[TARGET_COLUMN]
+            if self.configuration.get_value("transformation", "out_of_core"):
+                # Fit in one streaming pass, then transform both sets chunk by chunk
+                preprocessor, target_encoder, _ = self.fit_transformer_in_chunks(train_path, TARGET_COLUMN, chunk_size)
+                splits = {
+                    "train": (self.read_data_in_chunks(train_path, chunk_size), count_rows(train_path)),
+                    "test": (self.read_data_in_chunks(test_path, chunk_size), count_rows(test_path)),
+                }
+            else:
+                # Read train and test datasets concurrently, reusing frames validation already parsed
+                train_df, test_df = self.read_datasets([train_path, test_path])
 
-            # Get data transformation pipeline
-            preprocessor = self.get_data_transformer_object(input_feature_train_df)
+                # Separate input features and target labels
+                input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN])
 
-            # Fit on training data, then transform both train and test input features
-            transformed_input_train_feature = preprocessor.fit_transform(input_feature_train_df)
-            transformed_input_test_feature = preprocessor.transform(input_feature_test_df)
+                # Get data transformation pipeline and fit it on the training data
+                preprocessor = self.get_data_transformer_object(input_feature_train_df)
+                preprocessor.fit(input_feature_train_df)
+                del input_feature_train_df
 
-            # Encode target labels using LabelEncoder
-            target_encoder = LabelEncoder()
-            target_feature_train_df = target_encoder.fit_transform(target_feature_train_df)
-            target_feature_test_df = target_encoder.transform(target_feature_test_df)
+                # Encode target labels using LabelEncoder
+                target_encoder = LabelEncoder()
+                target_encoder.fit(train_df[TARGET_COLUMN].astype(str))
 
-            # Save transformed train and test data as numpy arrays
-            save_numpy_array_data(
-                self.configuration.get_value("transformation", "transformed_train_data"),
-                np.c_[transformed_input_train_feature, target_feature_train_df]
-            )
+                splits = {
+                    "train": ((train_df.iloc[i:i + chunk_size] for i in range(0, len(train_df), chunk_size)), len(train_df)),
+                    "test": ((test_df.iloc[i:i + chunk_size] for i in range(0, len(test_df), chunk_size)), len(test_df)),
+                }
 
-            save_numpy_array_data(
-                self.configuration.get_value("transformation", "transformed_test_data"),
-                np.c_[transformed_input_test_feature, target_feature_test_df]
-            )
+            # Transform train and test sets into their on-disk numpy arrays, one chunk at a time
+            for split, (chunks, n_rows) in splits.items():
+                features_path, labels_path = self.get_output_paths(split)
+                self.transform_in_chunks(
+                    chunks, n_rows, preprocessor, target_encoder, TARGET_COLUMN, features_path, labels_path
+                )
 
             # Save the preprocessor object and label encoder object for later use
             save_object(
@@ -122,6 +342,13 @@ class DataTransformation:
                 target_encoder
             )
 
+            # Export the fitted preprocessor as the fused kernel used for scoring
+            fused_path = self.configuration.get_value("transformation", "fused_preprocessor_object")
+            if fused_path:
+                input_columns = [column for column in self.schema.column_names if column != TARGET_COLUMN]
+                FusedPreprocessor.from_column_transformer(preprocessor, input_columns).save(fused_path)
+                logger.info(f"Fused preprocessor saved to: {fused_path}")
+
             logger.info("Data transformation process completed successfully.")
 
         except Exception as e:
@@ -1,12 +1,21 @@
 import os
 import sys
+import json
+import argparse
 import pandas as pd
-from scipy.stats import ks_2samp
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 from src.config.configuration import Configuration
+from src.config.schema import Schema
+from src.drift.baseline import DriftBaseline
+from src.drift.ks import KSDriftEngine
+from src.drift.metrics import DriftTestConfig, categorical_histograms, histogram_metrics, numeric_histograms
 from src.exception.exception import CustomException
 from src.logging.logger import logger
-from src.utils.utils import read_yaml_file, write_yaml_file  
+from src.utils.artifact_loader import get_artifact_loader
+from src.utils.utils import atomic_write, link_artifact, read_yaml_file, save_dataframe, write_yaml_file
+from src.validation.schema_validator import SchemaValidator
 
 class DataValidation:
     def __init__(self, configuration: Configuration):
@@ -19,16 +28,32 @@ class DataValidation:
     
             # Load schema config (column definitions) from YAML
             self._schema_config = read_yaml_file(self.config.get_value("validation","schema_file"))
+            self.schema = Schema(self.config.get_value("validation","schema_file"))
+            self._baseline = None
         except Exception as e:
             raise CustomException(e, sys)
 
-    @staticmethod
-    def read_data(file_path: str) -> pd.DataFrame:
+    def read_data(self, file_path: str) -> pd.DataFrame:
         """
-        Read CSV data into a pandas DataFrame.
+        Read a tabular artifact into a pandas DataFrame, typed (and optionally downcast) by the schema.
         """
         try:
-            return pd.read_csv(file_path)
+            downcast = bool(self.config.get_value("artifacts", "downcast_dtypes"))
+            return self.schema.read_dataframe(file_path, downcast=downcast)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def read_datasets(self, file_paths: List[str]) -> List[pd.DataFrame]:
+        """
+        Read several artifacts concurrently through the shared artifact loader.
+
+        Frames already parsed in this process with the same schema and dtype
+        settings are reused, so they must not be modified in place.
+        """
+        try:
+            downcast = bool(self.config.get_value("artifacts", "downcast_dtypes"))
+            reader_key = f"{self.schema.schema_file_path}|downcast={downcast}"
+            return get_artifact_loader(self.config).load(file_paths, self.read_data, reader_key)
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -47,32 +72,95 @@ class DataValidation:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def validate_schema(self, file_paths: dict) -> dict:
+        """
+        Check each named artifact's column names, dtypes, null/inf counts, value
+        ranges and allowed values against the schema, reading it chunk by chunk
+        so memory stays bounded by `validation.schema_chunk_size`, and write the
+        per-column summaries to `validation.schema_report_file`.
+        """
+        try:
+            chunk_size = self.config.get_value("validation","schema_chunk_size") or 100000
+            with ThreadPoolExecutor(max_workers=len(file_paths) or 1) as executor:
+                futures = {
+                    name: executor.submit(SchemaValidator(self.schema).validate_file, file_path, chunk_size)
+                    for name, file_path in file_paths.items()
+                }
+                report = {name: future.result() for name, future in futures.items()}
+
+            for name, summary in report.items():
+                if summary["invalid_values"]:
+                    logger.warning(f"{name} data has {summary['invalid_values']} values that break schema rules.")
+
+            schema_report_file_path = self.config.get_value("validation","schema_report_file")
+            if schema_report_file_path:
+                with atomic_write(schema_report_file_path, "w") as file:
+                    json.dump(report, file, indent=2)
+                logger.info(f"Schema report saved to: {schema_report_file_path}")
+            return report
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def detect_dataset_drift(self, base_df: pd.DataFrame, current_df: pd.DataFrame, threshold=0.05) -> bool:
         """
-        Check for dataset drift using KS-test between base_df and current_df.
+        Check for dataset drift between base_df and current_df.
+        The test and threshold of each column come from `validation.drift_tests`
+        (KS by default, with `threshold`). KS columns run in one batched pass of
+        KSDriftEngine; every other column gets one shared histogram pass from
+        which PSI, Jensen-Shannon distance and chi-square are all computed.
         Writes a YAML report of drift results.
         """
         try:
             status = True
             report = {}
 
-            for column in base_df.columns:
-                d1 = base_df[column]
-                d2 = current_df[column]
+            drift_tests = DriftTestConfig(self.config.get_value("validation","drift_tests"), default_threshold=threshold)
+            column_tests = {column: drift_tests.resolve(column) for column in base_df.columns}
+            n_bins = self.config.get_value("validation","histogram_bins") or 20
+
+            ks_columns = [column for column, (method, _) in column_tests.items() if method == "ks"]
+            ks_results = {}
+            if ks_columns:
+                engine = KSDriftEngine(
+                    n_workers=self.config.get_value("validation","drift_workers"),
+                    sample_size=self.config.get_value("validation","drift_sample_size"),
+                    random_state=self.config.get_value("training","random_state")
+                )
+                ks_results = engine.compute(base_df, current_df, columns=ks_columns)
 
-                test_result = ks_2samp(d1, d2)
-                p_value = test_result.pvalue
+            for column, (method, column_threshold) in column_tests.items():
+                if method == "ks":
+                    result = ks_results[column]
+                    value = result["p_value"]
+                    report[column] = {
+                        "method": method,
+                        "p_value": float(value),
+                        "statistic": float(result["statistic"])
+                    }
+                    if "error_bound" in result:
+                        report[column]["statistic_error_bound"] = float(result["error_bound"])
+                else:
+                    # One binning pass per column feeds every histogram metric
+                    if pd.api.types.is_numeric_dtype(base_df[column]):
+                        base_counts, current_counts = numeric_histograms(
+                            base_df[column].to_numpy(dtype="float64", na_value=float("nan")),
+                            current_df[column].to_numpy(dtype="float64", na_value=float("nan")),
+                            n_bins=n_bins
+                        )
+                    else:
+                        base_counts, current_counts = categorical_histograms(base_df[column], current_df[column])
+                    metrics = histogram_metrics(base_counts, current_counts)
+                    value = metrics[method]
+                    report[column] = {"method": method, **metrics}
 
-                # Drift detected if p-value is below threshold
-                drift_found = p_value < threshold
+                # Drift detected if the test value crosses its threshold
+                drift_found = drift_tests.is_drift(method, value, column_threshold)
 
                 if drift_found:
                     status = False  # If any column has drift, mark status False
 
-                report[column] = {
-                    "p_value": float(p_value),
-                    "drift_status": drift_found
-                }
+                report[column]["threshold"] = column_threshold
+                report[column]["drift_status"] = drift_found
 
             # Write drift report to file
             drift_report_file_path = self.config.get_value("validation","report_file")
@@ -85,53 +173,206 @@ class DataValidation:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def build_drift_baseline(self, reference_df: pd.DataFrame) -> DriftBaseline:
+        """
+        Summarize the reference data into per-column sketches, histograms and
+        null counts, and persist them to `validation.baseline_file`.
+        """
+        try:
+            baseline = DriftBaseline(
+                sketch_size=self.config.get_value("validation","sketch_size") or 1024,
+                n_bins=self.config.get_value("validation","histogram_bins") or 20
+            )
+            baseline.update(reference_df)
+            baseline.save(self.config.get_value("validation","baseline_file"))
+            self._baseline = baseline
+            return baseline
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def detect_drift_against_baseline(self, current_df: pd.DataFrame, threshold=None) -> bool:
+        """
+        Check a new batch for drift against the persisted baseline, without
+        reloading the raw reference data. Writes a YAML report of the results
+        to `validation.batch_report_file`.
+
+        The baseline is written by the data_validation stage; run the check on
+        a batch file with `python -m src.components.data_validation <file>`.
+        """
+        try:
+            if self._baseline is None:
+                self._baseline = DriftBaseline.load(self.config.get_value("validation","baseline_file"))
+
+            if threshold is None:
+                threshold = self.config.get_value("validation","drift_threshold")
+            drift_tests = DriftTestConfig(self.config.get_value("validation","drift_tests"), default_threshold=threshold)
+            report = self._baseline.compare(current_df, drift_tests=drift_tests)
+            status = not any(result.get("drift_status", False) for result in report.values())
+
+            batch_report_file_path = self.config.get_value("validation","batch_report_file")
+            write_yaml_file(file_path=batch_report_file_path, content=report, replace=True)
+
+            logger.info(f"Batch drift report saved to: {batch_report_file_path}")
+            return status
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_output_paths(self) -> List[str]:
+        """
+        Artifacts initiate_data_validation writes on every run.
+        """
+        output_paths = [
+            self.config.get_value("validation", "report_file"),
+            self.config.get_value("validation", "manifest_file"),
+        ]
+        if self.config.get_value("validation", "schema_report_file"):
+            output_paths.append(self.config.get_value("validation", "schema_report_file"))
+        if self.config.get_value("validation", "valid_copy_mode") != "reference":
+            output_paths.append(self.config.get_artifact_path("validation", "valid_train_file_path"))
+            output_paths.append(self.config.get_artifact_path("validation", "valid_test_file_path"))
+        if self.config.get_value("validation", "baseline_file"):
+            output_paths.append(self.config.get_value("validation", "baseline_file"))
+        return output_paths
+
+    def get_optional_output_paths(self) -> List[str]:
+        """
+        Artifacts initiate_data_validation writes only when rows were quarantined:
+        the quarantine files and, in reference mode, the filtered valid copies.
+        """
+        output_paths = []
+        if self.config.get_value("validation", "quarantine_invalid_rows"):
+            if self.config.get_value("validation", "valid_copy_mode") == "reference":
+                output_paths.append(self.config.get_artifact_path("validation", "valid_train_file_path"))
+                output_paths.append(self.config.get_artifact_path("validation", "valid_test_file_path"))
+            output_paths.append(self.config.get_artifact_path("validation", "quarantine_train_file_path"))
+            output_paths.append(self.config.get_artifact_path("validation", "quarantine_test_file_path"))
+        return output_paths
+
+    def write_validated_artifact(self, split: str, source_path: str, dataframe: pd.DataFrame) -> dict:
+        """
+        Make the validated 'train' or 'test' data available without re-serializing it.
+
+        With `validation.quarantine_invalid_rows`, rows that break a row-level
+        schema rule go to a small quarantine file, and only if there are any is
+        a filtered copy of the data written. Otherwise `validation.valid_copy_mode`
+        decides how the valid path is produced: hardlink or reflink share the
+        source file's data, reference records the source path in the manifest
+        without creating a file, and copy rewrites the frame.
+
+        Returns:
+            dict: Manifest entry for the split.
+        """
+        try:
+            valid_path = self.config.get_artifact_path("validation", f"valid_{split}_file_path")
+            mode = self.config.get_value("validation", "valid_copy_mode") or "copy"
+            compression = self.config.get_value("artifacts", "compression")
+            entry = {"source": source_path, "rows": len(dataframe), "quarantined_rows": 0}
+
+            if self.config.get_value("validation", "quarantine_invalid_rows"):
+                invalid = self.schema.invalid_row_mask(dataframe)
+                quarantine_path = self.config.get_artifact_path("validation", f"quarantine_{split}_file_path")
+                # Drop any quarantine file from an earlier run
+                if os.path.lexists(quarantine_path):
+                    os.remove(quarantine_path)
+
+                if invalid.any():
+                    save_dataframe(quarantine_path, dataframe[invalid], compression=compression)
+                    entry["quarantine_file"] = quarantine_path
+                    entry["quarantined_rows"] = int(invalid.sum())
+                    logger.warning(f"Quarantined {entry['quarantined_rows']} invalid {split} rows to: {quarantine_path}")
+                    save_dataframe(valid_path, dataframe[~invalid], compression=compression)
+                    entry.update(mode="copy", path=valid_path, rows=int((~invalid).sum()))
+                    return entry
+
+            if mode == "reference":
+                # Drop any earlier copy so nothing stale sits at the valid path
+                if os.path.lexists(valid_path):
+                    os.remove(valid_path)
+                entry.update(mode="reference", path=source_path)
+            elif mode == "copy":
+                save_dataframe(valid_path, dataframe, compression=compression)
+                entry.update(mode="copy", path=valid_path)
+            else:
+                entry.update(mode=link_artifact(source_path, valid_path, mode), path=valid_path)
+
+            logger.info(f"Validated {split} data available at {entry['path']} ({entry['mode']}).")
+            return entry
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_validated_artifact_path(self, split: str) -> str:
+        """
+        Path holding the validated 'train' or 'test' data, as recorded in the manifest.
+        """
+        try:
+            with open(self.config.get_value("validation", "manifest_file"), "r") as file:
+                manifest = json.load(file)
+            return manifest["artifacts"][split]["path"]
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def initiate_data_validation(self):
         """
         Main method to orchestrate data validation steps:
         - Read train and test data
-        - Validate columns
+        - Validate columns, dtypes and values against the schema
         - Detect data drift
         - Save valid data files
         - Return DataValidationArtifact
         """
         try:
             # Get file paths from ingestion artifact config
-            train_file_path = self.config.get_value("file_paths","train_data")
-            test_file_path = self.config.get_value("file_paths","test_data")
-
-            # Read train and test datasets
-            train_dataframe = self.read_data(train_file_path)
-            test_dataframe = self.read_data(test_file_path)
-
-            # Validate number of columns for both datasets
-            if not self.validate_number_of_columns(train_dataframe):
-                error_message = "Train dataframe does not contain all required columns."
-                logger.error(error_message)
-                raise CustomException(error_message, sys)
+            train_file_path = self.config.get_artifact_path("file_paths","train_data")
+            test_file_path = self.config.get_artifact_path("file_paths","test_data")
 
-            if not self.validate_number_of_columns(test_dataframe):
-                error_message = "Test dataframe does not contain all required columns."
-                logger.error(error_message)
-                raise CustomException(error_message, sys)
+            # Validate column names and dtypes of both files chunk by chunk, before loading them;
+            # row-level violations are quarantined below
+            schema_report = self.validate_schema({"train": train_file_path, "test": test_file_path})
+            for name, summary in schema_report.items():
+                if summary["structural_errors"]:
+                    error_message = (
+                        f"{name.capitalize()} dataframe does not match the schema: "
+                        f"missing {summary['missing_columns']}, unexpected {summary['unexpected_columns']}, "
+                        f"wrong dtypes {[column for column, entry in summary['columns'].items() if not entry['dtype_ok']]}."
+                    )
+                    logger.error(error_message)
+                    raise CustomException(error_message, sys)
 
-            # Detect dataset drift between train and test datasets
-            threshold = self.config.get_value("validation","drift_threshold")
-            drift_status = self.detect_dataset_drift(base_df=train_dataframe, current_df=test_dataframe , threshold=threshold)
+            # Read train and test datasets concurrently
+            train_dataframe, test_dataframe = self.read_datasets([train_file_path, test_file_path])
 
-            # Save validated train and test data files
-        
-            train_valid_path = self.config.get_value("validation","valid_train_file_path")
-            test_valid_path  = self.config.get_value("validation","valid_test_file_path")
+            # Link (or quarantine and filter) the validated train and test data, and build
+            # the drift baseline of the training data, on worker threads while drift is computed on this one
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                pending = {
+                    "train": executor.submit(self.write_validated_artifact, "train", train_file_path, train_dataframe),
+                    "test": executor.submit(self.write_validated_artifact, "test", test_file_path, test_dataframe),
+                }
 
-            train_valid_dir = os.path.dirname(train_valid_path)
-            test_valid_dir  = os.path.dirname(test_valid_path)
+                # Persist a compact baseline of the training data for later batch checks
+                if self.config.get_value("validation","baseline_file"):
+                    baseline_future = executor.submit(self.build_drift_baseline, train_dataframe)
+                else:
+                    baseline_future = None
 
-            os.makedirs(train_valid_dir, exist_ok=True)
-            os.makedirs(test_valid_dir, exist_ok=True)
+                # Detect dataset drift between train and test datasets
+                threshold = self.config.get_value("validation","drift_threshold")
+                drift_status = self.detect_dataset_drift(base_df=train_dataframe, current_df=test_dataframe , threshold=threshold)
 
-            train_dataframe.to_csv(train_valid_path, index=False, header=True)
-            test_dataframe.to_csv(test_valid_path, index=False, header=True)
+                artifacts = {split: future.result() for split, future in pending.items()}
+                if baseline_future is not None:
+                    baseline_future.result()
 
+            # Record the validation status and where the validated data lives
+            manifest_path = self.config.get_value("validation", "manifest_file")
+            with atomic_write(manifest_path, "w") as file:
+                json.dump({
+                    "columns_valid": True,
+                    "drift_detected": not drift_status,
+                    "report_file": self.config.get_value("validation", "report_file"),
+                    "schema_report_file": self.config.get_value("validation", "schema_report_file"),
+                    "artifacts": artifacts
+                }, file, indent=2)
 
             logger.info("Validated train and test data saved successfully.")
 
@@ -139,3 +380,18 @@ class DataValidation:
 
         except Exception as e:
             raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    try:
+        parser = argparse.ArgumentParser(description="Check a batch of flows for drift against the saved training baseline.")
+        parser.add_argument("batch_file", help="CSV, parquet or feather file of flows with the schema columns.")
+        parser.add_argument("--config", default="config/config.yaml", help="Path to the config file.")
+        args = parser.parse_args()
+
+        validation = DataValidation(Configuration(args.config))
+        no_drift = validation.detect_drift_against_baseline(validation.read_data(args.batch_file))
+        logger.info(f"Batch {args.batch_file}: {'no drift' if no_drift else 'drift detected'}.")
+        sys.exit(0 if no_drift else 1)
+    except Exception as e:
+        raise CustomException(e, sys)
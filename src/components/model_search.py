@@ -0,0 +1,182 @@
+import os
+import sys
+import math
+import time
+import itertools
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from src.components.model_trainer import ModelTrainer
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.models.xgboost_model import stratified_holdout_mask
+from src.utils.utils import load_object
+
+# Rung growth factor when training.search.eta is not set
+DEFAULT_ETA = 2
+
+
+def evaluate_candidate(configuration: Configuration, params: dict, fraction: float, n_jobs: int) -> dict:
+    """
+    Trains one candidate on a stratified `fraction` of the training rows and
+    returns its best validation loss. On all rows (`fraction` 1) the booster and
+    its training statistics are returned too, under 'booster' and 'statistics',
+    since that run is exactly the final model's training run.
+
+    Runs in a worker process. The transformed arrays are memory-mapped by path
+    here rather than sent from the parent, so every worker reads the same
+    page-cache copy and only the parameters and the result are pickled.
+    """
+    try:
+        started = time.perf_counter()
+        trainer = ModelTrainer(configuration)
+        features, labels = trainer.load_split("train")
+        n_classes = len(load_object(configuration.get_value("transformation", "target_object")).classes_)
+
+        rows = None
+        if fraction < 1:
+            # The same seed gives nested subsets, so later rungs extend earlier ones
+            subset = stratified_holdout_mask(np.asarray(labels), fraction, configuration.get_value("training", "random_state"))
+            rows = np.flatnonzero(subset)
+
+        booster, statistics = trainer.train(features, labels, n_classes, params=params, rows=rows, n_jobs=n_jobs)
+        result = {
+            "params": params,
+            "fraction": fraction,
+            # Subsets too small to hold out validation rows rank last
+            "score": statistics["best_score"] if statistics["best_score"] is not None else float("inf"),
+            "best_iteration": statistics["best_iteration"],
+            "train_rows": statistics["train_rows"],
+            "seconds": round(time.perf_counter() - started, 3),
+            "peak_rss_mb": statistics["peak_rss_mb"],
+        }
+        if rows is None:
+            result.update(booster=booster, statistics=statistics)
+        return result
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+class HyperparameterSearch:
+    """
+    Successive-halving search over XGBoost parameters.
+
+    Candidates are sampled from `training.search.space`. Every candidate first
+    trains on a small stratified share of the training rows (`min_fraction`).
+    Only the best 1 / `eta` of each rung, ranked by validation loss, moves on
+    to `eta` times as many rows, until the survivors train on all rows. Each
+    rung runs on a process pool. Workers memory-map the transformed arrays
+    themselves, and the cores are split between them. The winner of the last
+    rung was trained exactly like the final model, so its booster is kept in
+    `best_model` and reused instead of being trained again.
+    """
+
+    def __init__(self, configuration: Configuration) -> None:
+        """
+        Initialize the search from the 'training.search' config section.
+        """
+        try:
+            self.configuration = configuration
+            self.settings = configuration.get_value("training", "search") or {}
+            self.random_state = configuration.get_value("training", "random_state")
+            self.best_model = None
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def sample_candidates(self) -> List[dict]:
+        """
+        Up to `n_candidates` distinct parameter sets drawn from the search space.
+
+        Every entry of `space` lists the values to choose from; the whole grid
+        is used when it is smaller than `n_candidates`.
+        """
+        try:
+            space = self.settings.get("space") or {}
+            names = sorted(space)
+            grid = list(itertools.product(*(space[name] for name in names)))
+            n_candidates = min(self.settings.get("n_candidates") or 16, len(grid))
+            rng = np.random.default_rng(self.random_state)
+            chosen = rng.choice(len(grid), size=n_candidates, replace=False)
+            return [dict(zip(names, grid[index])) for index in sorted(chosen)]
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_rungs(self) -> List[float]:
+        """
+        Training-row fractions of the rungs, from `min_fraction` up to 1.
+        """
+        eta = self.settings.get("eta") or DEFAULT_ETA
+        fraction = self.settings.get("min_fraction") or 1 / eta ** 2
+        rungs = []
+        while fraction < 1:
+            rungs.append(fraction)
+            fraction *= eta
+        return rungs + [1.0]
+
+    def run(self) -> dict:
+        """
+        Runs the search.
+
+        Returns:
+            dict: Best parameters, the results of every rung and the total time.
+        """
+        try:
+            eta = self.settings.get("eta") or DEFAULT_ETA
+            max_workers = self.settings.get("max_workers") or os.cpu_count() or 1
+            candidates = self.sample_candidates()
+            if not candidates:
+                raise ValueError("training.search.space is empty")
+
+            started = time.perf_counter()
+            rungs = []
+            # xgboost's OpenMP runtime is not fork-safe, so workers are spawned
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(candidates)), mp_context=context) as executor:
+                for rung, fraction in enumerate(self.get_rungs()):
+                    n_workers = min(max_workers, len(candidates))
+                    n_jobs = max(1, (os.cpu_count() or 1) // n_workers)
+                    logger.info(f"Search rung {rung}: {len(candidates)} candidates on {fraction:.3f} of the training rows.")
+
+                    futures = [
+                        executor.submit(evaluate_candidate, self.configuration, params, fraction, n_jobs)
+                        for params in candidates
+                    ]
+                    results = sorted((future.result() for future in futures), key=lambda result: result["score"])
+                    if fraction == 1.0:
+                        # Keep the winner's booster; the summary itself stays JSON-serializable
+                        models = [(result.pop("booster"), result.pop("statistics")) for result in results]
+                        self.best_model = models[0]
+                    rungs.append({"fraction": fraction, "results": results})
+                    logger.info(f"Search rung {rung} best: {results[0]['params']} (validation loss {results[0]['score']:.5f})")
+
+                    candidates = [result["params"] for result in results[:max(1, math.ceil(len(results) / eta))]]
+
+            best = rungs[-1]["results"][0]
+            summary = {
+                "best_params": best["params"],
+                "best_score": best["score"],
+                "seconds": round(time.perf_counter() - started, 3),
+                "rungs": rungs,
+            }
+            logger.info(f"Search finished in {summary['seconds']}s; best parameters: {best['params']}")
+            return summary
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def initiate_model_search(self) -> dict:
+        """
+        Runs the search, then evaluates and saves the last rung's winner as
+        the final model. The search results are written to `training.metrics_output`
+        under 'search', next to the final model's metrics.
+        """
+        try:
+            summary = self.run()
+            return ModelTrainer(self.configuration).initiate_model_trainer(
+                params=summary["best_params"], search_summary=summary, trained=self.best_model
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
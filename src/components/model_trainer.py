@@ -0,0 +1,243 @@
+import sys
+import json
+import time
+import numpy as np
+import xgboost as xgb
+from typing import Tuple
+from sklearn.metrics import accuracy_score, classification_report, f1_score
+
+from src.components.data_transformation import DataTransformation
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.models.xgboost_model import (
+    MemmapBatchIter,
+    RoundLogger,
+    balanced_class_weights,
+    get_booster_params,
+    predict_proba,
+    stratified_holdout_mask,
+)
+from src.pipeline.runner import PeakMemorySampler
+from src.utils.utils import atomic_write, load_numpy_array_data, load_object, save_object
+
+
+class ModelTrainer:
+
+    def __init__(self, configuration: Configuration) -> None:
+        """
+        Constructor for initializing the ModelTrainer object.
+        """
+        try:
+            self.configuration: Configuration = configuration
+            self.data_transformation = DataTransformation(configuration)
+            logger.info("Initialized ModelTrainer class successfully.")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_split(self, split: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Memory-maps the transformed 'train' or 'test' features and labels.
+
+        Nothing is read until rows are accessed, and every process mapping the
+        same files shares one copy through the page cache.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (features, labels), read-only.
+        """
+        try:
+            features_path, labels_path = self.data_transformation.get_output_paths(split)
+            features = load_numpy_array_data(features_path, mmap_mode="r")
+            if labels_path is None:
+                # Combined layout: the label is the last column
+                return features[:, :-1], features[:, -1].astype(np.int32)
+            return features, load_numpy_array_data(labels_path, mmap_mode="r")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_artifact_paths(self):
+        """
+        Artifacts read and written by initiate_model_trainer, as (inputs, outputs).
+        """
+        inputs = [self.configuration.get_value("transformation", "target_object")]
+        for split in ("train", "test"):
+            inputs.extend(path for path in self.data_transformation.get_output_paths(split) if path is not None)
+        outputs = [
+            self.configuration.get_value("training", "model_output"),
+            self.configuration.get_value("training", "metrics_output"),
+        ]
+        return inputs, outputs
+
+    def train(
+        self,
+        features: np.ndarray,
+        labels: np.ndarray,
+        n_classes: int,
+        params: dict = None,
+        num_boost_round: int = None,
+        rows: np.ndarray = None,
+        n_jobs: int = None
+    ):
+        """
+        Trains an XGBoost classifier on the given rows.
+
+        A stratified `training.validation_fraction` of the rows is held out for
+        early stopping. With `training.class_weight: balanced`, every row is
+        weighted by its class's balanced weight so rare attacks are not drowned
+        out by BENIGN flows. Both folds are built as QuantileDMatrix from batches
+        of the memory-mapped features.
+
+        Args:
+            features (np.ndarray): Feature matrix, usually a read-only memmap.
+            labels (np.ndarray): Encoded labels.
+            n_classes (int): Number of encoded labels.
+            params (dict, optional): Booster parameter overrides on top of `training.model_params`.
+            num_boost_round (int, optional): Maximum rounds; defaults to `training.num_boost_round`.
+            rows (np.ndarray, optional): Sorted indices of the rows to train on; all rows by default.
+            n_jobs (int, optional): Threads; defaults to `training.n_jobs`.
+
+        Returns:
+            Tuple[xgb.Booster, dict]: Booster truncated to its best round, and training statistics.
+        """
+        try:
+            settings = self.configuration.get_section("training")
+            random_state = settings.get("random_state")
+            batch_size = settings.get("batch_size") or 100000
+            labels = np.asarray(labels, dtype=np.int32)
+            rows = np.arange(labels.size) if rows is None else np.asarray(rows)
+
+            holdout = stratified_holdout_mask(labels[rows], settings.get("validation_fraction") or 0.1, random_state)
+            train_rows, validation_rows = rows[~holdout], rows[holdout]
+
+            weights = None
+            if settings.get("class_weight") == "balanced":
+                weights = balanced_class_weights(labels[train_rows], n_classes, settings.get("max_class_weight"))
+                logger.info(f"Balanced class weights: {np.round(weights, 3).tolist()}")
+
+            max_bin = {**settings.get("model_params", {}), **(params or {})}.get("max_bin", 256)
+            train_matrix = xgb.QuantileDMatrix(
+                MemmapBatchIter(features, labels, train_rows, batch_size, weights), max_bin=max_bin
+            )
+            evals = [(train_matrix, "train")]
+            if validation_rows.size:
+                validation_matrix = xgb.QuantileDMatrix(
+                    MemmapBatchIter(features, labels, validation_rows, batch_size, weights), ref=train_matrix
+                )
+                evals.append((validation_matrix, "validation"))
+
+            booster_params = get_booster_params(
+                {**settings.get("model_params", {}), **(params or {})}, n_classes,
+                n_jobs=n_jobs or settings.get("n_jobs", -1), random_state=random_state
+            )
+            round_logger = RoundLogger(log_every=settings.get("log_every_rounds") or 10)
+            logger.info(
+                f"Training XGBoost on {train_rows.size} rows ({validation_rows.size} held out) "
+                f"with {booster_params['nthread']} threads: {booster_params}"
+            )
+
+            started = time.perf_counter()
+            booster = xgb.train(
+                booster_params,
+                train_matrix,
+                num_boost_round=num_boost_round or settings.get("num_boost_round") or 500,
+                evals=evals,
+                early_stopping_rounds=settings.get("early_stopping_rounds") if validation_rows.size else None,
+                callbacks=[round_logger],
+                verbose_eval=False
+            )
+            train_seconds = time.perf_counter() - started
+
+            # Keep only the rounds up to the best validation score
+            best_iteration = getattr(booster, "best_iteration", None)
+            best_score = getattr(booster, "best_score", None)
+            if best_iteration is not None:
+                booster = booster[: best_iteration + 1]
+
+            statistics = {
+                "train_rows": int(train_rows.size),
+                "validation_rows": int(validation_rows.size),
+                "best_iteration": best_iteration,
+                "best_score": best_score,
+                "train_seconds": round(train_seconds, 3),
+                **round_logger.summary(),
+            }
+            logger.info(f"Finished training: {statistics}")
+            return booster, statistics
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def evaluate(self, booster: xgb.Booster, features: np.ndarray, labels: np.ndarray, class_names) -> dict:
+        """
+        Accuracy, macro/weighted F1 and a per-class report on a held-out set.
+        """
+        try:
+            batch_size = self.configuration.get_value("training", "batch_size") or 100000
+            predictions = predict_proba(booster, features, len(class_names), batch_size).argmax(axis=1)
+            labels = np.asarray(labels)
+            return {
+                "accuracy": float(accuracy_score(labels, predictions)),
+                "f1_macro": float(f1_score(labels, predictions, average="macro", zero_division=0)),
+                "f1_weighted": float(f1_score(labels, predictions, average="weighted", zero_division=0)),
+                "classification_report": classification_report(
+                    labels, predictions, labels=np.arange(len(class_names)), target_names=[str(name) for name in class_names],
+                    output_dict=True, zero_division=0
+                ),
+            }
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def initiate_model_trainer(
+        self, params: dict = None, search_summary: dict = None, trained: Tuple[xgb.Booster, dict] = None
+    ):
+        """
+        Executes the model training workflow:
+        - Memory-maps the transformed train and test arrays
+        - Trains XGBoost with early stopping and class weighting
+        - Evaluates the model on the test set
+        - Saves the model and a metrics JSON
+
+        Args:
+            params (dict, optional): Booster parameter overrides, e.g. the best ones from a search.
+            search_summary (dict, optional): Search results to store in the metrics JSON.
+            trained (Tuple[xgb.Booster, dict], optional): Booster and statistics of a
+                run on all training rows with `params` (the search's last rung), saved
+                instead of training again.
+        """
+        try:
+            logger.info("Starting model training.")
+            target_encoder = load_object(self.configuration.get_value("transformation", "target_object"))
+            class_names = list(target_encoder.classes_)
+
+            train_features, train_labels = self.load_split("train")
+            test_features, test_labels = self.load_split("test")
+
+            if trained is not None:
+                booster, statistics = trained
+                statistics = {**statistics, "process_peak_rss_mb": statistics["peak_rss_mb"], "reused_from_search": True}
+                logger.info("Reusing the booster the search trained on all rows.")
+            else:
+                with PeakMemorySampler() as memory:
+                    booster, statistics = self.train(train_features, train_labels, len(class_names), params=params)
+                statistics["process_peak_rss_mb"] = round(memory.peak_rss / 2 ** 20, 1)
+
+            metrics = {"training": statistics, "test": self.evaluate(booster, test_features, test_labels, class_names)}
+            if search_summary is not None:
+                metrics["search"] = search_summary
+            logger.info(
+                f"Test accuracy {metrics['test']['accuracy']:.4f}, macro F1 {metrics['test']['f1_macro']:.4f}; "
+                f"peak RSS {statistics['process_peak_rss_mb']} MB."
+            )
+
+            model_path = self.configuration.get_value("training", "model_output")
+            save_object(model_path, booster)
+
+            metrics_path = self.configuration.get_value("training", "metrics_output")
+            with atomic_write(metrics_path, "w") as file:
+                json.dump(metrics, file, indent=2)
+
+            logger.info(f"Model saved to: {model_path}; metrics saved to: {metrics_path}")
+            return metrics
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -74,6 +74,32 @@ class Configuration:
         section = self.get_section(section_name)
         return section.get(key) if section else None
 
+    def get_artifact_format(self) -> str:
+        """
+        Retrieve the storage format used for tabular artifacts passed between stages.
+
+        Returns:
+            str: One of 'csv', 'parquet' or 'feather'. Defaults to 'csv'.
+        """
+        return self.get_value("artifacts", "format") or "csv"
+
+    def get_artifact_path(self, section_name: str, key: str) -> str:
+        """
+        Retrieve a tabular artifact path with its extension matching the artifact format.
+
+        Args:
+            section_name (str): Section name.
+            key (str): Key within the section.
+
+        Returns:
+            str: Artifact path, e.g. 'train.parquet' when the format is parquet.
+        """
+        path = self.get_value(section_name, key)
+        if path is None:
+            return None
+        root, _ = os.path.splitext(path)
+        return f"{root}.{self.get_artifact_format()}"
+
 
 # Example usage:
 if __name__ == "__main__":
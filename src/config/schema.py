@@ -0,0 +1,242 @@
+import sys
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.exception.exception import CustomException
+from src.utils.utils import cast_categories, get_artifact_format, read_dataframe, read_yaml_file
+
+# Candidate integer storage types, smallest first and signed first at each width
+INTEGER_STORAGE_DTYPES = ["int8", "uint8", "int16", "uint16", "int32", "uint32"]
+
+
+class Schema:
+    """
+    A class to load the column schema YAML file and turn it into explicit dtypes.
+
+    Every column declares a `dtype` (int64, float64 or object) and may declare
+    an inclusive `min`/`max` range, `allow_inf: true` (infinite values are
+    invalid otherwise) and, for object columns, `allowed_values`. The declared dtypes are used when reading
+    artifacts so pandas never has to infer types, and the ranges let integer
+    columns be stored in the smallest type that can hold them. Signed types are
+    preferred at each width, so a stray negative value in a column declared
+    `min: 0` (e.g. a negative 'Flow Duration') still loads and is quarantined by
+    validation. Integer columns without a declared `min` and `max` are stored as
+    int64: CICIDS2017 has values such as a negative 'Fwd Header Length' far outside int32.
+    """
+
+    def __init__(self, schema_file_path: str):
+        """
+        Initialize Schema by loading the schema YAML file.
+
+        Args:
+            schema_file_path (str): Path to the schema YAML file.
+        """
+        try:
+            self.schema_file_path = schema_file_path
+            self.columns: Dict[str, dict] = read_yaml_file(schema_file_path)["columns"]
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @property
+    def column_names(self) -> List[str]:
+        """
+        Column names in schema order.
+        """
+        return list(self.columns)
+
+    def get_numerical_columns(self) -> List[str]:
+        """
+        Names of the int64/float64 columns, in schema order.
+        """
+        return [column for column, spec in self.columns.items() if spec["dtype"] != "object"]
+
+    def get_dtypes(self) -> Dict[str, Union[str, pd.CategoricalDtype]]:
+        """
+        Declared dtypes for reading, with object columns stored as categoricals.
+
+        Object columns with `allowed_values` get one fixed CategoricalDtype over
+        those values, so every chunk of a streamed artifact has the same
+        categories (a feather file cannot change them between record batches).
+
+        Returns:
+            Dict[str, Union[str, pd.CategoricalDtype]]: Mapping of column name to dtype, in schema order.
+        """
+        dtypes = {}
+        for column, spec in self.columns.items():
+            if spec["dtype"] != "object":
+                dtypes[column] = spec["dtype"]
+            elif "allowed_values" in spec:
+                dtypes[column] = pd.CategoricalDtype([str(value) for value in spec["allowed_values"]])
+            else:
+                dtypes[column] = "category"
+        return dtypes
+
+    def get_storage_dtypes(self) -> Dict[str, Union[str, pd.CategoricalDtype]]:
+        """
+        Downcast dtypes: float64 becomes float32, and int64 becomes the smallest
+        integer type that holds the declared range (signed when a signed type of
+        that width does), or stays int64 without one.
+
+        The storage dtypes depend only on the schema, never on the data, so
+        every chunk of a streamed artifact is stored with the same types.
+
+        Returns:
+            Dict[str, Union[str, pd.CategoricalDtype]]: Mapping of column name to storage dtype, in schema order.
+        """
+        storage_dtypes = {}
+        for column, dtype in self.get_dtypes().items():
+            spec = self.columns[column]
+            if dtype == "float64":
+                dtype = "float32"
+            elif dtype == "int64":
+                if "min" in spec and "max" in spec:
+                    for candidate in INTEGER_STORAGE_DTYPES:
+                        info = np.iinfo(candidate)
+                        if info.min <= spec["min"] and spec["max"] <= info.max:
+                            dtype = candidate
+                            break
+            storage_dtypes[column] = dtype
+        return storage_dtypes
+
+    def cast(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Restricts a DataFrame to the schema columns and casts them to the declared dtypes.
+
+        Integer columns that contain missing values cannot be represented as int64,
+        so they are kept as float64 instead of failing the whole frame. A value
+        outside a column's `allowed_values` raises rather than becoming missing;
+        add it to the schema if it is a real class.
+
+        Args:
+            dataframe (pd.DataFrame): Input DataFrame.
+
+        Returns:
+            pd.DataFrame: DataFrame with exactly the schema columns, in schema order.
+        """
+        try:
+            dataframe = dataframe.reindex(columns=self.column_names)
+            dtypes = self.get_dtypes()
+            for column, dtype in dtypes.items():
+                if isinstance(dtype, pd.CategoricalDtype):
+                    continue
+                if dtype.startswith("int") and dataframe[column].isna().any():
+                    dtype = "float64"
+                dataframe[column] = dataframe[column].astype(dtype)
+            return cast_categories(dataframe, dtypes)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def downcast(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Casts columns to their storage dtypes, checking that the values fit.
+
+        Each column's min/max is checked with a single vectorized reduction. A
+        value that does not fit its storage dtype raises instead of leaving the
+        column at a wider type, since chunks written to one artifact must share
+        their dtypes; widen the column's declared range in the schema if it is
+        real data. Integer columns that fell back to float64 because of missing
+        values stay float64 (after the same range check), and DataFrameWriter
+        stores them with the integer storage dtype.
+
+        Args:
+            dataframe (pd.DataFrame): DataFrame typed with the declared dtypes.
+
+        Returns:
+            pd.DataFrame: DataFrame with downcast columns.
+        """
+        try:
+            casts = {}
+            storage_dtypes = self.get_storage_dtypes()
+            for column, storage_dtype in storage_dtypes.items():
+                if column not in dataframe.columns or dataframe[column].dtype == storage_dtype:
+                    continue
+
+                if isinstance(storage_dtype, pd.CategoricalDtype):
+                    # Cast below, checking for values outside the categories
+                    continue
+                if storage_dtype == "category":
+                    casts[column] = storage_dtype
+                    continue
+
+                values = dataframe[column].to_numpy()
+                if storage_dtype == "float32":
+                    info = np.finfo(np.float32)
+                else:
+                    info = np.iinfo(storage_dtype)
+                finite = values[np.isfinite(values)] if np.issubdtype(values.dtype, np.floating) else values
+                if finite.size and (finite.min() < info.min or finite.max() > info.max):
+                    raise ValueError(
+                        f"Column '{column}' has values in [{finite.min()}, {finite.max()}], "
+                        f"outside its storage dtype {storage_dtype}; widen its range in {self.schema_file_path}"
+                    )
+
+                if storage_dtype == "float32" or np.issubdtype(values.dtype, np.integer):
+                    casts[column] = storage_dtype
+
+            return cast_categories(dataframe.astype(casts) if casts else dataframe, storage_dtypes)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def invalid_row_mask(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        Flags rows that break a row-level schema rule.
+
+        A row is invalid when a value falls outside its column's declared
+        `min`/`max`, is infinite in a column without `allow_inf: true`, or is
+        not one of the column's `allowed_values`. Missing values are not flagged here.
+
+        Args:
+            dataframe (pd.DataFrame): Rows to check; columns outside the schema are ignored.
+
+        Returns:
+            np.ndarray: Boolean mask, True for invalid rows.
+        """
+        try:
+            invalid = np.zeros(len(dataframe), dtype=bool)
+            for column, spec in self.columns.items():
+                if column not in dataframe.columns:
+                    continue
+
+                if "allowed_values" in spec:
+                    series = dataframe[column]
+                    invalid |= (series.notna() & ~series.astype(str).isin([str(value) for value in spec["allowed_values"]])).to_numpy()
+                    continue
+
+                if spec["dtype"] == "object":
+                    continue
+
+                values = dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                with np.errstate(invalid="ignore"):
+                    if "min" in spec:
+                        invalid |= values < spec["min"]
+                    if "max" in spec:
+                        invalid |= values > spec["max"]
+                if not spec.get("allow_inf", False):
+                    invalid |= np.isinf(values)
+            return invalid
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def read_dataframe(self, file_path: str, columns: Optional[List[str]] = None, downcast: bool = False) -> pd.DataFrame:
+        """
+        Reads a tabular artifact typed by the schema.
+
+        CSV files are parsed with the declared dtypes so no type inference runs;
+        parquet and feather files already carry their types.
+
+        Args:
+            file_path (str): Path to the artifact.
+            columns (List[str], optional): Only read these columns.
+            downcast (bool): Cast numeric columns to their storage dtypes after reading.
+
+        Returns:
+            pd.DataFrame: The loaded DataFrame.
+        """
+        try:
+            dtypes = self.get_dtypes() if get_artifact_format(file_path) == "csv" else None
+            dataframe = read_dataframe(file_path, columns=columns, dtypes=dtypes)
+            return self.downcast(dataframe) if downcast else dataframe
+        except Exception as e:
+            raise CustomException(e, sys)
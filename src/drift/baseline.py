@@ -0,0 +1,226 @@
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kstwo
+
+from src.drift.metrics import DriftTestConfig, histogram_metrics, numeric_histograms
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.utils.sketch import QuantileSketch
+from src.utils.utils import atomic_write
+
+
+class DriftBaseline:
+    """
+    Compact per-column summary of reference data, persisted so that later
+    batches can be checked for drift without the raw reference frame.
+
+    Numeric columns keep a KLL quantile sketch plus null and +/-inf counts;
+    equal-frequency histogram edges and proportions are derived from the
+    sketch. Non-numeric columns keep their value counts. The baseline can be
+    built from one frame or updated chunk by chunk.
+    """
+
+    def __init__(self, sketch_size: int = 1024, n_bins: int = 20) -> None:
+        """
+        Args:
+            sketch_size (int): KLL `k` of each column sketch.
+            n_bins (int): Number of equal-frequency histogram bins per numeric column.
+        """
+        self.sketch_size = sketch_size
+        self.n_bins = n_bins
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.value_counts: Dict[str, Dict[str, int]] = {}
+        self.row_counts: Dict[str, int] = {}
+        self.null_counts: Dict[str, int] = {}
+        self.posinf_counts: Dict[str, int] = {}
+        self.neginf_counts: Dict[str, int] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.row_counts)
+
+    def update(self, dataframe: pd.DataFrame) -> "DriftBaseline":
+        """
+        Add a chunk of reference rows to the baseline.
+        """
+        try:
+            for column in dataframe.columns:
+                series = dataframe[column]
+                self.row_counts[column] = self.row_counts.get(column, 0) + len(series)
+                self.null_counts[column] = self.null_counts.get(column, 0) + int(series.isna().sum())
+
+                if pd.api.types.is_numeric_dtype(series):
+                    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                    self.posinf_counts[column] = self.posinf_counts.get(column, 0) + int(np.isposinf(values).sum())
+                    self.neginf_counts[column] = self.neginf_counts.get(column, 0) + int(np.isneginf(values).sum())
+                    if column not in self.sketches:
+                        self.sketches[column] = QuantileSketch(k=self.sketch_size, seed=len(self.sketches))
+                    self.sketches[column].update(values)
+                else:
+                    counts = self.value_counts.setdefault(column, {})
+                    for value, count in series.astype(str)[series.notna()].value_counts().items():
+                        counts[value] = counts.get(value, 0) + int(count)
+            return self
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def histogram(self, column: str):
+        """
+        Equal-frequency bin edges of a numeric column and the reference proportion in each bin.
+
+        Edges come from the sketch quantiles; tied quantiles (e.g. a column that
+        is mostly zero) collapse into one bin. The outer bins are open-ended.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (inner_edges, proportions), with
+            len(proportions) == len(inner_edges) + 1.
+        """
+        sketch = self.sketches[column]
+        inner_edges = np.unique(sketch.quantiles(np.linspace(0, 1, self.n_bins + 1)[1:-1]))
+        inner_edges = inner_edges[np.isfinite(inner_edges)]
+        cumulative = np.concatenate([[0.0], sketch.cdf(inner_edges), [1.0]])
+        return inner_edges, np.diff(cumulative)
+
+    def compare(
+        self,
+        current_df: pd.DataFrame,
+        drift_tests: Optional[DriftTestConfig] = None,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, dict]:
+        """
+        Compare each column of `current_df` against the stored summaries.
+
+        Numeric columns get a KS test against the sketch CDF, plus PSI,
+        Jensen-Shannon and chi-square from one pass over the stored histogram
+        bins, whose last bin holds the nulls. The sketch CDF is only accurate to
+        its rank error, so that error is subtracted from the KS statistic before
+        the p-value is computed; otherwise the sketch error alone would read as
+        drift once batches are large. A column with no non-null values on one
+        side has no KS statistic and is judged by chi-square, so a column that
+        went entirely missing is reported as drift. Non-numeric columns get the
+        histogram metrics on their value counts and also fall back to chi-square.
+
+        Args:
+            current_df (pd.DataFrame): New batch of data.
+            drift_tests (DriftTestConfig, optional): Per-column test and threshold. Defaults to KS at 0.05.
+            columns (List[str], optional): Columns to check. Defaults to every baseline column in the batch.
+
+        Returns:
+            Dict[str, dict]: Per-column drift results.
+        """
+        try:
+            drift_tests = drift_tests or DriftTestConfig()
+            columns = columns or [column for column in self.columns if column in current_df.columns]
+            report = {}
+            for column in columns:
+                series = current_df[column]
+                method, threshold = drift_tests.resolve(column)
+                column_report = {
+                    "null_rate": float(series.isna().mean()) if len(series) else 0.0,
+                    "reference_null_rate": self.null_counts[column] / max(self.row_counts[column], 1)
+                }
+
+                if column in self.sketches:
+                    sketch = self.sketches[column]
+                    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                    finite_values = np.sort(values[~np.isnan(values)])
+                    if finite_values.size and sketch.n:
+                        # Evaluate both CDFs at the batch values and the retained sketch items
+                        points = np.concatenate([finite_values, sketch.weighted_items()[0]])
+                        current_cdf = np.searchsorted(finite_values, points, side="right") / finite_values.size
+                        statistic = float(np.max(np.abs(sketch.cdf(points) - current_cdf)))
+                        effective_n = sketch.n * finite_values.size / (sketch.n + finite_values.size)
+                        column_report["statistic"] = statistic
+                        column_report["rank_error"] = sketch.rank_error
+                        column_report["p_value"] = float(np.clip(
+                            kstwo.sf(max(statistic - sketch.rank_error, 0.0), np.round(effective_n)), 0, 1
+                        ))
+                    elif method == "ks":
+                        method = "chi2"
+
+                    # Reference bin counts come from the stored histogram, with nulls in the last bin
+                    inner_edges, proportions = self.histogram(column)
+                    base_counts = np.concatenate([proportions * sketch.n, [self.null_counts[column]]])
+                    _, current_counts = numeric_histograms(np.empty(0), values, inner_edges=inner_edges)
+                    column_report.update(histogram_metrics(base_counts, current_counts))
+                    value = column_report["p_value"] if method == "ks" else column_report[method]
+                else:
+                    reference_counts = pd.Series(self.value_counts.get(column, {}), dtype=np.float64)
+                    current_counts = series.astype(str)[series.notna()].value_counts().astype(np.float64)
+                    reference_counts, current_counts = reference_counts.align(current_counts, fill_value=0.0)
+                    column_report.update(histogram_metrics(reference_counts.to_numpy(), current_counts.to_numpy()))
+                    column_report["unseen_values"] = sorted(current_counts.index[reference_counts == 0].tolist())
+                    if method == "ks":
+                        method = "chi2"
+                    value = column_report[method]
+
+                column_report["method"] = method
+                column_report["threshold"] = threshold
+                column_report["drift_status"] = drift_tests.is_drift(method, value, threshold)
+                report[column] = column_report
+            return report
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save(self, file_path: str) -> None:
+        """
+        Persist the baseline as a single compressed .npz file.
+        """
+        try:
+            arrays = {
+                "meta": np.array([self.sketch_size, self.n_bins], dtype=np.int64),
+                "columns": np.array(self.columns, dtype=str),
+                "counts": np.array([
+                    [self.row_counts[c], self.null_counts[c], self.posinf_counts.get(c, 0), self.neginf_counts.get(c, 0)]
+                    for c in self.columns
+                ], dtype=np.int64).reshape(-1, 4),
+            }
+            for index, column in enumerate(self.columns):
+                if column in self.sketches:
+                    items, level_sizes = self.sketches[column].to_arrays()
+                    arrays[f"sketch_{index}_items"] = items
+                    arrays[f"sketch_{index}_levels"] = level_sizes
+                    arrays[f"sketch_{index}_n"] = np.array([self.sketches[column].n], dtype=np.int64)
+                else:
+                    counts = self.value_counts.get(column, {})
+                    arrays[f"values_{index}_keys"] = np.array(list(counts), dtype=str)
+                    arrays[f"values_{index}_counts"] = np.array(list(counts.values()), dtype=np.int64)
+            with atomic_write(file_path) as file:
+                np.savez_compressed(file, **arrays)
+            logger.info(f"Drift baseline for {len(self.columns)} columns saved to: {file_path}")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path: str) -> "DriftBaseline":
+        """
+        Load a baseline saved with `save`.
+        """
+        try:
+            with np.load(file_path) as arrays:
+                sketch_size, n_bins = arrays["meta"].tolist()
+                baseline = cls(sketch_size=sketch_size, n_bins=n_bins)
+                for index, (column, counts) in enumerate(zip(arrays["columns"].tolist(), arrays["counts"])):
+                    row_count, null_count, posinf_count, neginf_count = counts.tolist()
+                    baseline.row_counts[column] = row_count
+                    baseline.null_counts[column] = null_count
+                    if f"sketch_{index}_items" in arrays:
+                        baseline.posinf_counts[column] = posinf_count
+                        baseline.neginf_counts[column] = neginf_count
+                        baseline.sketches[column] = QuantileSketch.from_arrays(
+                            arrays[f"sketch_{index}_items"],
+                            arrays[f"sketch_{index}_levels"],
+                            n=int(arrays[f"sketch_{index}_n"][0]),
+                            k=sketch_size
+                        )
+                    else:
+                        baseline.value_counts[column] = dict(zip(
+                            arrays[f"values_{index}_keys"].tolist(),
+                            arrays[f"values_{index}_counts"].tolist()
+                        ))
+            return baseline
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,218 @@
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import ks_2samp, kstwo
+
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+
+# Below this many rows per side scipy's exact p-value is cheap, so it is used as-is
+EXACT_MAX_ROWS = 10000
+
+# Below this many rows in total, starting worker processes costs more than it saves
+MIN_PARALLEL_ROWS = 100000
+
+
+def ks_statistic_sorted(base_sorted: np.ndarray, current_sorted: np.ndarray) -> float:
+    """
+    Two-sample KS statistic of two already sorted, NaN-free samples.
+
+    Both empirical CDFs are evaluated on the pooled sample with a vectorized
+    searchsorted, so no Python-level loop runs over the rows.
+
+    Args:
+        base_sorted (np.ndarray): Sorted reference sample.
+        current_sorted (np.ndarray): Sorted current sample.
+
+    Returns:
+        float: Maximum absolute distance between the two empirical CDFs.
+    """
+    pooled = np.concatenate([base_sorted, current_sorted])
+    base_cdf = np.searchsorted(base_sorted, pooled, side="right") / base_sorted.size
+    current_cdf = np.searchsorted(current_sorted, pooled, side="right") / current_sorted.size
+    return float(np.max(np.abs(base_cdf - current_cdf)))
+
+
+def ks_column_block(base_block: np.ndarray, current_block: np.ndarray) -> List[Tuple[float, float, int, int]]:
+    """
+    KS statistic and p-value for every column of a 2-D block.
+
+    All columns of each side are sorted in one call (NaNs sort last and are
+    ignored), then each column's statistic comes from its sorted prefix.
+
+    Args:
+        base_block (np.ndarray): Reference values, one column per feature.
+        current_block (np.ndarray): Current values with the same columns.
+
+    Returns:
+        List[Tuple[float, float, int, int]]: (statistic, p_value, n_base, n_current) per column.
+    """
+    base_sorted = np.sort(base_block, axis=0)
+    current_sorted = np.sort(current_block, axis=0)
+    base_counts = base_block.shape[0] - np.isnan(base_block).sum(axis=0)
+    current_counts = current_block.shape[0] - np.isnan(current_block).sum(axis=0)
+
+    results = []
+    for j in range(base_block.shape[1]):
+        n_base, n_current = int(base_counts[j]), int(current_counts[j])
+        if n_base == 0 or n_current == 0:
+            results.append((float("nan"), float("nan"), n_base, n_current))
+            continue
+
+        base_values = base_sorted[:n_base, j]
+        current_values = current_sorted[:n_current, j]
+        if max(n_base, n_current) <= EXACT_MAX_ROWS:
+            test_result = ks_2samp(base_values, current_values)
+            results.append((float(test_result.statistic), float(test_result.pvalue), n_base, n_current))
+            continue
+
+        statistic = ks_statistic_sorted(base_values, current_values)
+        # Smirnov's asymptotic two-sided distribution, as in scipy's 'asymp' mode
+        effective_n = n_base * n_current / (n_base + n_current)
+        p_value = float(np.clip(kstwo.sf(statistic, np.round(effective_n)), 0, 1))
+        results.append((statistic, p_value, n_base, n_current))
+    return results
+
+
+def dkw_error_bound(n_rows: int, confidence: float) -> float:
+    """
+    Dvoretzky-Kiefer-Wolfowitz bound on how far an empirical CDF of `n_rows`
+    samples can be from the true CDF, holding with probability `confidence`.
+    """
+    return float(np.sqrt(np.log(2.0 / (1.0 - confidence)) / (2.0 * n_rows)))
+
+
+class KSDriftEngine:
+    """
+    Computes the two-sample KS test for many columns in one batched pass.
+
+    Columns are converted to one float64 matrix per frame and split into
+    blocks that are sorted and tested on a process pool, so run time scales
+    with the number of cores instead of the number of columns. Frames larger
+    than `sample_size` rows are sampled down first and every result then
+    carries an error bound on the KS statistic.
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        sample_size: Optional[int] = None,
+        confidence: float = 0.95,
+        random_state: int = 42
+    ) -> None:
+        """
+        Args:
+            n_workers (int, optional): Worker processes. Defaults to all cores.
+            sample_size (int, optional): Maximum rows per frame. Defaults to all rows.
+            confidence (float): Confidence level of the reported sampling error bound.
+            random_state (int): Seed for row sampling.
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.sample_size = sample_size
+        self.confidence = confidence
+        self.random_state = random_state
+
+    def _to_matrix(self, dataframe: pd.DataFrame, columns: List[str], categories: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Stack the columns into a float64 matrix. Non-numeric columns become codes
+        into the sorted union of both frames' values, which keeps their order.
+        """
+        matrix = np.empty((len(dataframe), len(columns)), dtype=np.float64)
+        for j, column in enumerate(columns):
+            if column in categories:
+                values = dataframe[column].astype(object).to_numpy()
+                codes = np.searchsorted(categories[column], values.astype(str)).astype(np.float64)
+                codes[pd.isna(values)] = np.nan
+                matrix[:, j] = codes
+            else:
+                matrix[:, j] = dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return matrix
+
+    def _sample(self, dataframe: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Sample rows down to `sample_size`, using one row index for all columns.
+        """
+        if self.sample_size is None or len(dataframe) <= self.sample_size:
+            return dataframe
+        rows = np.sort(rng.choice(len(dataframe), size=self.sample_size, replace=False))
+        return dataframe.iloc[rows]
+
+    def compute(self, base_df: pd.DataFrame, current_df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Run the KS test for every column shared by both frames.
+
+        Args:
+            base_df (pd.DataFrame): Reference data.
+            current_df (pd.DataFrame): Data to compare against the reference.
+            columns (List[str], optional): Columns to test. Defaults to all base_df columns.
+
+        Returns:
+            Dict[str, dict]: Per column: statistic, p_value, n_base, n_current and,
+            when rows were sampled, error_bound on the statistic.
+        """
+        try:
+            columns = list(columns or base_df.columns)
+            rng = np.random.default_rng(self.random_state)
+
+            base_sampled = self.sample_size is not None and len(base_df) > self.sample_size
+            current_sampled = self.sample_size is not None and len(current_df) > self.sample_size
+            base_df = self._sample(base_df, rng)
+            current_df = self._sample(current_df, rng)
+
+            categories = {
+                column: np.unique(np.concatenate([
+                    base_df[column].dropna().astype(str).unique(),
+                    current_df[column].dropna().astype(str).unique()
+                ]))
+                for column in columns
+                if not pd.api.types.is_numeric_dtype(base_df[column])
+            }
+            base_matrix = self._to_matrix(base_df, columns, categories)
+            current_matrix = self._to_matrix(current_df, columns, categories)
+
+            # One contiguous block of columns per worker
+            n_blocks = max(1, min(self.n_workers, len(columns)))
+            if len(base_matrix) + len(current_matrix) < MIN_PARALLEL_ROWS:
+                n_blocks = 1
+            blocks = np.array_split(np.arange(len(columns)), n_blocks)
+
+            if n_blocks == 1:
+                block_results = [ks_column_block(base_matrix, current_matrix)]
+            else:
+                # Called from stage threads while BLAS/OpenMP pools run, where forking can deadlock
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=n_blocks, mp_context=context) as executor:
+                    futures = [
+                        executor.submit(ks_column_block, base_matrix[:, block], current_matrix[:, block])
+                        for block in blocks
+                    ]
+                    block_results = [future.result() for future in futures]
+
+            report = {}
+            for block, results in zip(blocks, block_results):
+                for j, (statistic, p_value, n_base, n_current) in zip(block, results):
+                    column_report = {
+                        "statistic": statistic,
+                        "p_value": p_value,
+                        "n_base": n_base,
+                        "n_current": n_current
+                    }
+                    if (base_sampled or current_sampled) and n_base and n_current:
+                        # Each sampled ECDF is off by at most its DKW bound, so the statistic by their sum
+                        side_confidence = 1 - (1 - self.confidence) / 2
+                        column_report["error_bound"] = (
+                            (dkw_error_bound(n_base, side_confidence) if base_sampled else 0.0)
+                            + (dkw_error_bound(n_current, side_confidence) if current_sampled else 0.0)
+                        )
+                    report[columns[j]] = column_report
+
+            logger.info(f"Computed KS drift for {len(columns)} columns on {n_blocks} worker(s).")
+            return report
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,152 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial.distance import jensenshannon
+from scipy.stats import chi2_contingency
+
+# Tests whose value is a p-value: drift when it falls below the threshold
+P_VALUE_METHODS = ("ks", "chi2")
+
+# Tests whose value is a distance: drift when it rises above the threshold
+DISTANCE_METHODS = ("psi", "js")
+
+# Threshold of a method picked without one; a p-value cut-off means nothing as a distance
+DEFAULT_THRESHOLDS = {"ks": 0.05, "chi2": 0.05, "psi": 0.2, "js": 0.1}
+
+# Floor for empty bins so PSI stays finite
+PSI_EPSILON = 1e-4
+
+
+def numeric_histograms(
+    base_values: np.ndarray,
+    current_values: np.ndarray,
+    n_bins: int = 20,
+    inner_edges: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bin both samples on the same equal-frequency edges in one pass each.
+
+    Edges are the reference quantiles unless given. The outer bins are
+    open-ended, so +/-inf land in the last/first bin, and NaNs get an extra
+    bin of their own so a change in the missing rate also counts as drift.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (base_counts, current_counts).
+    """
+    if inner_edges is None:
+        finite = base_values[np.isfinite(base_values)]
+        if finite.size:
+            inner_edges = np.unique(np.quantile(finite, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        else:
+            inner_edges = np.empty(0)
+
+    def count(values: np.ndarray) -> np.ndarray:
+        bins = np.searchsorted(inner_edges, values, side="right")
+        bins[np.isnan(values)] = inner_edges.size + 1
+        return np.bincount(bins, minlength=inner_edges.size + 2).astype(np.float64)
+
+    return count(base_values), count(current_values)
+
+
+def categorical_histograms(base_series: pd.Series, current_series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Value counts of both samples aligned on the union of their categories.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (base_counts, current_counts).
+    """
+    base_counts = base_series.astype(str).value_counts(dropna=False)
+    current_counts = current_series.astype(str).value_counts(dropna=False)
+    base_counts, current_counts = base_counts.align(current_counts, fill_value=0)
+    return base_counts.to_numpy(dtype=np.float64), current_counts.to_numpy(dtype=np.float64)
+
+
+def population_stability_index(base_counts: np.ndarray, current_counts: np.ndarray) -> float:
+    """
+    PSI = sum((q - p) * ln(q / p)) over bins, with empty bins floored at PSI_EPSILON.
+    """
+    p = np.maximum(base_counts / max(base_counts.sum(), 1.0), PSI_EPSILON)
+    q = np.maximum(current_counts / max(current_counts.sum(), 1.0), PSI_EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def jensen_shannon_distance(base_counts: np.ndarray, current_counts: np.ndarray) -> float:
+    """
+    Jensen-Shannon distance (base 2, between 0 and 1) of the two bin distributions.
+    """
+    if base_counts.sum() == 0 or current_counts.sum() == 0:
+        return float("nan")
+    return float(jensenshannon(base_counts, current_counts, base=2))
+
+
+def chi_square_p_value(base_counts: np.ndarray, current_counts: np.ndarray) -> float:
+    """
+    p-value of the chi-square test of homogeneity on the 2 x bins contingency table.
+    """
+    observed = np.vstack([base_counts, current_counts])
+    observed = observed[:, observed.sum(axis=0) > 0]
+    if observed.shape[1] < 2 or (observed.sum(axis=1) == 0).any():
+        return 1.0
+    return float(chi2_contingency(observed).pvalue)
+
+
+def histogram_metrics(base_counts: np.ndarray, current_counts: np.ndarray) -> Dict[str, float]:
+    """
+    Every histogram-based drift metric from one pair of bin counts.
+    """
+    return {
+        "psi": population_stability_index(base_counts, current_counts),
+        "js": jensen_shannon_distance(base_counts, current_counts),
+        "chi2": chi_square_p_value(base_counts, current_counts),
+    }
+
+
+class DriftTestConfig:
+    """
+    Resolves the drift test and threshold for each column from the
+    `validation.drift_tests` config section:
+
+        drift_tests:
+          default: { method: psi, threshold: 0.2 }
+          columns:
+            Label: { method: chi2, threshold: 0.05 }
+
+    Methods are ks, chi2 (p-value, drift below threshold) and psi, js
+    (distance, drift above threshold). Without the default section the test
+    is KS at `default_threshold`. A spec that switches to another method
+    without giving a threshold gets that method's DEFAULT_THRESHOLDS entry
+    instead of inheriting a threshold meant for a different test.
+    """
+
+    def __init__(self, drift_tests: Optional[dict] = None, default_threshold: float = 0.05) -> None:
+        drift_tests = drift_tests or {}
+        self.default = self._with_threshold({"method": "ks", "threshold": default_threshold}, drift_tests.get("default") or {})
+        self.columns = drift_tests.get("columns") or {}
+
+        for spec in [self.default, *self.columns.values()]:
+            if spec.get("method", self.default["method"]) not in P_VALUE_METHODS + DISTANCE_METHODS:
+                raise ValueError(f"Unknown drift test method: {spec.get('method')}")
+
+    @staticmethod
+    def _with_threshold(base: dict, override: dict) -> dict:
+        spec = {**base, **override}
+        if "threshold" not in override and spec["method"] != base["method"]:
+            spec["threshold"] = DEFAULT_THRESHOLDS.get(spec["method"])
+        return spec
+
+    def resolve(self, column: str) -> Tuple[str, float]:
+        """
+        (method, threshold) for a column.
+        """
+        spec = self._with_threshold(self.default, self.columns.get(column, {}))
+        return spec["method"], float(spec["threshold"])
+
+    @staticmethod
+    def is_drift(method: str, value: float, threshold: float) -> bool:
+        """
+        Whether a test value crosses its threshold. NaN never counts as drift.
+        """
+        if value is None or np.isnan(value):
+            return False
+        return bool(value < threshold) if method in P_VALUE_METHODS else bool(value > threshold)
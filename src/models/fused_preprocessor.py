@@ -0,0 +1,191 @@
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from src.utils.utils import atomic_write
+
+
+def nonfinite_to_nan(values, dtype="float64") -> np.ndarray:
+    """
+    Casts to `dtype` with +/-inf replaced by NaN, so infinite values (e.g. in
+    'Flow Bytes/s') are imputed like missing ones instead of failing the imputer.
+
+    Args:
+        values: Array-like input, e.g. a DataFrame of numerical columns.
+        dtype: Output dtype.
+
+    Returns:
+        np.ndarray: A new array.
+    """
+    values = np.array(values, dtype=dtype)
+    values[np.isinf(values)] = np.nan
+    return values
+
+
+class FusedPreprocessor:
+    """
+    The fitted column selection, median imputation and standard scaling of the
+    transformer as one fused, allocation-free kernel.
+
+    Per batch, the selected columns are gathered straight into a preallocated
+    buffer of the compute dtype, every non-finite value (NaN and +/-inf) is
+    replaced by its column median, and `(x - mean) * inv_std` is applied in
+    place. Buffers are kept per thread and only grow when a larger batch
+    arrives, so steady-state scoring allocates nothing.
+
+    Scaling multiplies by a precomputed 1 / scale where sklearn divides, so
+    results match the sklearn transformer to within float rounding, not bit for bit.
+    """
+
+    def __init__(
+        self,
+        column_index: np.ndarray,
+        medians: np.ndarray,
+        means: np.ndarray,
+        inverse_scales: np.ndarray,
+        dtype: str = "float32",
+        input_columns: Optional[List[str]] = None,
+        feature_columns: Optional[List[str]] = None
+    ) -> None:
+        """
+        Args:
+            column_index (np.ndarray): Input column of each output feature.
+            medians (np.ndarray): Imputation value of each output feature.
+            means (np.ndarray): Mean subtracted from each output feature.
+            inverse_scales (np.ndarray): 1 / standard deviation of each output feature.
+            dtype (str): Compute and output dtype.
+            input_columns (List[str], optional): Names of the input columns.
+            feature_columns (List[str], optional): Names of the output features.
+        """
+        self.dtype = np.dtype(dtype)
+        self.column_index = np.asarray(column_index, dtype=np.intp)
+        self.medians = np.asarray(medians, dtype=self.dtype)
+        self.means = np.asarray(means, dtype=self.dtype)
+        self.inverse_scales = np.asarray(inverse_scales, dtype=self.dtype)
+        self.input_columns = list(input_columns) if input_columns is not None else None
+        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        self._buffers = threading.local()
+
+    @property
+    def n_features(self) -> int:
+        return self.column_index.size
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor, input_columns: List[str]) -> "FusedPreprocessor":
+        """
+        Exports the fitted ColumnTransformer built by DataTransformation.get_data_transformer_object.
+
+        Args:
+            preprocessor (ColumnTransformer): Fitted transformer with one
+                cast/imputer/scaler pipeline and a dropped remainder.
+            input_columns (List[str]): Column order of the arrays that will be transformed.
+
+        Returns:
+            FusedPreprocessor: The fused kernel.
+        """
+        if len(preprocessor.transformers_) != 1 or preprocessor.remainder != "drop":
+            raise ValueError("Expected a single numerical pipeline and a dropped remainder in the transformer")
+        _, pipeline, columns = preprocessor.transformers_[0]
+
+        positions = {column: index for index, column in enumerate(input_columns)}
+        missing = [column for column in columns if column not in positions]
+        if missing:
+            raise ValueError(f"Transformer columns missing from the input columns: {missing}")
+
+        cast = pipeline.named_steps.get("cast")
+        dtype = np.dtype(cast.kw_args["dtype"]) if cast is not None else np.dtype(np.float64)
+        imputer, scaler = pipeline.named_steps["imputer"], pipeline.named_steps["scaler"]
+
+        # The imputer drops columns that were entirely missing at fit time
+        statistics = np.asarray(imputer.statistics_, dtype=np.float64)
+        kept = np.ones(statistics.size, dtype=bool) if imputer.keep_empty_features else ~np.isnan(statistics)
+        columns = [column for column, keep in zip(columns, kept) if keep]
+
+        n_features = len(columns)
+        means = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        scales = scaler.scale_ if scaler.with_std else np.ones(n_features)
+        return cls(
+            column_index=[positions[column] for column in columns],
+            medians=statistics[kept],
+            means=means,
+            inverse_scales=1.0 / np.asarray(scales, dtype=np.float64),
+            dtype=dtype,
+            input_columns=input_columns,
+            feature_columns=columns
+        )
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the kernel's arrays and column names to an .npz file.
+        """
+        with atomic_write(file_path) as file:
+            np.savez(
+                file,
+                column_index=self.column_index,
+                medians=self.medians,
+                means=self.means,
+                inverse_scales=self.inverse_scales,
+                input_columns=np.array(self.input_columns or [], dtype=str),
+                feature_columns=np.array(self.feature_columns or [], dtype=str)
+            )
+
+    @classmethod
+    def load(cls, file_path: str) -> "FusedPreprocessor":
+        """
+        Reads a kernel written by save().
+        """
+        with np.load(file_path) as arrays:
+            return cls(
+                column_index=arrays["column_index"],
+                medians=arrays["medians"],
+                means=arrays["means"],
+                inverse_scales=arrays["inverse_scales"],
+                dtype=arrays["medians"].dtype,
+                input_columns=arrays["input_columns"].tolist() or None,
+                feature_columns=arrays["feature_columns"].tolist() or None
+            )
+
+    def _get_buffer(self, n_rows: int, dtype) -> np.ndarray:
+        """
+        This thread's (n_rows, n_features) buffer of `dtype`, grown geometrically when too small.
+        """
+        buffers = self._buffers.__dict__
+        buffer = buffers.get(np.dtype(dtype))
+        if buffer is None or buffer.shape[0] < n_rows:
+            capacity = max(n_rows, 2 * buffer.shape[0] if buffer is not None else 0)
+            buffer = buffers[np.dtype(dtype)] = np.empty((capacity, self.n_features), dtype=dtype)
+        return buffer[:n_rows]
+
+    def transform(self, values: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Transforms a batch of rows.
+
+        Args:
+            values (np.ndarray): Rows in input column order, any float or integer dtype.
+            out (np.ndarray, optional): (n_rows, n_features) array of the compute dtype to write into.
+
+        Returns:
+            np.ndarray: `out`, or a view of this thread's buffer that is
+            overwritten by the thread's next call.
+        """
+        n_rows = values.shape[0]
+        if out is None:
+            out = self._get_buffer(n_rows, self.dtype)
+        nonfinite = self._get_buffer(n_rows, bool)
+
+        # column_index is always in range; mode="clip" lets np.take write into
+        # `out` directly, where the default mode="raise" gathers into a temporary first
+        if values.dtype == self.dtype:
+            np.take(values, self.column_index, axis=1, out=out, mode="clip")
+        else:
+            # Gather in the input dtype, then cast, so neither step allocates
+            gathered = self._get_buffer(n_rows, values.dtype)
+            np.take(values, self.column_index, axis=1, out=gathered, mode="clip")
+            np.copyto(out, gathered, casting="unsafe")
+        np.isfinite(out, out=nonfinite)
+        np.logical_not(nonfinite, out=nonfinite)
+        np.copyto(out, self.medians, where=nonfinite)
+        np.subtract(out, self.means, out=out)
+        np.multiply(out, self.inverse_scales, out=out)
+        return out
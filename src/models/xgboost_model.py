@@ -0,0 +1,195 @@
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import psutil
+import xgboost as xgb
+
+from src.logging.logger import logger
+
+# Booster parameters used when `training.model_params` leaves them out
+DEFAULT_PARAMS = {
+    "tree_method": "hist",
+    "max_depth": 8,
+    "learning_rate": 0.1,
+    "max_bin": 256,
+    "subsample": 0.9,
+    "colsample_bytree": 0.8,
+    "min_child_weight": 1.0,
+}
+
+
+def get_booster_params(params: Optional[dict], n_classes: int, n_jobs: Optional[int] = -1, random_state: Optional[int] = None) -> dict:
+    """
+    Booster parameters for an `n_classes` classifier.
+
+    Args:
+        params (dict, optional): Overrides of DEFAULT_PARAMS.
+        n_classes (int): Number of encoded labels.
+        n_jobs (int, optional): Threads; -1 or None uses every core.
+        random_state (int, optional): Seed.
+
+    Returns:
+        dict: Parameters for xgboost.train.
+    """
+    booster_params = {**DEFAULT_PARAMS, **(params or {})}
+    booster_params["nthread"] = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    if random_state is not None:
+        booster_params["seed"] = random_state
+    if n_classes > 2:
+        booster_params.update(objective="multi:softprob", num_class=n_classes, eval_metric="mlogloss")
+    else:
+        booster_params.update(objective="binary:logistic", eval_metric="logloss")
+    return booster_params
+
+
+def balanced_class_weights(labels: np.ndarray, n_classes: int, max_weight: Optional[float] = None) -> np.ndarray:
+    """
+    Per-class weights n_samples / (n_classes_present * class_count), as in
+    scikit-learn's 'balanced' mode, so rare attack labels count as much as BENIGN.
+
+    Args:
+        labels (np.ndarray): Encoded labels.
+        n_classes (int): Number of encoded labels.
+        max_weight (float, optional): Cap on a single class's weight.
+
+    Returns:
+        np.ndarray: Weight per class; absent classes get 0.
+    """
+    counts = np.bincount(labels, minlength=n_classes).astype(np.float64)
+    present = counts > 0
+    weights = np.zeros(n_classes, dtype=np.float64)
+    weights[present] = labels.size / (present.sum() * counts[present])
+    if max_weight is not None:
+        np.minimum(weights, max_weight, out=weights)
+    return weights
+
+
+def stratified_holdout_mask(labels: np.ndarray, fraction: float, random_state: Optional[int] = None) -> np.ndarray:
+    """
+    Marks `floor(fraction * count)` random rows of every class for a validation fold.
+
+    Classes too small to spare a row stay entirely in the training fold.
+
+    Args:
+        labels (np.ndarray): Encoded labels.
+        fraction (float): Share of each class to hold out.
+        random_state (int, optional): Seed.
+
+    Returns:
+        np.ndarray: Boolean mask, True for validation rows.
+    """
+    rng = np.random.default_rng(random_state)
+    order = rng.permutation(labels.size)
+    order = order[np.argsort(labels[order], kind="stable")]
+
+    # Rank of each row within its class, in random order
+    counts = np.bincount(labels)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.arange(labels.size) - np.repeat(starts, counts)
+
+    holdout = np.zeros(labels.size, dtype=bool)
+    holdout[order] = ranks < np.floor(fraction * counts)[labels[order]]
+    return holdout
+
+
+class MemmapBatchIter(xgb.DataIter):
+    """
+    Feeds selected rows of a (memory-mapped) feature matrix to xgboost in batches.
+
+    Used with QuantileDMatrix, only one batch of rows is copied out of the
+    memmap at a time and the histogram build keeps the quantized matrix, so
+    the raw float features are never fully loaded.
+    """
+
+    def __init__(self, features: np.ndarray, labels: np.ndarray, rows: np.ndarray, batch_size: int,
+                 weights: Optional[np.ndarray] = None) -> None:
+        """
+        Args:
+            features (np.ndarray): Feature matrix, usually a read-only memmap.
+            labels (np.ndarray): Encoded labels.
+            rows (np.ndarray): Sorted row indices to use.
+            batch_size (int): Rows per batch.
+            weights (np.ndarray, optional): Per-class weights, looked up by label.
+        """
+        self.features = features
+        self.labels = labels
+        self.rows = rows
+        self.batch_size = batch_size
+        self.weights = weights
+        self._position = 0
+        super().__init__()
+
+    def next(self, input_data) -> bool:
+        if self._position >= self.rows.size:
+            return False
+        rows = self.rows[self._position:self._position + self.batch_size]
+        labels = np.asarray(self.labels[rows])
+        batch = {"data": np.asarray(self.features[rows]), "label": labels}
+        if self.weights is not None:
+            batch["weight"] = self.weights[labels]
+        input_data(**batch)
+        self._position += self.batch_size
+        return True
+
+    def reset(self) -> None:
+        self._position = 0
+
+
+class RoundLogger(xgb.callback.TrainingCallback):
+    """
+    Records the wall time of every boosting round and the resident set size,
+    and logs them every `log_every` rounds.
+    """
+
+    def __init__(self, log_every: int = 10) -> None:
+        self.log_every = max(1, log_every)
+        self.round_seconds: List[float] = []
+        self.peak_rss = 0
+        self._process = psutil.Process(os.getpid())
+        self._started = None
+
+    def before_iteration(self, model, epoch: int, evals_log) -> bool:
+        self._started = time.perf_counter()
+        return False
+
+    def after_iteration(self, model, epoch: int, evals_log) -> bool:
+        self.round_seconds.append(time.perf_counter() - self._started)
+        rss = self._process.memory_info().rss
+        self.peak_rss = max(self.peak_rss, rss)
+        if (epoch + 1) % self.log_every == 0:
+            recent = self.round_seconds[-self.log_every:]
+            scores = ", ".join(
+                f"{data}-{metric}: {values[-1]:.5f}" for data, metrics in evals_log.items() for metric, values in metrics.items()
+            )
+            logger.info(
+                f"Round {epoch + 1}: {1000 * sum(recent) / len(recent):.1f} ms/round, "
+                f"RSS {rss / 2 ** 20:.1f} MB (peak {self.peak_rss / 2 ** 20:.1f} MB){', ' + scores if scores else ''}"
+            )
+        return False
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Round count, mean and max seconds per round and peak RSS in MB.
+        """
+        seconds = np.asarray(self.round_seconds or [0.0])
+        return {
+            "rounds": len(self.round_seconds),
+            "mean_seconds_per_round": round(float(seconds.mean()), 6),
+            "max_seconds_per_round": round(float(seconds.max()), 6),
+            "peak_rss_mb": round(self.peak_rss / 2 ** 20, 1),
+        }
+
+
+def predict_proba(booster: xgb.Booster, features: np.ndarray, n_classes: int, batch_size: int = 100000) -> np.ndarray:
+    """
+    Class probabilities (n_rows x n_classes) for a feature matrix, predicted in batches.
+    """
+    batches = []
+    for start in range(0, features.shape[0], batch_size):
+        scores = booster.inplace_predict(np.asarray(features[start:start + batch_size]))
+        if n_classes <= 2:
+            scores = np.column_stack([1.0 - scores, scores])
+        batches.append(scores)
+    return np.concatenate(batches) if batches else np.empty((0, n_classes))
@@ -0,0 +1,145 @@
+import os
+import sys
+import operator
+from typing import List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config.configuration import Configuration
+from src.config.schema import Schema
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.models.fused_preprocessor import FusedPreprocessor
+from src.utils.utils import load_object
+
+Flows = Union[np.ndarray, pd.DataFrame, Sequence[Mapping[str, object]]]
+
+
+class PredictionPipeline:
+    """
+    Scores micro-batches of flows with the saved preprocessing, label encoder and model.
+
+    The artifacts are loaded once. The fitted ColumnTransformer is not called
+    per batch: its column selection, median imputation and standard scaling
+    run as a FusedPreprocessor, which writes into preallocated per-thread
+    buffers and imputes +/-inf like missing values. The exported kernel
+    (`transformation.fused_preprocessor_object`) is used when present;
+    otherwise it is exported from the transformer at load time.
+
+    Inputs are flow dicts (keyed by schema column name), DataFrames, or arrays
+    whose columns follow the `schema.yaml` feature order (the target column excluded).
+    Only arrays reach the kernel without a copy; see to_array for the others.
+    """
+
+    def __init__(self, configuration: Configuration) -> None:
+        """
+        Load the preprocessing, label encoder and model named in the config.
+        """
+        try:
+            self.configuration = configuration
+            target_column = configuration.get_value("training", "target_columns")
+            schema = Schema(configuration.get_value("validation", "schema_file"))
+            self.input_columns: List[str] = [column for column in schema.column_names if column != target_column]
+            self._get_inputs = operator.itemgetter(*self.input_columns)
+
+            self.preprocessor = self.load_preprocessor()
+            self.feature_columns = self.preprocessor.feature_columns
+            self.target_encoder = load_object(configuration.get_value("transformation", "target_object"))
+            self.model = load_object(configuration.get_value("training", "model_output"))
+            self.classes = np.asarray(self.target_encoder.classes_)
+
+            n_jobs = configuration.get_value("prediction", "n_jobs") or 1
+            self.model.set_param({"nthread": n_jobs})
+            logger.info(
+                f"Loaded prediction pipeline: {self.preprocessor.n_features} features, "
+                f"{len(self.classes)} classes, {n_jobs} model threads."
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_preprocessor(self) -> FusedPreprocessor:
+        """
+        The fused preprocessing kernel, read from its exported file or exported from the transformer.
+        """
+        try:
+            fused_path = self.configuration.get_value("transformation", "fused_preprocessor_object")
+            if fused_path and os.path.exists(fused_path):
+                preprocessor = FusedPreprocessor.load(fused_path)
+                if preprocessor.input_columns != self.input_columns:
+                    raise ValueError(f"{fused_path} was exported for different input columns than the schema")
+                return preprocessor
+
+            transformer = load_object(self.configuration.get_value("transformation", "transformer_object"))
+            return FusedPreprocessor.from_column_transformer(transformer, self.input_columns)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def to_array(self, flows: Flows) -> np.ndarray:
+        """
+        Turn flow dicts or a DataFrame into an array in schema feature order.
+
+        Missing keys and None become NaN and are imputed like missing training values.
+
+        Arrays are passed through as they are. Dicts and DataFrames are converted
+        into a new float64 array on every call: the cost is in unboxing the Python
+        values, and filling a preallocated buffer row by row measured about 10%
+        slower than one np.array call on 1000 x 78 flows. Callers that need an
+        allocation-free path should pass arrays in schema column order.
+        """
+        try:
+            if isinstance(flows, np.ndarray):
+                if flows.ndim != 2 or flows.shape[1] != len(self.input_columns):
+                    raise ValueError(f"Expected an (n, {len(self.input_columns)}) array in schema column order, got {flows.shape}")
+                return flows
+            if isinstance(flows, pd.DataFrame):
+                return flows.reindex(columns=self.input_columns).to_numpy(dtype=np.float64, na_value=np.nan)
+            try:
+                # itemgetter pulls every column of a dict in one C call
+                rows = list(map(self._get_inputs, flows))
+            except KeyError:
+                rows = [[flow.get(column) for column in self.input_columns] for flow in flows]
+            return np.array(rows, dtype=np.float64).reshape(len(flows), len(self.input_columns))
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform(self, flows: Flows) -> np.ndarray:
+        """
+        Model input for a batch: selected columns, median-imputed and standardized.
+
+        The result is a view of this thread's preprocessing buffer; copy it to
+        keep it past the thread's next call.
+        """
+        try:
+            return self.preprocessor.transform(self.to_array(flows))
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_proba(self, flows: Flows) -> np.ndarray:
+        """
+        Class probabilities (n_flows x n_classes), columns in `classes` order.
+        """
+        try:
+            features = self.transform(flows)
+            if features.shape[0] == 0:
+                return np.empty((0, len(self.classes)), dtype=np.float32)
+            scores = self.model.inplace_predict(features)
+            if len(self.classes) <= 2:
+                scores = np.column_stack([1.0 - scores, scores])
+            return scores
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict(self, flows: Flows) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decoded labels and the probability of each predicted label.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (labels, scores), one entry per flow.
+        """
+        try:
+            probabilities = self.predict_proba(flows)
+            predicted = probabilities.argmax(axis=1)
+            return self.classes[predicted], probabilities[np.arange(predicted.size), predicted]
+        except Exception as e:
+            raise CustomException(e, sys)
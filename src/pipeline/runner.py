@@ -0,0 +1,244 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.pipeline.stage_cache import StageCache
+
+
+class PipelineStage:
+    """
+    One step of the pipeline and the artifacts it reads and writes.
+
+    A stage depends on every stage that writes one of its inputs, plus any
+    stage named in `depends_on` (for ordering that is not carried by a file,
+    such as validation gating transformation). Optional outputs are files the
+    stage only writes in some runs (e.g. quarantine files); they are cached
+    like other outputs but need not exist when a later stage is resumed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], object],
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        depends_on: Optional[List[str]] = None,
+        config_sections: Optional[List[str]] = None,
+        cacheable: bool = True,
+        optional_outputs: Optional[List[str]] = None
+    ) -> None:
+        """
+        Args:
+            name (str): Unique stage name.
+            run (Callable): Runs the stage.
+            inputs (List[str], optional): Artifacts the stage reads.
+            outputs (List[str], optional): Artifacts the stage writes.
+            depends_on (List[str], optional): Extra upstream stage names.
+            config_sections (List[str], optional): Config sections that affect the outputs, for the stage cache.
+            cacheable (bool): Whether the stage cache may skip the stage. Stages that
+                read from outside the artifacts (e.g. the database) should not be cached.
+            optional_outputs (List[str], optional): Artifacts the stage writes only in some runs.
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.depends_on = list(depends_on or [])
+        self.config_sections = list(config_sections or [])
+        self.cacheable = cacheable
+        self.optional_outputs = list(optional_outputs or [])
+
+
+class PeakMemorySampler:
+    """
+    Samples the resident set size of this process (and its children) on a
+    background thread and keeps the maximum seen.
+
+    When stages overlap, each one reports the process-wide peak during its run.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.peak_rss = 0
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _rss(self) -> int:
+        rss = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, self._rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakMemorySampler":
+        self.peak_rss = self._rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._rss())
+
+
+class PipelineRunner:
+    """
+    Runs pipeline stages as a DAG.
+
+    Dependencies come from matching stage inputs to other stages' outputs and
+    from `depends_on`. Every stage whose dependencies have finished is started
+    on a thread pool, so independent stages run concurrently. Cacheable stages
+    go through the StageCache. A run can resume from any stage: only that stage
+    and its downstream stages run, and the artifacts it needs must already exist.
+    """
+
+    def __init__(self, configuration: Configuration, stages: List[PipelineStage], max_workers: Optional[int] = None) -> None:
+        """
+        Args:
+            configuration (Configuration): Project configuration.
+            stages (List[PipelineStage]): Stages in declaration order.
+            max_workers (int, optional): Stages run at once. Defaults to `pipeline.max_workers`, else 2.
+        """
+        try:
+            self.configuration = configuration
+            self.stages: Dict[str, PipelineStage] = {}
+            for stage in stages:
+                if stage.name in self.stages:
+                    raise ValueError(f"Duplicate pipeline stage: {stage.name}")
+                self.stages[stage.name] = stage
+
+            self.max_workers = max_workers or configuration.get_value("pipeline", "max_workers") or 2
+            self.stage_cache = StageCache(configuration)
+            self.dependencies = self._build_dependencies()
+            self.report: Dict[str, dict] = {}
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _build_dependencies(self) -> Dict[str, set]:
+        producers = {}
+        for stage in self.stages.values():
+            for output in stage.outputs + stage.optional_outputs:
+                producers[os.path.normpath(output)] = stage.name
+
+        dependencies = {}
+        for stage in self.stages.values():
+            upstream = {producers[os.path.normpath(path)] for path in stage.inputs if os.path.normpath(path) in producers}
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+            dependencies[stage.name] = (upstream | set(stage.depends_on)) - {stage.name}
+
+        # Reject cycles up front with a depth-first walk
+        visiting, done = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline stages form a cycle through '{name}'")
+            visiting.add(name)
+            for upstream in dependencies[name]:
+                visit(upstream)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in dependencies:
+            visit(name)
+        return dependencies
+
+    def downstream_of(self, stage_name: str) -> List[str]:
+        """
+        `stage_name` and every stage that depends on it, directly or not, in declaration order.
+        """
+        selected = {stage_name}
+        changed = True
+        while changed:
+            changed = False
+            for name, upstream in self.dependencies.items():
+                if name not in selected and upstream & selected:
+                    selected.add(name)
+                    changed = True
+        return [name for name in self.stages if name in selected]
+
+    def _run_stage(self, stage: PipelineStage) -> dict:
+        logger.info(f"Starting pipeline stage: {stage.name}")
+        started = time.perf_counter()
+        with PeakMemorySampler() as memory:
+            cached = False
+            if stage.cacheable:
+                cached = self.stage_cache.run(
+                    stage.name, stage.run, stage.inputs, stage.outputs + stage.optional_outputs, stage.config_sections
+                )
+            else:
+                stage.run()
+        metrics = {
+            "seconds": round(time.perf_counter() - started, 3),
+            "peak_rss_mb": round(memory.peak_rss / 2 ** 20, 1),
+            "cached": cached,
+        }
+        logger.info(
+            f"Finished pipeline stage {stage.name} in {metrics['seconds']}s "
+            f"(peak RSS {metrics['peak_rss_mb']} MB{', from cache' if cached else ''})."
+        )
+        return metrics
+
+    def run(self, from_stage: Optional[str] = None) -> Dict[str, dict]:
+        """
+        Run the pipeline, or resume it from `from_stage`.
+
+        Returns:
+            Dict[str, dict]: Per-stage wall time in seconds, peak RSS in MB and whether it came from the cache.
+        """
+        try:
+            if from_stage is not None and from_stage not in self.stages:
+                raise ValueError(f"Unknown pipeline stage '{from_stage}'; expected one of {list(self.stages)}")
+            selected = self.downstream_of(from_stage) if from_stage else list(self.stages)
+
+            # Artifacts produced by skipped stages must already be on disk; optional ones may be absent
+            for name in selected:
+                for upstream in self.dependencies[name] - set(selected):
+                    missing = [path for path in self.stages[upstream].outputs if not os.path.exists(path)]
+                    if missing:
+                        raise FileNotFoundError(f"Cannot resume at '{name}': '{upstream}' outputs are missing: {missing}")
+
+            logger.info(f"Running pipeline stages: {selected}")
+            pending = {name: self.dependencies[name] & set(selected) for name in selected}
+            self.report = {}
+            started = time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                running = {}
+                while pending or running:
+                    for name in [name for name, upstream in pending.items() if not upstream]:
+                        running[executor.submit(self._run_stage, self.stages[name])] = name
+                        del pending[name]
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        # A failed stage stops the run; already running stages finish first
+                        self.report[name] = future.result()
+                        for upstream in pending.values():
+                            upstream.discard(name)
+
+            logger.info(f"Pipeline finished in {time.perf_counter() - started:.3f}s: {self.report}")
+            return self.report
+
+        except Exception as e:
+            raise CustomException(e, sys)
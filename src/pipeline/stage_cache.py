@@ -0,0 +1,328 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+
+# Bytes read at a time when hashing files
+HASH_BLOCK_SIZE = 1 << 20
+
+# Files modified this recently are re-hashed every time, since a same-size
+# rewrite within the filesystem's timestamp granularity would keep the mtime
+RACY_MTIME_SECONDS = 2.0
+
+MANIFEST_FILE = "manifest.json"
+DIGESTS_FILE = "file_digests.json"
+
+# Root of the `src` package, whose code is part of every key
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def link_or_copy(source: str, destination: str) -> None:
+    """
+    Hard-links `source` to `destination`, copying when linking is not possible
+    (e.g. across filesystems). An existing destination is replaced.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+    if os.path.lexists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage outputs.
+
+    A stage's key is a hash of its name, the contents of its input artifacts,
+    the config sections it reads, the schema file and the source of the whole
+    `src` package. On a hit the cached
+    outputs are hard-linked back into place and the stage is skipped; on a miss
+    the stage runs and its outputs are hard-linked into
+    `<cache_dir>/<key>/`. Outputs a run did not produce are recorded as absent
+    and removed again on a hit. Because of the links, outputs are unlinked before
+    every stage run (cache enabled or not), and the artifact writers in
+    src.utils.utils replace files instead of truncating them, so a stage run
+    outside the runner cannot corrupt a cached file through a shared inode.
+
+    File digests are memoized by (size, mtime) in the cache directory, so
+    unchanged large inputs are not re-hashed on every run. Entries beyond
+    `max_entries` or `max_size_mb` are evicted least recently used first.
+    """
+
+    def __init__(self, configuration: Configuration) -> None:
+        """
+        Initialize the cache from the 'cache' config section.
+        """
+        try:
+            self.configuration = configuration
+            self.enabled = bool(configuration.get_value("cache", "enabled"))
+            self.cache_dir = configuration.get_value("cache", "cache_dir") or "artifacts/.stage_cache"
+            self.max_entries = configuration.get_value("cache", "max_entries")
+            max_size_mb = configuration.get_value("cache", "max_size_mb")
+            self.max_bytes = None if max_size_mb is None else int(max_size_mb * 1024 * 1024)
+            self._lock = threading.Lock()
+            self._digests: Optional[Dict[str, dict]] = None
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _load_digests(self) -> Dict[str, dict]:
+        if self._digests is None:
+            digests_path = os.path.join(self.cache_dir, DIGESTS_FILE)
+            self._digests = {}
+            if os.path.exists(digests_path):
+                with open(digests_path, "r") as file:
+                    self._digests = json.load(file)
+        return self._digests
+
+    def _save_digests(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        digests_path = os.path.join(self.cache_dir, DIGESTS_FILE)
+        temporary_path = f"{digests_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self._digests, file)
+        os.replace(temporary_path, digests_path)
+
+    def file_digest(self, file_path: str) -> str:
+        """
+        BLAKE2b digest of a file's contents, memoized by path, size and mtime.
+        """
+        stat = os.stat(file_path)
+        path = os.path.abspath(file_path)
+        with self._lock:
+            memo = self._load_digests().get(path)
+            if memo and memo["size"] == stat.st_size and memo["mtime_ns"] == stat.st_mtime_ns:
+                return memo["digest"]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+
+        if time.time() - stat.st_mtime > RACY_MTIME_SECONDS:
+            with self._lock:
+                self._load_digests()[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest.hexdigest()}
+                self._save_digests()
+        return digest.hexdigest()
+
+    def code_digest(self) -> str:
+        """
+        Digest of every Python file in the `src` package.
+
+        Stages reach helpers through imports (schema casting, writers, the
+        preprocessor), so hashing only the module that defines a stage would
+        keep serving outputs of code that has since changed. File digests are
+        memoized, so this only re-reads files that were edited.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for directory, directories, files in os.walk(PACKAGE_DIR):
+            directories[:] = sorted(name for name in directories if name != "__pycache__")
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    path = os.path.join(directory, name)
+                    digest.update(os.path.relpath(path, PACKAGE_DIR).encode())
+                    digest.update(self.file_digest(path).encode())
+        return digest.hexdigest()
+
+    def compute_key(self, stage_name: str, input_paths: List[str], config_sections: List[str]) -> str:
+        """
+        Cache key of a stage run.
+
+        Args:
+            stage_name (str): Stage name.
+            input_paths (List[str]): Artifacts the stage reads; missing files hash as absent.
+            config_sections (List[str]): Config sections whose values affect the
+                outputs, or single 'section.key' values.
+
+        Returns:
+            str: Hex digest.
+        """
+        try:
+            key = hashlib.blake2b(digest_size=20)
+            key.update(stage_name.encode())
+            key.update(self.code_digest().encode())
+
+            schema_file = self.configuration.get_value("validation", "schema_file")
+            for path in sorted(set(input_paths) | {schema_file}):
+                key.update(path.encode())
+                key.update(self.file_digest(path).encode() if os.path.exists(path) else b"<missing>")
+
+            for section in sorted(config_sections):
+                section_name, _, value_key = section.partition(".")
+                value = (
+                    self.configuration.get_value(section_name, value_key) if value_key
+                    else self.configuration.get_section(section_name)
+                )
+                content = yaml.safe_dump(value, sort_keys=True)
+                key.update(section.encode())
+                key.update(content.encode())
+            return key.hexdigest()
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def restore(self, key: str, output_paths: List[str]) -> bool:
+        """
+        Links the outputs of a cached run back into place.
+
+        Returns:
+            bool: True on a hit, False when the entry is missing or incomplete.
+        """
+        try:
+            entry_dir = os.path.join(self.cache_dir, key)
+            manifest_path = os.path.join(entry_dir, MANIFEST_FILE)
+            if not os.path.exists(manifest_path):
+                return False
+
+            with open(manifest_path, "r") as file:
+                manifest = json.load(file)
+            cached = {
+                output["path"]: output["file"] and os.path.join(entry_dir, output["file"]) for output in manifest["outputs"]
+            }
+            if set(cached) != set(output_paths) or not all(os.path.exists(path) for path in cached.values() if path):
+                return False
+
+            for output_path, cached_path in cached.items():
+                if cached_path:
+                    link_or_copy(cached_path, output_path)
+                elif os.path.lexists(output_path):
+                    os.remove(output_path)
+
+            manifest["last_used"] = time.time()
+            with open(manifest_path, "w") as file:
+                json.dump(manifest, file)
+            return True
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def store(self, key: str, stage_name: str, output_paths: List[str]) -> None:
+        """
+        Adds a stage's outputs to the cache under `key`, then evicts old entries.
+        """
+        try:
+            entry_dir = os.path.join(self.cache_dir, key)
+            temporary_dir = f"{entry_dir}.tmp"
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+            os.makedirs(temporary_dir)
+
+            outputs = []
+            for index, output_path in enumerate(output_paths):
+                if not os.path.exists(output_path):
+                    outputs.append({"path": output_path, "file": None, "size": 0})
+                    continue
+                file_name = f"{index}_{os.path.basename(output_path)}"
+                link_or_copy(output_path, os.path.join(temporary_dir, file_name))
+                outputs.append({"path": output_path, "file": file_name, "size": os.path.getsize(output_path)})
+
+            now = time.time()
+            with open(os.path.join(temporary_dir, MANIFEST_FILE), "w") as file:
+                json.dump({"stage": stage_name, "outputs": outputs, "created": now, "last_used": now}, file)
+
+            # Publish the entry atomically so a crash never leaves a half-written hit
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temporary_dir, entry_dir)
+            self.evict()
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def evict(self) -> List[str]:
+        """
+        Removes least recently used entries until the entry count and total size fit the limits.
+
+        Returns:
+            List[str]: Keys of the evicted entries.
+        """
+        try:
+            if not os.path.isdir(self.cache_dir):
+                return []
+
+            entries = []
+            for key in os.listdir(self.cache_dir):
+                manifest_path = os.path.join(self.cache_dir, key, MANIFEST_FILE)
+                if os.path.exists(manifest_path):
+                    with open(manifest_path, "r") as file:
+                        manifest = json.load(file)
+                    size = sum(output["size"] for output in manifest["outputs"])
+                    entries.append((manifest["last_used"], key, size))
+            entries.sort()
+
+            total_size = sum(size for _, _, size in entries)
+            evicted = []
+            while entries and (
+                (self.max_entries is not None and len(entries) > self.max_entries)
+                or (self.max_bytes is not None and total_size > self.max_bytes)
+            ):
+                _, key, size = entries.pop(0)
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+                total_size -= size
+                evicted.append(key)
+
+            if evicted:
+                logger.info(f"Evicted {len(evicted)} stage cache entries; {len(entries)} remain ({total_size / 2 ** 20:.1f} MB).")
+            return evicted
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _unlink_outputs(output_paths: List[str]) -> None:
+        """
+        Drops the current outputs, which may be links to cached files, so the stage writes fresh ones.
+        """
+        for output_path in output_paths:
+            if os.path.lexists(output_path):
+                os.remove(output_path)
+
+    def run(
+        self,
+        stage_name: str,
+        stage: Callable[[], object],
+        input_paths: List[str],
+        output_paths: List[str],
+        config_sections: List[str]
+    ) -> bool:
+        """
+        Runs a stage unless an identical run is cached.
+
+        Args:
+            stage_name (str): Stage name, used in the key and the logs.
+            stage (Callable): Runs the stage and writes `output_paths`.
+            input_paths (List[str]): Artifacts the stage reads.
+            output_paths (List[str]): Artifacts the stage writes.
+            config_sections (List[str]): Config sections whose values affect the outputs.
+
+        Returns:
+            bool: True when the outputs came from the cache.
+        """
+        try:
+            if not self.enabled:
+                self._unlink_outputs(output_paths)
+                stage()
+                return False
+
+            key = self.compute_key(stage_name, list(input_paths), config_sections)
+            if self.restore(key, output_paths):
+                logger.info(f"Stage cache hit for {stage_name} ({key[:12]}); reusing its outputs.")
+                return True
+
+            logger.info(f"Stage cache miss for {stage_name} ({key[:12]}); running the stage.")
+            self._unlink_outputs(output_paths)
+            stage()
+            self.store(key, stage_name, output_paths)
+            return False
+
+        except Exception as e:
+            raise CustomException(e, sys)
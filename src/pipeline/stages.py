@@ -0,0 +1,70 @@
+from typing import List
+
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation
+from src.components.data_validation import DataValidation
+from src.components.model_search import HyperparameterSearch
+from src.components.model_trainer import ModelTrainer
+from src.config.configuration import Configuration
+from src.pipeline.runner import PipelineStage
+
+
+def build_pipeline_stages(configuration: Configuration) -> List[PipelineStage]:
+    """
+    Declares the training pipeline stages with the artifacts each one reads and writes.
+
+    Args:
+        configuration (Configuration): Project configuration.
+
+    Returns:
+        List[PipelineStage]: Stages in declaration order.
+    """
+    feature_store_path = configuration.get_artifact_path("file_paths", "feature_store")
+    train_path = configuration.get_artifact_path("file_paths", "train_data")
+    test_path = configuration.get_artifact_path("file_paths", "test_data")
+
+    data_ingestion = DataIngestion(configuration)
+    data_validation = DataValidation(configuration)
+    data_transformation = DataTransformation(configuration)
+    model_trainer = ModelTrainer(configuration)
+    training_inputs, training_outputs = model_trainer.get_artifact_paths()
+
+    return [
+        PipelineStage(
+            "data_ingestion",
+            data_ingestion.initiate_data_ingestion,
+            outputs=[feature_store_path, train_path, test_path],
+            # Reads from MongoDB, which the stage cache cannot hash
+            cacheable=False
+        ),
+        PipelineStage(
+            "data_validation",
+            data_validation.initiate_data_validation,
+            inputs=[train_path, test_path],
+            outputs=data_validation.get_output_paths(),
+            # Quarantine files exist only when rows were quarantined
+            optional_outputs=data_validation.get_optional_output_paths(),
+            # Drift sampling is seeded by training.random_state
+            config_sections=["validation", "artifacts", "training.random_state"]
+        ),
+        PipelineStage(
+            "data_transformation",
+            data_transformation.initiate_data_transformation,
+            # The manifest says which rows were quarantined and where the validated data lives
+            inputs=[train_path, test_path, configuration.get_value("validation", "manifest_file")],
+            outputs=data_transformation.get_artifact_paths(),
+            # Only transform data that passed validation
+            depends_on=["data_validation"],
+            config_sections=["transformation", "training", "artifacts"]
+        ),
+        PipelineStage(
+            "model_training",
+            # With training.search.enabled, the final model uses the best searched parameters
+            HyperparameterSearch(configuration).initiate_model_search
+            if (configuration.get_value("training", "search") or {}).get("enabled")
+            else model_trainer.initiate_model_trainer,
+            inputs=training_inputs,
+            outputs=training_outputs,
+            config_sections=["training", "transformation"]
+        ),
+    ]
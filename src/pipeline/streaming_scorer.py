@@ -0,0 +1,441 @@
+import io
+import csv
+import sys
+import json
+import time
+import queue
+import socket
+import argparse
+import operator
+import threading
+from collections import deque
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.pipeline.prediction_pipeline import PredictionPipeline
+
+# Marks the end of the stream on every queue
+END_OF_STREAM = object()
+
+# Seconds a blocked queue operation waits before re-checking for shutdown
+QUEUE_POLL_SECONDS = 0.1
+
+
+def open_flow_source(source: str) -> io.BufferedIOBase:
+    """
+    Opens a flow source for reading lines.
+
+    Args:
+        source (str): '-' for stdin, 'tcp://host:port' to connect to an exporter,
+            or the path of a file or named pipe.
+
+    Returns:
+        io.BufferedIOBase: Binary line-oriented stream.
+    """
+    if source == "-":
+        return sys.stdin.buffer
+    if source.startswith("tcp://"):
+        host, port = source[len("tcp://"):].rsplit(":", 1)
+        connection = socket.create_connection((host, int(port)))
+        # The file keeps its own reference, so closing it closes the connection
+        stream = connection.makefile("rb")
+        connection.close()
+        return stream
+    return open(source, "rb")
+
+
+def to_float(value) -> float:
+    """
+    Parses one CSV field or NDJSON value; empty, missing or malformed values become NaN.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class StreamMetrics:
+    """
+    Throughput and lag counters shared by the scorer threads.
+
+    Lag is measured per batch, from the arrival of its oldest flow to the end
+    of scoring, so it includes the time spent waiting in queues.
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self.started = time.monotonic()
+        self.flows_read = 0
+        self.flows_scored = 0
+        self.batches = 0
+        self.alerts = 0
+        self.parse_errors = 0
+        self.lags = deque(maxlen=window)
+        self.score_seconds = deque(maxlen=window)
+        self._last_report = (self.started, 0)
+        self._lock = threading.Lock()
+
+    def record_batch(self, n_flows: int, n_alerts: int, lag: float, score_seconds: float) -> None:
+        with self._lock:
+            self.flows_scored += n_flows
+            self.batches += 1
+            self.alerts += n_alerts
+            self.lags.append(lag)
+            self.score_seconds.append(score_seconds)
+
+    def snapshot(self, queue_depths: Optional[dict] = None) -> dict:
+        """
+        Sustained and recent flows/s, lag and scoring-time percentiles in ms, counters and queue depths.
+        """
+        with self._lock:
+            now = time.monotonic()
+            last_time, last_scored = self._last_report
+            self._last_report = (now, self.flows_scored)
+            lags = np.asarray(self.lags) * 1000
+            score_ms = np.asarray(self.score_seconds) * 1000
+
+            snapshot = {
+                "seconds": round(now - self.started, 3),
+                "flows_read": self.flows_read,
+                "flows_scored": self.flows_scored,
+                "batches": self.batches,
+                "alerts": self.alerts,
+                "parse_errors": self.parse_errors,
+                "flows_per_second": round(self.flows_scored / max(now - self.started, 1e-9), 1),
+                "recent_flows_per_second": round((self.flows_scored - last_scored) / max(now - last_time, 1e-9), 1),
+            }
+            for name, values in (("lag_ms", lags), ("score_ms", score_ms)):
+                if values.size:
+                    p50, p99 = np.percentile(values, [50, 99])
+                    snapshot[name] = {"p50": round(float(p50), 3), "p99": round(float(p99), 3), "max": round(float(values.max()), 3)}
+            if queue_depths is not None:
+                snapshot["queue_depths"] = queue_depths
+            return snapshot
+
+
+class StreamingScorer:
+    """
+    Scores a continuous stream of flow records from a CICFlowMeter-style exporter.
+
+    Four stages run on their own threads, connected by bounded queues:
+
+    - a reader parses newline-delimited JSON or CSV flows from a file, pipe or socket,
+    - a batcher groups them into micro-batches of `batch_size` flows, or fewer
+      once the oldest flow has waited `max_batch_delay_ms`,
+    - a pool of workers scores batches with the PredictionPipeline, whose
+      preprocessing buffers are per thread and whose model releases the GIL,
+    - a sink hands alerts (non-benign predictions at or above `alert_threshold`)
+      to a callback.
+
+    When a downstream stage falls behind, its queue fills and the stages
+    before it block, so the reader stops reading and the exporter sees
+    backpressure instead of the scorer buffering without bound.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        pipeline: Optional[PredictionPipeline] = None,
+        alert_sink: Optional[Callable[[dict], None]] = None
+    ) -> None:
+        """
+        Args:
+            configuration (Configuration): Project configuration; settings come from the 'streaming' section.
+            pipeline (PredictionPipeline, optional): Loaded pipeline; built from the configuration by default.
+            alert_sink (Callable, optional): Called with every alert from the sink thread.
+                Defaults to writing JSON lines to `streaming.alert_output`.
+        """
+        try:
+            self.configuration = configuration
+            settings = configuration.get_section("streaming") or {}
+            self.format = settings.get("format") or "ndjson"
+            if self.format not in ("ndjson", "csv"):
+                raise ValueError(f"Unsupported flow format: {self.format}")
+            self.batch_size = settings.get("batch_size") or 1000
+            self.max_batch_delay = (settings.get("max_batch_delay_ms") or 50) / 1000
+            self.n_workers = settings.get("workers") or 2
+            self.benign_label = settings.get("benign_label") or "BENIGN"
+            self.alert_threshold = settings.get("alert_threshold") or 0.0
+            self.id_fields: List[str] = list(settings.get("id_fields") or [])
+            self.report_interval = settings.get("report_interval_seconds") or 10
+            self.alert_output = settings.get("alert_output") or "-"
+
+            self.pipeline = pipeline or PredictionPipeline(configuration)
+            self.alert_sink = alert_sink
+            self.records = queue.Queue(maxsize=settings.get("record_queue_size") or 10000)
+            self.batches = queue.Queue(maxsize=settings.get("batch_queue_size") or 2 * self.n_workers)
+            self.alerts = queue.Queue(maxsize=settings.get("alert_queue_size") or 10000)
+            self.metrics = StreamMetrics()
+            self._header: Optional[List[str]] = None
+            self._ndjson_getter = operator.itemgetter(*self.pipeline.input_columns)
+            self._stop = threading.Event()
+            self._errors: List[BaseException] = []
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def queue_depths(self) -> dict:
+        return {"records": self.records.qsize(), "batches": self.batches.qsize(), "alerts": self.alerts.qsize()}
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        """
+        Blocking put that gives up when the scorer is stopping. Returns False if it gave up.
+        """
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_thread(self, target: Callable, *args) -> None:
+        # A failing stage stops the others, and run() re-raises its error
+        try:
+            target(*args)
+        except BaseException as error:
+            self._errors.append(error)
+            self._stop.set()
+
+    def _parse(self, line: bytes):
+        """
+        One flow record from a line: a dict for NDJSON, a list of fields for CSV.
+        Returns None for blank lines and the CSV header. Raises ValueError for
+        lines that are not a record, which the reader counts as parse errors.
+        """
+        if not line.strip():
+            return None
+        if self.format == "ndjson":
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"Expected a JSON object per line, got {type(record).__name__}")
+            return record
+        fields = next(csv.reader([line.decode()]))
+        if self._header is None:
+            # CICFlowMeter pads header names with spaces
+            self._header = [field.strip() for field in fields]
+            self._set_csv_columns(self._header)
+            return None
+        if fields and fields[0].strip() == self._header[0]:
+            # Repeated header of another exported file
+            return None
+        return fields
+
+    def _set_csv_columns(self, header: List[str]) -> None:
+        positions = {column: index for index, column in enumerate(header)}
+        self._csv_missing = [column for column in self.pipeline.input_columns if column not in positions]
+        if self._csv_missing:
+            logger.warning(f"CSV header lacks {len(self._csv_missing)} schema columns; they are imputed: {self._csv_missing}")
+        # Absent columns read an appended empty field, which parses as NaN
+        padding = len(header)
+        self._csv_getter = operator.itemgetter(*(positions.get(column, padding) for column in self.pipeline.input_columns))
+        self._csv_id_positions = {field: positions[field] for field in self.id_fields if field in positions}
+
+    def read(self, stream) -> None:
+        """
+        Reader thread: parses lines and queues (arrival time, record) pairs.
+        """
+        try:
+            for line in stream:
+                if self._stop.is_set():
+                    break
+                try:
+                    record = self._parse(line)
+                except (ValueError, UnicodeDecodeError, csv.Error):
+                    self.metrics.parse_errors += 1
+                    continue
+                if record is None:
+                    continue
+                self.metrics.flows_read += 1
+                if not self._put(self.records, (time.monotonic(), record)):
+                    break
+        finally:
+            self._put(self.records, END_OF_STREAM)
+
+    def batch(self) -> None:
+        """
+        Batcher thread: cuts micro-batches by size or by the age of their oldest flow.
+        """
+        batch, arrivals, deadline = [], None, None
+        while not self._stop.is_set():
+            timeout = QUEUE_POLL_SECONDS if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.records.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is END_OF_STREAM:
+                break
+            if item is not None:
+                arrival, record = item
+                if not batch:
+                    arrivals, deadline = arrival, arrival + self.max_batch_delay
+                batch.append(record)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                if not self._put(self.batches, (arrivals, batch)):
+                    return
+                batch, arrivals, deadline = [], None, None
+
+        if batch:
+            self._put(self.batches, (arrivals, batch))
+        for _ in range(self.n_workers):
+            self._put(self.batches, END_OF_STREAM)
+
+    def to_array(self, batch: list) -> np.ndarray:
+        """
+        A batch of parsed records as an array in schema feature order.
+        """
+        if self.format == "ndjson":
+            columns = self.pipeline.input_columns
+            try:
+                rows = list(map(self._ndjson_getter, batch))
+            except KeyError:
+                rows = [[record.get(column) for column in columns] for record in batch]
+            try:
+                return np.array(rows, dtype=np.float64).reshape(len(rows), len(columns))
+            except (TypeError, ValueError):
+                # Some value is empty, not a number or not a scalar
+                return np.array([[to_float(value) for value in row] for row in rows], dtype=np.float64).reshape(len(rows), len(columns))
+        rows = [self._csv_getter(fields + [""]) for fields in batch]
+        try:
+            return np.array(rows, dtype=np.float64).reshape(len(rows), -1)
+        except ValueError:
+            # Some field is empty or not a number
+            return np.array([[to_float(value) for value in row] for row in rows], dtype=np.float64).reshape(len(rows), -1)
+
+    def flow_ids(self, record) -> dict:
+        if self.format == "ndjson":
+            return {field: record[field] for field in self.id_fields if field in record}
+        return {field: record[position] for field, position in self._csv_id_positions.items() if position < len(record)}
+
+    def score(self) -> None:
+        """
+        Worker thread: scores batches and queues alerts.
+        """
+        while not self._stop.is_set():
+            try:
+                item = self.batches.get(timeout=QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if item is END_OF_STREAM:
+                break
+
+            arrival, batch = item
+            started = time.monotonic()
+            labels, scores = self.pipeline.predict(self.to_array(batch))
+            alert_rows = np.flatnonzero((labels != self.benign_label) & (scores >= self.alert_threshold))
+            finished = time.monotonic()
+
+            for row in alert_rows:
+                alert = {
+                    **self.flow_ids(batch[row]),
+                    "label": str(labels[row]),
+                    "score": float(scores[row]),
+                    "lag_ms": round((finished - arrival) * 1000, 3),
+                }
+                if not self._put(self.alerts, alert):
+                    return
+            self.metrics.record_batch(len(batch), alert_rows.size, finished - arrival, finished - started)
+
+        self._put(self.alerts, END_OF_STREAM)
+
+    def sink(self, sink: Callable[[dict], None]) -> None:
+        """
+        Sink thread: hands alerts to `sink` until every worker has finished.
+        """
+        finished_workers = 0
+        while finished_workers < self.n_workers and not self._stop.is_set():
+            try:
+                alert = self.alerts.get(timeout=QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if alert is END_OF_STREAM:
+                finished_workers += 1
+            else:
+                sink(alert)
+
+    def report(self, done: threading.Event) -> None:
+        """
+        Reporter thread: logs throughput, lag and queue depths every `report_interval_seconds`.
+        """
+        while not done.wait(self.report_interval):
+            logger.info(f"Streaming scorer: {self.metrics.snapshot(self.queue_depths())}")
+
+    def run(self, source=None) -> dict:
+        """
+        Scores a flow source until it ends.
+
+        Args:
+            source: An open binary stream, or a source string for open_flow_source;
+                defaults to `streaming.source`.
+
+        Returns:
+            dict: Final throughput and lag metrics.
+        """
+        try:
+            source = source or self.configuration.get_value("streaming", "source") or "-"
+            stream = open_flow_source(source) if isinstance(source, str) else source
+            output = None
+            sink = self.alert_sink
+            if sink is None:
+                output = sys.stdout if self.alert_output == "-" else open(self.alert_output, "a")
+                sink = lambda alert: output.write(json.dumps(alert) + "\n")
+
+            logger.info(
+                f"Scoring {self.format} flows from {source} in batches of up to {self.batch_size} "
+                f"(max {self.max_batch_delay * 1000:.0f} ms) on {self.n_workers} workers."
+            )
+            self.metrics = StreamMetrics()
+            done = threading.Event()
+            threads = [
+                threading.Thread(target=self._run_thread, args=(self.read, stream), name="flow-reader", daemon=True),
+                threading.Thread(target=self._run_thread, args=(self.batch,), name="flow-batcher"),
+                *(threading.Thread(target=self._run_thread, args=(self.score,), name=f"flow-scorer-{index}")
+                  for index in range(self.n_workers)),
+                threading.Thread(target=self._run_thread, args=(self.sink, sink), name="alert-sink"),
+            ]
+            reporter = threading.Thread(target=self.report, args=(done,), name="stream-reporter", daemon=True)
+            for thread in threads:
+                thread.start()
+            reporter.start()
+
+            try:
+                # The reader may be blocked on a quiet socket; it is a daemon and is left to the close below
+                for thread in threads[1:]:
+                    thread.join()
+            finally:
+                self._stop.set()
+                done.set()
+                if isinstance(source, str) and source != "-":
+                    stream.close()
+                if output is not None:
+                    output.flush()
+                    if output is not sys.stdout:
+                        output.close()
+
+            if self._errors:
+                raise self._errors[0]
+            metrics = self.metrics.snapshot(self.queue_depths())
+            logger.info(f"Streaming scorer finished: {metrics}")
+            return metrics
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    try:
+        parser = argparse.ArgumentParser(description="Score a stream of network flows and emit alerts.")
+        parser.add_argument("--config", default="config/config.yaml", help="Path to the config file.")
+        parser.add_argument(
+            "--source",
+            default=None,
+            help="'-' for stdin, tcp://host:port, or a file or named pipe path (default: streaming.source)."
+        )
+        args = parser.parse_args()
+        StreamingScorer(Configuration(args.config)).run(args.source)
+    except Exception as e:
+        raise CustomException(e, sys)
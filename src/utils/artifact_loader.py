@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+
+
+class ArtifactLoader:
+    """
+    Loads tabular artifacts concurrently and keeps recently loaded frames in memory.
+
+    Reads run on a thread pool; the parquet/feather readers and the csv parser
+    release the GIL for most of their work, so train and test load in parallel.
+    Loaded frames are kept in an LRU cache bounded by a memory budget and
+    keyed by file path, size, modification time and reader, so a later stage in
+    the same process gets the already-parsed frame, and a rewritten file is
+    re-read. Concurrent requests for the same artifact share one read.
+
+    Cached frames are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_workers: int = 4, memory_budget_mb: float = 2048) -> None:
+        """
+        Args:
+            max_workers (int): Artifacts read at once.
+            memory_budget_mb (float): Total size of cached frames; least recently used frames are dropped beyond it.
+        """
+        self.max_workers = max_workers
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames: "OrderedDict[Tuple, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-loader")
+
+    @staticmethod
+    def _cache_key(file_path: str, reader_key: str) -> Tuple:
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, reader_key
+
+    def _store(self, key: Tuple, dataframe: pd.DataFrame) -> None:
+        size = int(dataframe.memory_usage(deep=True).sum())
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if size > self.memory_budget:
+                return
+            self._frames[key] = (dataframe, size)
+            self.cached_bytes += size
+            while self.cached_bytes > self.memory_budget:
+                _, (_, evicted_size) = self._frames.popitem(last=False)
+                self.cached_bytes -= evicted_size
+
+    def _read(self, key: Tuple, file_path: str, reader: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        try:
+            dataframe = reader(file_path)
+        except BaseException:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            raise
+        self._store(key, dataframe)
+        return dataframe
+
+    def load(self, file_paths: List[str], reader: Callable[[str], pd.DataFrame], reader_key: str) -> List[pd.DataFrame]:
+        """
+        Load several artifacts at once, from the cache where possible.
+
+        Args:
+            file_paths (List[str]): Artifacts to load.
+            reader (Callable): Reads one artifact into a DataFrame.
+            reader_key (str): Identifies how `reader` parses files (e.g. schema and downcast
+                settings); frames are only reused for the same key.
+
+        Returns:
+            List[pd.DataFrame]: Frames in the order of `file_paths`.
+        """
+        try:
+            futures = []
+            for file_path in file_paths:
+                key = self._cache_key(file_path, reader_key)
+                with self._lock:
+                    if key in self._frames:
+                        self._frames.move_to_end(key)
+                        self.hits += 1
+                        future = Future()
+                        future.set_result(self._frames[key][0])
+                        logger.info(f"Reusing already loaded frame for: {file_path}")
+                    elif key in self._in_flight:
+                        self.hits += 1
+                        future = self._in_flight[key]
+                    else:
+                        self.misses += 1
+                        future = self._executor.submit(self._read, key, file_path, reader)
+                        self._in_flight[key] = future
+                futures.append(future)
+            return [future.result() for future in futures]
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def clear(self) -> None:
+        """
+        Drop every cached frame.
+        """
+        with self._lock:
+            self._frames.clear()
+            self.cached_bytes = 0
+
+
+_loaders: Dict[Tuple, ArtifactLoader] = {}
+_loaders_lock = threading.Lock()
+
+
+def get_artifact_loader(configuration: Optional[Configuration] = None) -> ArtifactLoader:
+    """
+    Returns the process-wide ArtifactLoader for the 'artifacts' config settings.
+
+    Args:
+        configuration (Configuration, optional): Project configuration. Defaults apply without it.
+
+    Returns:
+        ArtifactLoader: Shared loader.
+    """
+    settings = configuration.get_section("artifacts") if configuration is not None else {}
+    key = (os.getpid(), settings.get("loader_workers") or 4, settings.get("loader_cache_mb") or 2048)
+    with _loaders_lock:
+        if key not in _loaders:
+            _loaders[key] = ArtifactLoader(max_workers=key[1], memory_budget_mb=key[2])
+        return _loaders[key]
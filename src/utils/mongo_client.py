@@ -0,0 +1,115 @@
+import os
+import sys
+import atexit
+import threading
+import certifi
+from typing import Dict, Optional, Tuple
+from pymongo.mongo_client import MongoClient
+from dotenv import load_dotenv
+
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+
+# Client settings used when the 'db' config section does not set them
+DEFAULT_CLIENT_OPTIONS: Dict[str, object] = {
+    "max_pool_size": 100,
+    "min_pool_size": 0,
+    "connect_timeout_ms": 20000,
+    "socket_timeout_ms": 100000,
+    "server_selection_timeout_ms": 30000,
+    "read_preference": "primary",
+    "compressors": "zstd,snappy,zlib",
+}
+
+# Mapping of 'db' config keys to MongoClient keyword arguments
+CLIENT_OPTION_NAMES: Dict[str, str] = {
+    "max_pool_size": "maxPoolSize",
+    "min_pool_size": "minPoolSize",
+    "connect_timeout_ms": "connectTimeoutMS",
+    "socket_timeout_ms": "socketTimeoutMS",
+    "server_selection_timeout_ms": "serverSelectionTimeoutMS",
+    "read_preference": "readPreference",
+    "compressors": "compressors",
+}
+
+_clients: Dict[Tuple, MongoClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client_options(configuration: Optional[Configuration] = None) -> Dict[str, object]:
+    """
+    Builds MongoClient keyword arguments from the 'db' config section.
+
+    Args:
+        configuration (Configuration, optional): Project configuration. Defaults are used without it.
+
+    Returns:
+        Dict[str, object]: Pool size, timeouts, read preference, wire compression and TLS CA file.
+    """
+    db_config = configuration.get_section("db") if configuration is not None else {}
+
+    options = {}
+    for key, option_name in CLIENT_OPTION_NAMES.items():
+        value = db_config.get(key, DEFAULT_CLIENT_OPTIONS[key])
+        if value is not None:
+            options[option_name] = value
+
+    # Load SSL certificate authority file path for a secure TLS connection
+    options["tlsCAFile"] = certifi.where()
+    return options
+
+
+def get_mongo_client(configuration: Optional[Configuration] = None) -> MongoClient:
+    """
+    Returns the process-wide MongoClient for the configured URI and options.
+
+    Clients are created on first use and then shared, so every stage in a
+    process reuses the same connection pool. Callers must not close the
+    returned client; all clients are closed at interpreter exit. A forked
+    child process gets its own client, since MongoClient is not fork-safe.
+
+    Args:
+        configuration (Configuration, optional): Project configuration. Without it,
+            the URI comes from the MONGO_URI environment variable and default options apply.
+
+    Returns:
+        MongoClient: Shared client.
+    """
+    try:
+        if configuration is not None:
+            mongo_uri = configuration.get_db_value("uri_env_key")
+        else:
+            load_dotenv()
+            mongo_uri = os.getenv("MONGO_URI")
+
+        options = get_client_options(configuration)
+        key = (os.getpid(), mongo_uri, tuple(sorted((name, str(value)) for name, value in options.items())))
+
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = MongoClient(mongo_uri, **options)
+                _clients[key] = client
+                logger.info(
+                    f"Created MongoDB client (pool size {options.get('maxPoolSize')}, "
+                    f"compressors {options.get('compressors')}, read preference {options.get('readPreference')})."
+                )
+            return client
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def close_mongo_clients() -> None:
+    """
+    Closes every client created by get_mongo_client in this process.
+    """
+    with _clients_lock:
+        for key, client in list(_clients.items()):
+            if key[0] == os.getpid():
+                client.close()
+            del _clients[key]
+
+
+atexit.register(close_mongo_clients)
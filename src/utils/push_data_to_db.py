@@ -1,46 +1,124 @@
 import os
 import sys
 import json
-import certifi
+import random
+import threading
 import time
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from pymongo.mongo_client import MongoClient
 from pymongo import errors
-from dotenv import load_dotenv
 
+from src.config.configuration import Configuration
 from src.exception.exception import CustomException
 from src.logging.logger import logger 
+from src.utils.mongo_client import get_mongo_client
 
-# Load environment variables from a .env file
-load_dotenv()
+# Field stamped on every loaded document, used for incremental exports
+INGESTED_AT_FIELD: str = "ingested_at"
 
-# Retrieve MongoDB URI from environment variables
-MONGO_DB_URI: str = os.getenv("MONGO_URI")
+# MongoDB error code for a duplicate _id
+DUPLICATE_KEY_ERROR: int = 11000
 
-# Load SSL certificate authority file path for a secure TLS connection
-ca: str = certifi.where()
+
+class IngestionCheckpoint:
+    """
+    Tracks how far a CSV load has been committed so an interrupted load can resume.
+
+    Batches may finish out of order when inserted concurrently, so the
+    checkpoint only advances over the contiguous prefix of committed batches.
+    The file is rewritten atomically after every advance and is only trusted
+    if the source file size, modification time and batch size still match.
+    """
+
+    def __init__(self, checkpoint_path: str, source_path: str, batch_size: int) -> None:
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        stat = os.stat(source_path)
+        self.source = {"path": os.path.abspath(source_path), "size": stat.st_size, "mtime": stat.st_mtime}
+        self.committed_rows = 0
+        self._lock = threading.Lock()
+        self._next_batch = 1
+        self._done_batches: Dict[int, int] = {}
+
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, "r") as file:
+                state = json.load(file)
+            if state.get("source") == self.source and state.get("batch_size") == batch_size:
+                self.committed_rows = state["committed_rows"]
+                logger.info(f"Resuming load of {source_path} after {self.committed_rows} committed rows.")
+            else:
+                logger.info(f"Ignoring stale checkpoint {checkpoint_path}: source or batch size changed.")
+
+    def mark_committed(self, batch_number: int, n_rows: int) -> None:
+        """
+        Record a committed batch (numbered from 1 after the resume point) and
+        advance the checkpoint over any contiguous run of committed batches.
+        """
+        with self._lock:
+            self._done_batches[batch_number] = n_rows
+            advanced = False
+            while self._next_batch in self._done_batches:
+                self.committed_rows += self._done_batches.pop(self._next_batch)
+                self._next_batch += 1
+                advanced = True
+            if advanced:
+                self._write()
+
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"source": self.source, "batch_size": self.batch_size, "committed_rows": self.committed_rows}, file)
+        os.replace(temporary_path, self.checkpoint_path)
 
 
 class NetworkDataHandler:
     """
     Handles network intrusion data operations:
     - Converts CSV files to JSON-like records
+    - Streams CSV files into the database in constant memory
     - Inserts data into a Database
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queued_batches: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        configuration: Optional[Configuration] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
         """
         Initialize the MongoDB client connection using the connection URI 
         and SSL certificate for a secure connection.
+
+        Args:
+            max_workers (int): Number of insert_many batches kept in flight at once.
+            max_queued_batches (int): Batches allowed to wait for a free worker before
+                the producer blocks (backpressure on the CSV reader).
+            max_retries (int): Attempts per batch before it is given up.
+            backoff_base (float): Base delay in seconds of the exponential backoff.
+            backoff_cap (float): Upper bound in seconds of a single backoff delay.
+            configuration (Configuration, optional): Project configuration for the shared
+                MongoDB client. Without it, MONGO_URI and the default client options are used.
+            sleep (Callable[[float], None]): Waits out a backoff delay; injectable for tests.
         """
         try:
-            self.client = MongoClient(
-                MONGO_DB_URI,
-                tlsCAFile=ca,
-                connectTimeoutMS=100000,  
-                socketTimeoutMS=100000   
-            )
+            self.max_workers = max_workers
+            self.max_queued_batches = max_queued_batches
+            self.max_retries = max_retries
+            self.backoff_base = backoff_base
+            self.backoff_cap = backoff_cap
+            self.sleep = sleep
+            self.last_insert_stats: Dict[str, float] = {}
+
+            self.client = get_mongo_client(configuration)
             logger.info("MongoDB client initialized successfully.")
         except Exception as e:
             raise CustomException(e, sys)
@@ -65,75 +143,289 @@ class NetworkDataHandler:
             logger.error("Error while converting CSV to JSON.")
             raise CustomException(e, sys)
 
-    def insert_records_to_db(
+    @staticmethod
+    def compute_document_ids(chunk: pd.DataFrame, start_row: int) -> np.ndarray:
+        """
+        Deterministic document IDs: a 64-bit hash of each row's content and its
+        row offset in the source file.
+
+        The offset keeps genuinely repeated flows apart, while reloading the same
+        file always yields the same IDs, so re-inserted rows hit the unique `_id`
+        index instead of being duplicated.
+
+        pandas infers column types per chunk, so an integer column is float64 in
+        any chunk with a missing value. Numeric columns are hashed as float64 so
+        a row's ID does not depend on how the file was chunked.
+
+        Args:
+            chunk (pd.DataFrame): Rows to hash.
+            start_row (int): Offset of the chunk's first row in the source file.
+
+        Returns:
+            np.ndarray: int64 IDs, one per row.
+        """
+        offsets = np.arange(start_row, start_row + len(chunk), dtype=np.int64)
+        numeric = chunk.select_dtypes(include="number").columns
+        canonical = chunk.astype({column: np.float64 for column in numeric})
+        hashes = pd.util.hash_pandas_object(canonical.assign(_row_offset=offsets), index=False)
+        return hashes.to_numpy().view(np.int64)
+
+    def iter_csv_record_batches(self, file_path: str, batch_size: int = 10000, skip_rows: int = 0) -> Iterator[List[Dict]]:
+        """
+        Streams a CSV file as batches of BSON-ready dictionary records.
+
+        Each chunk read by pandas is converted straight to a list of dicts with
+        native Python values, skipping the JSON round-trip, so only one batch is
+        ever held in memory. NaN and +/-inf are kept as BSON doubles. Every
+        record gets a content-hash `_id`; `ingested_at` is stamped when the
+        batch is sent (see _insert_batch).
+
+        Args:
+            file_path (str): Path to the CSV file.
+            batch_size (int): Number of rows per batch. Default is 10,000.
+            skip_rows (int): Data rows to skip at the start, e.g. already committed ones.
+
+        Yields:
+            List[Dict]: One batch of dictionary records.
+        """
+        try:
+            start_row = 0
+            for chunk in pd.read_csv(file_path, chunksize=batch_size):
+                # Drop already committed rows chunk by chunk; a skiprows range would
+                # build a skip set as large as the checkpoint offset
+                if start_row + len(chunk) <= skip_rows:
+                    start_row += len(chunk)
+                    continue
+                if start_row < skip_rows:
+                    chunk = chunk.iloc[skip_rows - start_row:]
+                    start_row = skip_rows
+                document_ids = self.compute_document_ids(chunk, start_row)
+                chunk.insert(0, "_id", document_ids)
+                start_row += len(chunk)
+                yield chunk.to_dict(orient="records")
+        except Exception as e:
+            logger.error("Error while streaming CSV records.")
+            raise CustomException(e, sys)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter: a random delay between 0 and
+        min(backoff_cap, backoff_base * 2 ** attempt) seconds.
+        """
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _insert_batch(self, collection, batch: List[Dict], batch_number: int) -> Tuple[int, bool]:
+        """
+        Inserts one batch, retrying with exponential backoff and jitter.
+
+        Duplicate `_id` errors mean the rows were committed by an earlier run,
+        so a batch whose only errors are duplicates still counts as committed.
+
+        Every attempt stamps the batch with the current `ingested_at`, so the
+        timestamp trails the commit by at most one insert call, however long
+        the batch waited in the queue or retried. Incremental exports stay
+        `ingestion.watermark_lag_seconds` behind to cover that gap.
+
+        Args:
+            collection: Target MongoDB collection.
+            batch (List[Dict]): Records to insert.
+            batch_number (int): 1-based batch number, for logging.
+
+        Returns:
+            Tuple[int, bool]: Number of records inserted, and whether the whole batch is committed.
+        """
+        attempt = 0
+
+        # Retry mechanism: attempt up to max_retries times per batch
+        while attempt < self.max_retries:
+            try:
+                ingested_at = datetime.now(timezone.utc)
+                for document in batch:
+                    document[INGESTED_AT_FIELD] = ingested_at
+
+                # Insert current batch, unordered so it continues on errors like duplicates
+                result = collection.insert_many(batch, ordered=False)
+                inserted_count = len(result.inserted_ids)
+                logger.info(f"Inserted batch {batch_number} — {inserted_count} records.")
+                return inserted_count, True
+
+            except errors.BulkWriteError as bwe:
+                inserted_count = bwe.details.get("nInserted", 0)
+                write_errors = bwe.details.get("writeErrors", [])
+                other_errors = [error for error in write_errors if error.get("code") != DUPLICATE_KEY_ERROR]
+                if not other_errors:
+                    logger.info(
+                        f"Batch {batch_number}: {inserted_count} inserted, "
+                        f"{len(write_errors)} already present from an earlier load."
+                    )
+                    return inserted_count, True
+
+                # Errors other than duplicates will not go away on retry
+                logger.error(f"Bulk write error in batch {batch_number}: {other_errors[:5]}")
+                return inserted_count, False
+
+            except Exception as e:
+                # Log the failure and retry after a randomized, growing delay
+                attempt += 1
+                logger.error(f"Attempt {attempt} failed for batch {batch_number}: {e}")
+                if attempt < self.max_retries:
+                    self.sleep(self._backoff_delay(attempt - 1))
+
+        logger.error(f"Failed to insert batch {batch_number} after {self.max_retries} attempts.")
+        return 0, False
+
+    def insert_record_batches_to_db(
         self,
-        records: List[Dict],
+        batches: Iterable[List[Dict]],
         database_name: str,
         collection_name: str,
-        batch_size: int = 10000
+        on_batch_committed: Optional[Callable[[int, int], None]] = None
     ) -> int:
         """
-        Inserts records into a MongoDB collection in batches with retry logic.
+        Inserts an iterable of record batches into a MongoDB collection concurrently.
+
+        Up to `max_workers` insert_many calls run at once on a thread pool. Batches
+        are consumed lazily and at most `max_workers + max_queued_batches` are held
+        at any time, so a generator such as `iter_csv_record_batches` blocks
+        instead of reading ahead, and memory stays flat regardless of the source
+        size. Throughput is logged and kept in `last_insert_stats`.
 
         Args:
-            records (List[Dict]): List of records to insert.
+            batches (Iterable[List[Dict]]): Batches of records to insert.
             database_name (str): Name of the target database.
             collection_name (str): Name of the target collection.
-            batch_size (int): Number of records per batch. Default is 10,000.
+            on_batch_committed (Callable[[int, int], None], optional): Called with the
+                batch number and row count once a batch is fully committed.
 
         Returns:
             int: Total number of records successfully inserted.
+
+        Raises:
+            CustomException: If any batch could not be committed; already committed
+                batches stay committed and a checkpointed load can be resumed.
         """
         try:
             client: MongoClient = self.client
-            database = client[database_name]
-            collection = database[collection_name]
-
-            total_inserted = 0
-            total_batches = (len(records) + batch_size - 1) // batch_size
-
-            # Split records into batches and insert them one by one
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                attempt = 0
-                success = False
-
-                # Retry mechanism: attempt up to 3 times per batch
-                while attempt < 3 and not success:
-                    try:
-                        # Insert current batch, unordered so it continues on errors like duplicates
-                        result = collection.insert_many(batch, ordered=False)
-                        inserted_count = len(result.inserted_ids)
-                        total_inserted += inserted_count
-
-                        logger.info(
-                            f"Inserted batch {i // batch_size + 1}/{total_batches} — {inserted_count} records."
-                        )
-                        success = True
-
-                    except errors.BulkWriteError as bwe:
-                        # Handle bulk write errors like duplicate key issues
-                        logger.error(f"Bulk write error in batch {i // batch_size + 1}: {bwe.details}")
-                        success = True  # Continue even if partial insert occurs
-
-                    except Exception as e:
-                        # Log the failure and retry after a short delay
-                        attempt += 1
-                        logger.error(f"Attempt {attempt} failed for batch {i // batch_size + 1}: {e}")
-                        time.sleep(2)
-
-                if not success:
-                    logger.error(f"Failed to insert batch {i // batch_size + 1} after 3 attempts.")
+            collection = client[database_name][collection_name]
+
+            # Bounds the batches that are in flight or queued for a worker
+            slots = threading.BoundedSemaphore(self.max_workers + self.max_queued_batches)
+            lock = threading.Lock()
+            totals = {"inserted": 0, "records": 0, "failed_batches": 0}
+            start_time = time.perf_counter()
+
+            def insert(batch: List[Dict], batch_number: int) -> None:
+                try:
+                    inserted_count, committed = self._insert_batch(collection, batch, batch_number)
+                    with lock:
+                        totals["inserted"] += inserted_count
+                        totals["records"] += len(batch)
+                        totals["failed_batches"] += not committed
+                    if committed and on_batch_committed is not None:
+                        on_batch_committed(batch_number, len(batch))
+                finally:
+                    slots.release()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = []
+                for batch_number, batch in enumerate(batches, start=1):
+                    slots.acquire()
+                    pending.append(executor.submit(insert, batch, batch_number))
+
+                    # Surface worker errors early and let finished batches be freed
+                    still_pending = []
+                    for future in pending:
+                        if future.done():
+                            future.result()
+                        else:
+                            still_pending.append(future)
+                    pending = still_pending
+
+                for future in pending:
+                    future.result()
+
+            elapsed = time.perf_counter() - start_time
+            total_inserted = totals["inserted"]
+            self.last_insert_stats = {
+                "records": totals["records"],
+                "inserted": total_inserted,
+                "seconds": elapsed,
+                "records_per_second": total_inserted / elapsed if elapsed > 0 else 0.0
+            }
 
             logger.info(
-                f"Total records successfully inserted into '{database_name}.{collection_name}': {total_inserted}"
+                f"Total records successfully inserted into '{database_name}.{collection_name}': {total_inserted} "
+                f"in {elapsed:.2f}s ({self.last_insert_stats['records_per_second']:.0f} records/s)"
             )
+            if totals["failed_batches"]:
+                raise CustomException(f"{totals['failed_batches']} batch(es) could not be committed.", sys)
             return total_inserted
 
         except Exception as e:
             logger.error("An error occurred during data ingestion.")
             raise CustomException(e, sys)
 
+    def insert_records_to_db(
+        self,
+        records: List[Dict],
+        database_name: str,
+        collection_name: str,
+        batch_size: int = 10000
+    ) -> int:
+        """
+        Inserts records into a MongoDB collection in batches with retry logic.
+
+        Args:
+            records (List[Dict]): List of records to insert.
+            database_name (str): Name of the target database.
+            collection_name (str): Name of the target collection.
+            batch_size (int): Number of records per batch. Default is 10,000.
+
+        Returns:
+            int: Total number of records successfully inserted.
+        """
+        # Split records into batches and insert them one by one
+        batches = (records[i:i + batch_size] for i in range(0, len(records), batch_size))
+        return self.insert_record_batches_to_db(batches, database_name, collection_name)
+
+    def load_csv_to_db(
+        self,
+        file_path: str,
+        database_name: str,
+        collection_name: str,
+        batch_size: int = 10000,
+        checkpoint_path: Optional[str] = None
+    ) -> int:
+        """
+        Streams a CSV file into a MongoDB collection without holding the whole file in memory.
+
+        The load is idempotent: documents get content-hash IDs, so rows that are
+        loaded twice are skipped by the database. Progress is recorded in a
+        checkpoint file after every committed batch, and a rerun after a crash
+        resumes after the last committed row instead of starting over.
+
+        Args:
+            file_path (str): Path to the CSV file.
+            database_name (str): Name of the target database.
+            collection_name (str): Name of the target collection.
+            batch_size (int): Number of records per batch. Default is 10,000.
+            checkpoint_path (str, optional): Checkpoint file. Defaults to `<file_path>.checkpoint.json`.
+
+        Returns:
+            int: Total number of records successfully inserted by this run.
+        """
+        checkpoint = IngestionCheckpoint(
+            checkpoint_path or f"{file_path}.checkpoint.json",
+            source_path=file_path,
+            batch_size=batch_size
+        )
+        batches = self.iter_csv_record_batches(file_path, batch_size=batch_size, skip_rows=checkpoint.committed_rows)
+        return self.insert_record_batches_to_db(
+            batches,
+            database_name,
+            collection_name,
+            on_batch_committed=checkpoint.mark_committed
+        )
 
 
 if __name__ == "__main__":
@@ -141,18 +433,16 @@ if __name__ == "__main__":
         # CSV file path for processed network intrusion data
         FILE_PATH: str = "../../data/processed/clean_network_data.csv"
         
-        # Target database and collection names
-        DATABASE_NAME: str = "network_security"
-        COLLECTION_NAME: str = "intrusion_records"
-
-        # Create an instance of the data handler
-        handler = NetworkDataHandler()
+        # Project configuration: MongoDB client options and the target database and collection
+        config = Configuration("../../config/config.yaml")
+        DATABASE_NAME: str = config.get_db_value("database")
+        COLLECTION_NAME: str = config.get_db_value("collection")
 
-        # Convert the CSV file to a list of JSON-like records
-        records = handler.csv_to_json_records(FILE_PATH)
+        # Create an instance of the data handler on the configured shared client
+        handler = NetworkDataHandler(configuration=config)
 
-        # Insert records into MongoDB in batches
-        inserted_count = handler.insert_records_to_db(records, DATABASE_NAME, COLLECTION_NAME)
+        # Stream the CSV file into MongoDB in batches
+        inserted_count = handler.load_csv_to_db(FILE_PATH, DATABASE_NAME, COLLECTION_NAME)
 
         # Log a final success message
         logger.info(f"Successfully inserted {inserted_count} records into MongoDB.")
@@ -0,0 +1,154 @@
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.exception.exception import CustomException
+
+# Scale that maps the top 53 bits of a 64-bit hash onto [0, 1)
+_UNIT_SCALE = 2.0 ** -53
+
+
+def _hash_key(random_state: int) -> str:
+    """
+    16-character hash key for pandas' SipHash, derived from the random state.
+    """
+    return f"{int(random_state) % 10 ** 16:016d}"
+
+
+def row_hash_uniform(dataframe: pd.DataFrame, random_state: int = 42) -> np.ndarray:
+    """
+    Maps every row to a number in [0, 1) by hashing its values with `random_state`.
+
+    The value only depends on the row's contents and the seed, so a row is
+    assigned the same way in every run and wherever it falls in the stream.
+    Identical rows share a value, which also keeps exact duplicates out of
+    opposite sides of a split.
+
+    Args:
+        dataframe (pd.DataFrame): Chunk of rows.
+        random_state (int): Seed mixed into the hash.
+
+    Returns:
+        np.ndarray: float64 array of length len(dataframe).
+    """
+    hashes = pd.util.hash_pandas_object(dataframe, index=False, hash_key=_hash_key(random_state)).to_numpy()
+    return (hashes >> np.uint64(11)).astype(np.float64) * _UNIT_SCALE
+
+
+class StreamingSplitter:
+    """
+    Splits a stream of DataFrame chunks into train and test rows in constant memory.
+
+    Every row's assignment is a pure function of its row hash (and class), so
+    the split does not depend on chunk size or chunk order. Without
+    stratification a row goes to test when its row hash is below `test_size`,
+    a reproducible Bernoulli split. With a stratify column each class gets its
+    own hash threshold, computed by fit() in a first pass over the data: for a
+    class of at most `exact_class_rows` rows it is the hash value below which
+    exactly `test_size` of the class's rows fall (to within one row, like
+    sklearn's stratified split), so even rare classes are represented on both
+    sides. Larger classes use `test_size` itself, whose binomial error is
+    negligible at that size, so fit() keeps at most `exact_class_rows` hashes
+    per class in memory.
+    """
+
+    def __init__(
+        self,
+        test_size: float,
+        random_state: int = 42,
+        stratify_column: Optional[str] = None,
+        exact_class_rows: int = 100000
+    ) -> None:
+        """
+        Args:
+            test_size (float): Fraction of rows assigned to the test set.
+            random_state (int): Seed of the row hash.
+            stratify_column (str, optional): Column whose classes keep the test fraction exactly.
+            exact_class_rows (int): Largest class whose threshold is computed exactly.
+        """
+        if not 0.0 < test_size < 1.0:
+            raise ValueError(f"test_size must be between 0 and 1, got {test_size}")
+        self.test_size = float(test_size)
+        self.random_state = random_state
+        self.stratify_column = stratify_column
+        self.exact_class_rows = exact_class_rows
+        self.rows_seen: Dict[str, int] = {}
+        self.test_rows: Dict[str, int] = {}
+        self.thresholds: Dict[str, float] = {}
+
+    def _class_offset(self, label: str) -> float:
+        """
+        Per-class phase of the rounding, so small classes do not all round the same way.
+        """
+        return float(row_hash_uniform(pd.DataFrame({"class": [label]}), self.random_state)[0])
+
+    def fit(self, chunks: Iterable[pd.DataFrame]) -> "StreamingSplitter":
+        """
+        Compute the per-class hash thresholds from one pass over the data.
+
+        Only needed with a stratify column; classes not seen here are split at `test_size`.
+        """
+        try:
+            if self.stratify_column is None:
+                return self
+
+            hashes: Dict[str, List[np.ndarray]] = {}
+            counts: Dict[str, int] = {}
+            for chunk in chunks:
+                uniform = row_hash_uniform(chunk, self.random_state)
+                codes, classes = pd.factorize(chunk[self.stratify_column].astype(str).to_numpy())
+                for code, label in enumerate(classes):
+                    counts[label] = counts.get(label, 0) + int(np.count_nonzero(codes == code))
+                    if counts[label] > self.exact_class_rows:
+                        hashes.pop(label, None)
+                    else:
+                        hashes.setdefault(label, []).append(uniform[codes == code])
+
+            self.thresholds = {}
+            for label, count in counts.items():
+                if label not in hashes:
+                    self.thresholds[label] = self.test_size
+                    continue
+                values = np.sort(np.concatenate(hashes[label]))
+                n_test = int(np.floor(self.test_size * count + self._class_offset(label)))
+                # Exactly n_test of the class's hashes fall below the threshold
+                self.thresholds[label] = float(values[n_test]) if n_test < count else 1.0
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def test_mask(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Boolean mask of the chunk's rows assigned to the test set.
+        """
+        try:
+            uniform = row_hash_uniform(chunk, self.random_state)
+
+            if self.stratify_column is None:
+                mask = uniform < self.test_size
+                self.rows_seen["all"] = self.rows_seen.get("all", 0) + len(chunk)
+                self.test_rows["all"] = self.test_rows.get("all", 0) + int(mask.sum())
+                return mask
+
+            labels = chunk[self.stratify_column].astype(str).to_numpy()
+            codes, classes = pd.factorize(labels)
+            thresholds = np.array([self.thresholds.get(label, self.test_size) for label in classes])
+            mask = uniform < thresholds[codes]
+            for code, label in enumerate(classes):
+                in_class = codes == code
+                self.rows_seen[label] = self.rows_seen.get(label, 0) + int(in_class.sum())
+                self.test_rows[label] = self.test_rows.get(label, 0) + int(mask[in_class].sum())
+            return mask
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def split(self, chunk: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split one chunk into its (train, test) rows.
+        """
+        mask = self.test_mask(chunk)
+        return chunk[~mask], chunk[mask]
@@ -0,0 +1,86 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.utils.sketch import QuantileSketch
+
+
+class StreamingColumnStats:
+    """
+    Per-column statistics of a numeric matrix accumulated chunk by chunk.
+
+    Counts, means and sums of squared deviations of the non-missing values are
+    merged with Chan's parallel update (the same update StandardScaler's
+    partial_fit uses), so they are exact and numerically stable in constant
+    memory. Medians come from one KLL sketch per column and are approximate,
+    with rank error around 1 / sketch_size.
+    """
+
+    def __init__(self, n_columns: int, sketch_size: int = 2048, seed: Optional[int] = None) -> None:
+        """
+        Args:
+            n_columns (int): Number of columns.
+            sketch_size (int): KLL `k` of each column sketch.
+            seed (int, optional): Seed of the sketch compactions.
+        """
+        self.n_columns = n_columns
+        self.n_rows = 0
+        self.counts = np.zeros(n_columns, dtype=np.int64)
+        self.means = np.zeros(n_columns, dtype=np.float64)
+        self.m2 = np.zeros(n_columns, dtype=np.float64)
+        self.sketches: List[QuantileSketch] = [
+            QuantileSketch(k=sketch_size, seed=None if seed is None else seed + column)
+            for column in range(n_columns)
+        ]
+
+    def update(self, values: np.ndarray) -> "StreamingColumnStats":
+        """
+        Add a chunk of rows (shape n x n_columns); NaNs count as missing.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        observed = ~np.isnan(values)
+        chunk_counts = observed.sum(axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            chunk_sums = np.where(observed, values, 0.0).sum(axis=0)
+            chunk_means = np.where(chunk_counts > 0, chunk_sums / np.maximum(chunk_counts, 1), 0.0)
+            chunk_m2 = np.where(observed, values - chunk_means, 0.0)
+            chunk_m2 = (chunk_m2 * chunk_m2).sum(axis=0)
+
+            # Chan et al. merge of (count, mean, M2)
+            total_counts = self.counts + chunk_counts
+            delta = chunk_means - self.means
+            weight = np.where(total_counts > 0, chunk_counts / np.maximum(total_counts, 1), 0.0)
+            self.m2 = self.m2 + chunk_m2 + delta * delta * self.counts * weight
+            self.means = self.means + delta * weight
+            self.counts = total_counts
+
+        for column, sketch in enumerate(self.sketches):
+            sketch.update(values[:, column])
+        self.n_rows += values.shape[0]
+        return self
+
+    def medians(self) -> np.ndarray:
+        """
+        Approximate median of the non-missing values of each column (NaN for an all-missing column).
+        """
+        return np.array([
+            sketch.quantiles(np.array([0.5]))[0] if sketch.n else np.nan
+            for sketch in self.sketches
+        ])
+
+    def imputed_moments(self, fill_values: np.ndarray):
+        """
+        Mean and (population) variance of each column after its missing values
+        are replaced with `fill_values`, without a second pass over the data.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (mean, var).
+        """
+        n_missing = self.n_rows - self.counts
+        n_total = max(self.n_rows, 1)
+        # Merge the observed group with a zero-variance group of n_missing copies of the fill value
+        delta = np.where(n_missing > 0, fill_values - self.means, 0.0)
+        mean = self.means + delta * n_missing / n_total
+        m2 = self.m2 + delta * delta * self.counts * n_missing / n_total
+        return mean, m2 / n_total
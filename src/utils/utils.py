@@ -1,8 +1,12 @@
 
 import os
 import numpy as np
+import pandas as pd
 import pickle
+import shutil
 import yaml
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 from src.exception.exception import CustomException
 import sys
 
@@ -23,7 +27,8 @@ def save_numpy_array_data(file_path, array):
         os.makedirs(dir_path, exist_ok=True)
 
         # Save the numpy array to the specified file path
-        np.save(file_path, array)
+        with atomic_write(file_path) as file_obj:
+            np.save(file_obj, array)
 
     except Exception as e:
         # Raise custom exception with original error and system info
@@ -46,7 +51,7 @@ def save_object(file_path, obj):
         os.makedirs(dir_path, exist_ok=True)
 
         # Serialize and save the object to file using pickle
-        with open(file_path, "wb") as file_obj:
+        with atomic_write(file_path) as file_obj:
             pickle.dump(obj, file_obj)
 
     except Exception as e:
@@ -68,17 +73,45 @@ def load_object(file_path):
     except Exception as e:
         raise CustomException(e, sys)
     
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: Optional[str] = None) -> np.array:
     """
     load numpy array data from file
     Args:
         file_path (str): Path to the numpy array data
+        mmap_mode (str, optional): 'r', 'r+' or 'c' to return a memory-mapped view
+            instead of reading the array into memory. Processes mapping the same
+            file read-only share one copy through the page cache.
     Returns:
       np.array data loaded
     """
     try:
-        with open(file_path, "rb") as file_obj:
-            return np.load(file_obj)
+        return np.load(file_path, mmap_mode=mmap_mode)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def create_numpy_memmap(file_path: str, shape, dtype=np.float64) -> np.memmap:
+    """
+    Preallocates a .npy file on disk and returns a writable memory-mapped view of it.
+
+    The array is filled in place and the result is a regular .npy file, so it
+    can be reopened with load_numpy_array_data(file_path, mmap_mode="r").
+    An existing file is unlinked first rather than truncated, so hard links to
+    it (validated copies, stage cache entries) keep their contents.
+
+    Args:
+        file_path (str): Destination .npy path.
+        shape (tuple): Array shape.
+        dtype: Array dtype.
+
+    Returns:
+        np.memmap: Writable view; call flush() when done.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if os.path.lexists(file_path):
+            os.remove(file_path)
+        return np.lib.format.open_memmap(file_path, mode="w+", dtype=dtype, shape=tuple(shape))
     except Exception as e:
         raise CustomException(e, sys) from e
     
@@ -122,9 +155,408 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         # Write content to YAML file
-        with open(file_path, "w") as file:
+        with atomic_write(file_path, "w") as file:
             yaml.dump(content, file)
 
     except Exception as e:
         raise CustomException(e, sys) from e
 
+
+# Tabular artifact formats supported by save_dataframe / read_dataframe
+ARTIFACT_FORMATS = ("csv", "parquet", "feather")
+
+
+def get_artifact_format(file_path: str) -> str:
+    """
+    Infers the tabular artifact format from a file extension.
+
+    Args:
+        file_path (str): Path to the artifact.
+
+    Returns:
+        str: One of ARTIFACT_FORMATS.
+    """
+    file_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+    if file_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unsupported artifact format '{file_format}' for: {file_path}")
+    return file_format
+
+
+def _temporary_path(file_path: str) -> str:
+    """
+    Sibling path that an artifact is written to before being renamed into place.
+    """
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.tmp")
+
+
+@contextmanager
+def atomic_write(file_path: str, mode: str = "wb"):
+    """
+    Opens a sibling temporary file for writing and renames it over `file_path`
+    when the block succeeds; on failure the temporary file is removed.
+
+    Readers never see a partial file, and because the destination is replaced
+    rather than truncated, hard links to its previous version (validated
+    copies, stage cache entries) keep their contents.
+
+    Args:
+        file_path (str): Destination file path; its directory is created.
+        mode (str): 'wb' or 'w'.
+
+    Yields:
+        file: The open temporary file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    temporary_path = _temporary_path(file_path)
+    try:
+        with open(temporary_path, mode) as file:
+            yield file
+        os.replace(temporary_path, file_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def save_dataframe(file_path: str, dataframe: pd.DataFrame, compression: Optional[str] = None) -> None:
+    """
+    Saves a DataFrame in the format given by the file extension (csv, parquet or feather).
+
+    The file is written next to its destination and renamed into place, so
+    readers never see a partial file and hard links to the previous version
+    (validated copies, stage cache entries) keep their contents.
+
+    Args:
+        file_path (str): Destination file path.
+        dataframe (pd.DataFrame): The DataFrame to save.
+        compression (str, optional): Parquet codec. Ignored for csv and feather.
+
+    Raises:
+        CustomException: If any error occurs during the file writing process.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temporary_path = _temporary_path(file_path)
+
+        file_format = get_artifact_format(file_path)
+        if file_format == "parquet":
+            dataframe.to_parquet(temporary_path, index=False, compression=compression or "snappy")
+        elif file_format == "feather":
+            # Feather only stores a default RangeIndex
+            dataframe.reset_index(drop=True).to_feather(temporary_path)
+        else:
+            dataframe.to_csv(temporary_path, index=False, header=True)
+        os.replace(temporary_path, file_path)
+
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+# Linux ioctl that makes a file share another file's extents (copy-on-write clone)
+FICLONE = 0x40049409
+
+
+def link_artifact(source_path: str, destination_path: str, mode: str = "hardlink") -> str:
+    """
+    Makes `destination_path` hold the same contents as `source_path` without rewriting it.
+
+    Modes:
+        hardlink: a second name for the same file; falls back to reflink, then copy.
+        reflink: a copy-on-write clone (btrfs, XFS, APFS); falls back to copy.
+        copy: a byte-for-byte copy.
+
+    Args:
+        source_path (str): Existing file.
+        destination_path (str): Path to create; an existing file is replaced.
+        mode (str): Preferred mode.
+
+    Returns:
+        str: The mode that was actually used.
+    """
+    try:
+        os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)
+
+        if mode == "hardlink":
+            try:
+                os.link(source_path, destination_path)
+                return "hardlink"
+            except OSError:
+                mode = "reflink"
+
+        if mode == "reflink":
+            try:
+                import fcntl
+                with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+                    fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+                return "reflink"
+            except (ImportError, OSError):
+                if os.path.exists(destination_path):
+                    os.remove(destination_path)
+
+        shutil.copyfile(source_path, destination_path)
+        return "copy"
+
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def cast_categories(dataframe: pd.DataFrame, dtypes: Optional[Dict[str, object]]) -> pd.DataFrame:
+    """
+    Casts the columns declared with a fixed pd.CategoricalDtype to it.
+
+    Chunks cast this way share one set of categories, which Arrow IPC files
+    need: a feather file cannot change a column's dictionary between record
+    batches. Values outside the categories raise instead of becoming missing.
+
+    Args:
+        dataframe (pd.DataFrame): Frame to cast; it is not modified.
+        dtypes (Dict[str, object], optional): Column dtypes; other entries are ignored.
+
+    Returns:
+        pd.DataFrame: Frame with the categorical columns cast.
+    """
+    casts = {}
+    for column, dtype in (dtypes or {}).items():
+        if not isinstance(dtype, pd.CategoricalDtype) or column not in dataframe.columns or dataframe[column].dtype == dtype:
+            continue
+        series = dataframe[column]
+        unknown = series.notna() & ~series.isin(dtype.categories)
+        if unknown.any():
+            raise ValueError(
+                f"Column '{column}' has values outside its categories: {sorted(series[unknown].astype(str).unique())[:10]}"
+            )
+        casts[column] = dtype
+    return dataframe.astype(casts) if casts else dataframe
+
+
+def _parser_dtypes(dtypes: Optional[Dict[str, object]], columns: Optional[List[str]] = None) -> Optional[Dict[str, object]]:
+    """
+    Dtypes for the csv parser: fixed categoricals are parsed as plain categories
+    and cast afterwards, since the parser would silently turn unknown values into NaN.
+    """
+    if dtypes is None:
+        return None
+    return {
+        column: "category" if isinstance(dtype, pd.CategoricalDtype) else dtype
+        for column, dtype in dtypes.items() if columns is None or column in columns
+    }
+
+
+def read_dataframe(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Reads a tabular artifact in the format given by the file extension.
+
+    Args:
+        file_path (str): Path to the artifact.
+        columns (List[str], optional): Only read these columns.
+        dtypes (Dict[str, str], optional): Column dtypes. For csv they are passed
+            to the parser so no type inference runs; columnar formats already store
+            types, so the frame is only cast where it differs.
+
+    Returns:
+        pd.DataFrame: The loaded DataFrame.
+    """
+    try:
+        file_format = get_artifact_format(file_path)
+        if file_format == "parquet":
+            dataframe = pd.read_parquet(file_path, columns=columns)
+        elif file_format == "feather":
+            dataframe = pd.read_feather(file_path, columns=columns)
+        else:
+            dataframe = pd.read_csv(file_path, usecols=columns, dtype=_parser_dtypes(dtypes, columns))
+            return cast_categories(dataframe, dtypes)
+
+        if dtypes:
+            mismatched = {
+                column: dtype for column, dtype in dtypes.items()
+                if column in dataframe.columns and dataframe[column].dtype != dtype
+                and not isinstance(dtype, pd.CategoricalDtype)
+            }
+            if mismatched:
+                dataframe = dataframe.astype(mismatched)
+        return cast_categories(dataframe, dtypes)
+
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def iter_dataframe_chunks(
+    file_path: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a tabular artifact as DataFrame chunks of at most `chunk_size` rows.
+
+    Parquet is read batch by batch and feather record batch by record batch,
+    so peak memory is bounded by the chunk size rather than the file size.
+
+    Args:
+        file_path (str): Path to the artifact.
+        chunk_size (int): Maximum rows per chunk.
+        columns (List[str], optional): Only read these columns.
+        dtypes (Dict[str, str], optional): Column dtypes passed to the csv parser.
+
+    Yields:
+        pd.DataFrame: The next chunk.
+    """
+    try:
+        file_format = get_artifact_format(file_path)
+        if file_format == "csv":
+            for chunk in pd.read_csv(file_path, usecols=columns, dtype=_parser_dtypes(dtypes, columns), chunksize=chunk_size):
+                yield cast_categories(chunk, dtypes)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if file_format == "parquet":
+            batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns)
+        else:
+            reader = pa.ipc.open_file(file_path)
+            batches = (
+                batch.select(columns) if columns is not None else batch
+                for index in range(reader.num_record_batches)
+                for batch in [reader.get_batch(index)]
+            )
+
+        for batch in batches:
+            # Feather batches follow the writer's chunking, so re-slice them
+            for offset in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(offset, chunk_size).to_pandas()
+
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def count_rows(file_path: str) -> int:
+    """
+    Counts the rows of a tabular artifact without loading it.
+
+    Parquet and feather row counts come from the file metadata; csv files
+    are scanned line by line.
+
+    Args:
+        file_path (str): Path to the artifact.
+
+    Returns:
+        int: Number of data rows.
+    """
+    try:
+        file_format = get_artifact_format(file_path)
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(file_path).metadata.num_rows
+        if file_format == "feather":
+            import pyarrow as pa
+            # Memory-mapped, so only the batch headers are read
+            reader = pa.ipc.open_file(pa.memory_map(file_path))
+            return sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+        return sum(len(chunk) for chunk in pd.read_csv(file_path, usecols=[0], chunksize=1_000_000))
+
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+class DataFrameWriter:
+    """
+    Writes a DataFrame to a tabular artifact incrementally, one chunk at a time.
+
+    CSV chunks are appended to the file; parquet chunks become row groups and
+    feather chunks become Arrow IPC record batches, so the full frame is never
+    held in memory. Use as a context manager so the file is always finalized.
+    Chunks go to a temporary file that is renamed into place on close, or
+    removed if the block raised.
+
+    Parquet and feather files have one type per column. With `dtypes` the
+    numeric column types come from that mapping (e.g. the schema's storage
+    dtypes) rather than from the first chunk, and every chunk is cast to them;
+    the cast raises on values that do not fit and keeps missing values as nulls.
+    Columns declared with a fixed pd.CategoricalDtype are cast to it, so every
+    chunk carries the same dictionary.
+    """
+
+    def __init__(self, file_path: str, compression: Optional[str] = None, dtypes: Optional[Dict[str, str]] = None) -> None:
+        self.file_path = file_path
+        self.file_format = get_artifact_format(file_path)
+        self.compression = compression or "snappy"
+        self.dtypes = dtypes or {}
+        self.rows_written = 0
+        self._writer = None
+        self._schema = None
+        self._temporary_path = _temporary_path(file_path)
+
+    def __enter__(self) -> "DataFrameWriter":
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self._temporary_path):
+            os.remove(self._temporary_path)
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        """
+        Appends one chunk to the artifact.
+        """
+        try:
+            dataframe = cast_categories(dataframe, self.dtypes)
+            if self.file_format == "csv":
+                dataframe.to_csv(
+                    self._temporary_path,
+                    mode="w" if self.rows_written == 0 else "a",
+                    index=False,
+                    header=self.rows_written == 0
+                )
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(dataframe, preserve_index=False)
+                if self._writer is None:
+                    # The first chunk fixes the schema for the whole file, except for declared numeric types
+                    self._schema = pa.schema([
+                        field.with_type(pa.from_numpy_dtype(np.dtype(self.dtypes[field.name])))
+                        if self.dtypes.get(field.name, "category") != "category" else field
+                        for field in table.schema
+                    ], metadata=table.schema.metadata)
+                    if self.file_format == "parquet":
+                        self._writer = pq.ParquetWriter(self._temporary_path, self._schema, compression=self.compression)
+                    else:
+                        self._writer = pa.ipc.new_file(self._temporary_path, self._schema)
+                if not table.schema.equals(self._schema):
+                    table = table.cast(self._schema)
+                self._writer.write_table(table)
+
+            self.rows_written += len(dataframe)
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def close(self) -> None:
+        """
+        Finalizes the artifact. An empty stream still produces an (empty) csv file.
+        """
+        try:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            elif self.rows_written == 0 and self.file_format == "csv":
+                open(self._temporary_path, "w").close()
+
+            if os.path.exists(self._temporary_path):
+                os.replace(self._temporary_path, self.file_path)
+        except Exception as e:
+            raise CustomException(e, sys) from e
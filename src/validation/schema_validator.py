@@ -0,0 +1,215 @@
+import sys
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config.schema import Schema
+from src.exception.exception import CustomException
+from src.logging.logger import logger
+from src.utils.utils import iter_dataframe_chunks
+
+# Unseen label values listed per column in the summary
+MAX_UNEXPECTED_VALUES = 10
+
+
+def dtype_matches(declared: str, series: pd.Series) -> bool:
+    """
+    Whether a column's stored dtype is compatible with its declared schema dtype.
+
+    Downcast storage types count as matches: any integer type for int64, any
+    float type for float64 and string, object or categorical for object. An
+    int64 column stored as float (as happens when it has missing values) only
+    matches if every finite value is integral.
+    """
+    kind = series.dtype.kind
+    if declared == "object":
+        return kind in "OUS" or isinstance(series.dtype, (pd.CategoricalDtype, pd.StringDtype))
+    if declared == "int64":
+        if kind in "iu":
+            return True
+        if kind == "f":
+            values = series.to_numpy()
+            finite = values[np.isfinite(values)]
+            return bool(np.all(finite == np.floor(finite)))
+        return False
+    return kind in "fiu"
+
+
+class SchemaValidator:
+    """
+    Checks DataFrame chunks against the schema and keeps a compact per-column summary.
+
+    Per chunk, all numeric columns are turned into one float64 matrix and every
+    check is a single column-wise NumPy reduction over it: null and +/-inf
+    counts, observed min/max, and counts below `min` / above `max` (undeclared
+    bounds are NaN, so they never match). Object columns are checked against
+    their `allowed_values`. Column names and dtypes are checked per chunk.
+    Only counters are kept between chunks, so a file of any size can be
+    validated chunk by chunk.
+    """
+
+    def __init__(self, schema: Schema) -> None:
+        self.schema = schema
+        self.numeric_columns = schema.get_numerical_columns()
+        self.mins = np.array([schema.columns[c].get("min", np.nan) for c in self.numeric_columns], dtype=np.float64)
+        self.maxs = np.array([schema.columns[c].get("max", np.nan) for c in self.numeric_columns], dtype=np.float64)
+        self.allow_inf = np.array([bool(schema.columns[c].get("allow_inf", False)) for c in self.numeric_columns])
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear all counters.
+        """
+        n = len(self.numeric_columns)
+        self.rows = 0
+        self.missing_columns = set()
+        self.unexpected_columns = set()
+        self.dtype_mismatches: Dict[str, str] = {}
+        self.null_counts: Dict[str, int] = {column: 0 for column in self.schema.column_names}
+        self.posinf_counts = np.zeros(n, dtype=np.int64)
+        self.neginf_counts = np.zeros(n, dtype=np.int64)
+        self.below_min_counts = np.zeros(n, dtype=np.int64)
+        self.above_max_counts = np.zeros(n, dtype=np.int64)
+        self.observed_mins = np.full(n, np.nan)
+        self.observed_maxs = np.full(n, np.nan)
+        self.disallowed_counts: Dict[str, int] = {}
+        self.unexpected_values: Dict[str, set] = {}
+
+    def update(self, chunk: pd.DataFrame) -> "SchemaValidator":
+        """
+        Add one chunk to the summary.
+        """
+        try:
+            self.rows += len(chunk)
+            present = set(chunk.columns)
+            self.missing_columns |= set(self.schema.column_names) - present
+            self.unexpected_columns |= present - set(self.schema.column_names)
+
+            for column in self.schema.column_names:
+                if column in present and column not in self.dtype_mismatches:
+                    if not dtype_matches(self.schema.columns[column]["dtype"], chunk[column]):
+                        self.dtype_mismatches[column] = str(chunk[column].dtype)
+
+            # One float64 matrix for every numeric column present; absent columns stay NaN
+            positions = [j for j, column in enumerate(self.numeric_columns) if column in present]
+            if positions and len(chunk):
+                matrix = np.full((len(chunk), len(self.numeric_columns)), np.nan)
+                for j in positions:
+                    matrix[:, j] = chunk[self.numeric_columns[j]].to_numpy(dtype=np.float64, na_value=np.nan)
+
+                nulls = np.isnan(matrix).sum(axis=0)
+                for j in positions:
+                    self.null_counts[self.numeric_columns[j]] += int(nulls[j])
+                self.posinf_counts += np.isposinf(matrix).sum(axis=0)
+                self.neginf_counts += np.isneginf(matrix).sum(axis=0)
+
+                with np.errstate(invalid="ignore"):
+                    self.below_min_counts += (matrix < self.mins).sum(axis=0)
+                    self.above_max_counts += (matrix > self.maxs).sum(axis=0)
+                    # fmin/fmax skip NaNs, so all-missing columns stay NaN
+                    self.observed_mins = np.fmin(self.observed_mins, np.fmin.reduce(matrix, axis=0))
+                    self.observed_maxs = np.fmax(self.observed_maxs, np.fmax.reduce(matrix, axis=0))
+
+            for column, spec in self.schema.columns.items():
+                if spec["dtype"] != "object" or column not in present:
+                    continue
+                series = chunk[column]
+                self.null_counts[column] += int(series.isna().sum())
+                if "allowed_values" in spec:
+                    counts = series.astype(str)[series.notna()].value_counts()
+                    unexpected = counts[~counts.index.isin([str(value) for value in spec["allowed_values"]])]
+                    if len(unexpected):
+                        self.disallowed_counts[column] = self.disallowed_counts.get(column, 0) + int(unexpected.sum())
+                        seen = self.unexpected_values.setdefault(column, set())
+                        seen.update(unexpected.index[:MAX_UNEXPECTED_VALUES - len(seen)].tolist())
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @property
+    def has_structural_errors(self) -> bool:
+        """
+        Missing or unexpected columns, or dtypes that do not match the schema.
+        """
+        return bool(self.missing_columns or self.unexpected_columns or self.dtype_mismatches)
+
+    @property
+    def invalid_values(self) -> int:
+        """
+        Values that break a range, infinity or allowed-values rule.
+        """
+        inf_violations = np.where(self.allow_inf, 0, self.posinf_counts + self.neginf_counts)
+        return int(self.below_min_counts.sum() + self.above_max_counts.sum() + inf_violations.sum()
+                   + sum(self.disallowed_counts.values()))
+
+    def summary(self) -> dict:
+        """
+        Compact validation summary: overall status plus one entry per schema column.
+        """
+        columns = {}
+        numeric_index = {column: j for j, column in enumerate(self.numeric_columns)}
+        for column, spec in self.schema.columns.items():
+            entry = {
+                "dtype": spec["dtype"],
+                "present": column not in self.missing_columns,
+                "dtype_ok": column not in self.dtype_mismatches,
+                "nulls": self.null_counts[column],
+            }
+            if column in self.dtype_mismatches:
+                entry["stored_dtype"] = self.dtype_mismatches[column]
+            if column in numeric_index:
+                j = numeric_index[column]
+                entry.update({
+                    "posinf": int(self.posinf_counts[j]),
+                    "neginf": int(self.neginf_counts[j]),
+                    "below_min": int(self.below_min_counts[j]),
+                    "above_max": int(self.above_max_counts[j]),
+                    "min": None if np.isnan(self.observed_mins[j]) else float(self.observed_mins[j]),
+                    "max": None if np.isnan(self.observed_maxs[j]) else float(self.observed_maxs[j]),
+                })
+                inf_ok = self.allow_inf[j] or entry["posinf"] + entry["neginf"] == 0
+                entry["valid"] = entry["present"] and entry["dtype_ok"] and inf_ok \
+                    and entry["below_min"] == 0 and entry["above_max"] == 0
+            else:
+                entry["disallowed_values"] = self.disallowed_counts.get(column, 0)
+                if column in self.unexpected_values:
+                    entry["unexpected_values"] = sorted(self.unexpected_values[column])
+                entry["valid"] = entry["present"] and entry["dtype_ok"] and entry["disallowed_values"] == 0
+            columns[column] = entry
+
+        return {
+            "rows": self.rows,
+            "valid": not self.has_structural_errors and self.invalid_values == 0,
+            "structural_errors": self.has_structural_errors,
+            "invalid_values": self.invalid_values,
+            "missing_columns": sorted(self.missing_columns),
+            "unexpected_columns": sorted(self.unexpected_columns),
+            "columns": columns,
+        }
+
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> dict:
+        """
+        Validate a stream of chunks from scratch and return the summary.
+        """
+        self.reset()
+        for chunk in chunks:
+            self.update(chunk)
+        return self.summary()
+
+    def validate_frame(self, dataframe: pd.DataFrame, chunk_size: int = 100000) -> dict:
+        """
+        Validate an in-memory frame in slices, so the float64 working matrix stays chunk-sized.
+        """
+        return self.validate_chunks(dataframe.iloc[i:i + chunk_size] for i in range(0, max(len(dataframe), 1), chunk_size))
+
+    def validate_file(self, file_path: str, chunk_size: int = 100000, columns: Optional[List[str]] = None) -> dict:
+        """
+        Validate an artifact chunk by chunk without loading it.
+        """
+        try:
+            logger.info(f"Validating {file_path} against the schema in chunks of {chunk_size} rows.")
+            return self.validate_chunks(iter_dataframe_chunks(file_path, chunk_size, columns=columns))
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pandas as pd
+
+from src.utils.artifact_loader import ArtifactLoader
+from src.utils.utils import read_dataframe, save_dataframe
+
+
+def write_frames(tmp_path, n_files=2, n_rows=1000):
+    paths = []
+    for index in range(n_files):
+        path = str(tmp_path / f"part_{index}.parquet")
+        save_dataframe(path, pd.DataFrame({"Flow Duration": range(n_rows), "Label": "BENIGN"}))
+        paths.append(path)
+    return paths
+
+
+def test_artifacts_load_concurrently_and_are_reused(tmp_path):
+    paths = write_frames(tmp_path)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_reader(path):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return read_dataframe(path)
+
+    loader = ArtifactLoader(max_workers=2)
+    train_df, test_df = loader.load(paths, slow_reader, "raw")
+    assert peak[0] == 2 and len(train_df) == len(test_df) == 1000
+
+    # A later stage gets the same parsed frames without reading again
+    again = loader.load(paths, slow_reader, "raw")
+    assert again[0] is train_df and loader.hits == 2 and loader.misses == 2
+
+    # A different reader or a rewritten file is read again
+    assert loader.load(paths[:1], slow_reader, "typed")[0] is not train_df
+    time.sleep(0.01)
+    save_dataframe(paths[0], pd.DataFrame({"Flow Duration": range(10), "Label": "DDoS"}))
+    assert len(loader.load(paths[:1], slow_reader, "raw")[0]) == 10
+
+
+def test_memory_budget_evicts_least_recently_used(tmp_path):
+    paths = write_frames(tmp_path, n_files=3, n_rows=20000)
+    frame_bytes = int(read_dataframe(paths[0]).memory_usage(deep=True).sum())
+    loader = ArtifactLoader(max_workers=1, memory_budget_mb=2.5 * frame_bytes / 2 ** 20)
+
+    for path in paths:
+        loader.load([path], read_dataframe, "raw")
+    assert loader.cached_bytes <= loader.memory_budget
+
+    loader.load([paths[0]], read_dataframe, "raw")
+    assert loader.misses == 4
@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.config.configuration import Configuration
+from src.exception.exception import CustomException
+from src.utils.streaming_split import StreamingSplitter
+
+
+class RecordingCollection:
+    """
+    Records the query each cursor is opened with.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def find(self, query_filter, projection):
+        self.calls.append(("find", query_filter, projection))
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def aggregate(self, pipeline, **kwargs):
+        self.calls.append(("aggregate", pipeline, kwargs))
+        return self
+
+
+def make_ingestion(**ingestion_settings):
+    configuration = Configuration("config/config.yaml")
+    configuration.config["ingestion"].update({"incremental": False, **ingestion_settings})
+    return DataIngestion(configuration)
+
+
+def test_plain_export_pushes_projection_to_find():
+    collection = RecordingCollection()
+    make_ingestion(filter={"Label": {"$in": ["BENIGN", "DDoS"]}}).open_cursor(collection, batch_size=100)
+
+    method, query_filter, projection = collection.calls[0]
+    assert method == "find"
+    assert query_filter == {"Label": {"$in": ["BENIGN", "DDoS"]}}
+    assert projection["_id"] == 0 and projection["Label"] == 1 and projection["ingested_at"] == 1
+
+
+def test_stratified_sample_runs_as_aggregation():
+    collection = RecordingCollection()
+    ingestion = make_ingestion(
+        time_window={"start": "2026-01-01T00:00:00"},
+        sample_fractions={"BENIGN": 0.05},
+        pipeline=[{"$limit": 1000}]
+    )
+    ingestion.open_cursor(collection, batch_size=100)
+
+    method, pipeline, kwargs = collection.calls[0]
+    assert method == "aggregate" and kwargs["allowDiskUse"]
+    assert [next(iter(stage)) for stage in pipeline] == ["$match", "$addFields", "$match", "$limit", "$project"]
+    assert "ingested_at" in pipeline[0]["$match"]
+
+    key, threshold = pipeline[2]["$match"]["$expr"]["$lt"]
+    branches = threshold["$multiply"][0]["$switch"]
+    assert branches["branches"][0] == {"case": {"$eq": ["$Label", "BENIGN"]}, "then": 0.05}
+    assert branches["default"] == 1.0
+
+
+def mongo_mod(value, divisor):
+    # MongoDB's $mod keeps the sign of the dividend, unlike Python's %
+    remainder = abs(value) % divisor
+    return remainder if value >= 0 else -remainder
+
+
+def test_sampling_is_seeded_by_the_random_state():
+    def sample_keys(random_state, ids):
+        ingestion = make_ingestion(sample_size=100)
+        ingestion.configuration.config["training"]["random_state"] = random_state
+        stages = ingestion.get_sampling_stages()
+        outer, buckets = stages[0]["$addFields"]["_sample_key"]["$mod"]
+        inner, shift = outer["$add"]
+        return np.array([mongo_mod(mongo_mod(document_id, inner["$mod"][1]) + shift, buckets) for document_id in ids]), buckets
+
+    # Loader IDs are 64-bit content hashes, negative about half the time
+    ids = np.random.default_rng(0).integers(-2 ** 63, 2 ** 63 - 1, 20000, dtype=np.int64).tolist()
+    keys, buckets = sample_keys(42, ids)
+    assert keys.min() >= 0 and keys.max() < buckets
+    assert abs((keys < 0.05 * buckets).mean() - 0.05) < 0.01
+    assert np.array_equal(keys, sample_keys(42, ids)[0])
+    assert not np.array_equal(np.argsort(keys)[:100], np.argsort(sample_keys(7, ids)[0])[:100])
+
+
+def test_streaming_split_is_reproducible_and_stratified():
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame({
+        "Flow Duration": rng.integers(0, 10 ** 6, 20000),
+        "Label": rng.choice(["BENIGN", "DDoS", "Infiltration"], 20000, p=[0.9, 0.0995, 0.0005]),
+    })
+
+    def run(chunk_size, order=1, exact_class_rows=100000):
+        starts = list(range(0, len(dataframe), chunk_size))[::order]
+        chunks = [dataframe.iloc[start:start + chunk_size] for start in starts]
+        splitter = StreamingSplitter(0.2, random_state=42, stratify_column="Label", exact_class_rows=exact_class_rows)
+        splitter.fit(chunks)
+        masks = [pd.Series(splitter.test_mask(chunk), index=chunk.index) for chunk in chunks]
+        return pd.concat(masks).sort_index().to_numpy(), splitter
+
+    mask, splitter = run(3000)
+    # The same rows go to test whatever the chunk size or chunk order
+    assert np.array_equal(mask, run(777)[0]) and np.array_equal(mask, run(3000, order=-1)[0])
+    for label, count in dataframe["Label"].value_counts().items():
+        assert abs(mask[dataframe["Label"].to_numpy() == label].sum() - 0.2 * count) <= 1
+        assert splitter.rows_seen[label] == count
+
+    # Classes above exact_class_rows fall back to a plain hash threshold at test_size
+    _, capped = run(3000, exact_class_rows=5000)
+    assert capped.thresholds["BENIGN"] == 0.2 and capped.thresholds["Infiltration"] == splitter.thresholds["Infiltration"]
+
+    # Unstratified rows are assigned by their own hash, independent of chunking
+    plain = StreamingSplitter(0.2, random_state=42)
+    whole = plain.test_mask(dataframe)
+    chunked = np.concatenate([plain.test_mask(dataframe.iloc[i:i + 777]) for i in range(0, len(dataframe), 777)])
+    assert np.array_equal(whole, chunked)
+    assert abs(whole.mean() - 0.2) < 0.01
+
+
+def test_streamed_chunks_share_storage_dtypes(tmp_path):
+    ingestion = make_ingestion()
+    ingestion.configuration.config["file_paths"]["feature_store"] = str(tmp_path / "feature_store.parquet")
+    first = pd.DataFrame({"Fwd Header Length": [20, 40], "Flow IAT Max": [1, 2], "Destination Port": [80, 443], "Label": ["BENIGN", "DDoS"]})
+    # A real CICIDS2017 header length far outside int32, and a missing integer value
+    second = pd.DataFrame({"Fwd Header Length": [-32212234632], "Flow IAT Max": [None], "Destination Port": [22], "Label": ["Bot"]})
+    chunks = [ingestion.schema.downcast(ingestion.schema.cast(chunk)) for chunk in (first, second)]
+    assert chunks[0]["Fwd Header Length"].dtype == "int64" and chunks[1]["Flow IAT Max"].dtype == "float64"
+
+    assert ingestion.export_chunks_into_feature_store(iter(chunks)) == 3
+    stored = pd.read_parquet(tmp_path / "feature_store.parquet")
+    assert stored["Fwd Header Length"].tolist() == [20, 40, -32212234632]
+    assert stored["Destination Port"].dtype == "uint16" and stored["Flow Bytes/s"].dtype == "float32"
+    assert stored["Flow IAT Max"].isna().tolist() == [False, False, True]
+    assert stored["Label"].tolist() == ["BENIGN", "DDoS", "Bot"]
+
+    with pytest.raises(CustomException, match="Destination Port"):
+        ingestion.schema.downcast(ingestion.schema.cast(pd.DataFrame({"Destination Port": [70000]})))
+
+
+def test_feather_chunks_with_different_label_sets(tmp_path):
+    ingestion = make_ingestion()
+    ingestion.configuration.config["artifacts"]["format"] = "feather"
+    ingestion.configuration.config["file_paths"]["feature_store"] = str(tmp_path / "feature_store.parquet")
+    frames = [
+        pd.DataFrame({"Destination Port": [80, 443], "Label": ["BENIGN", "BENIGN"]}),
+        pd.DataFrame({"Destination Port": [22], "Label": ["Bot"]}),
+    ]
+    chunks = [ingestion.schema.downcast(ingestion.schema.cast(frame)) for frame in frames]
+    # Every chunk carries the schema's full label set, whatever labels it holds
+    assert chunks[0]["Label"].dtype == chunks[1]["Label"].dtype
+
+    assert ingestion.export_chunks_into_feature_store(iter(chunks)) == 3
+    stored = pd.read_feather(tmp_path / "feature_store.feather")
+    assert stored["Label"].tolist() == ["BENIGN", "BENIGN", "Bot"]
+
+    # A label outside allowed_values fails loudly instead of becoming missing
+    with pytest.raises(CustomException, match="Label"):
+        ingestion.schema.cast(pd.DataFrame({"Label": ["Botnet"]}))
+
+
+def test_storage_dtypes_halve_memory_per_row():
+    schema = make_ingestion().schema
+    rng = np.random.default_rng(0)
+    n_rows = 10000
+    columns = {}
+    for column, spec in schema.columns.items():
+        if spec["dtype"] == "object":
+            columns[column] = rng.choice(spec["allowed_values"], n_rows)
+        elif spec["dtype"] == "int64":
+            columns[column] = rng.integers(spec.get("min", 0), min(spec.get("max", 2 ** 31), 120000000), n_rows)
+        else:
+            columns[column] = rng.exponential(1000.0, n_rows)
+    declared = schema.cast(pd.DataFrame(columns))
+    stored = schema.downcast(declared)
+
+    assert stored.memory_usage(deep=True).sum() <= declared.memory_usage(deep=True).sum() / 2
+    # Without the object Label strings, the numeric columns alone are still halved
+    numeric = schema.get_numerical_columns()
+    assert stored[numeric].memory_usage(deep=True).sum() <= declared[numeric].memory_usage(deep=True).sum() / 2
+
+
+def test_incremental_export_stays_behind_a_lagged_cutoff(tmp_path):
+    state_file = tmp_path / "export_state.json"
+    ingestion = make_ingestion(incremental=True, state_file=str(state_file), watermark_lag_seconds=600)
+    started = datetime.now(timezone.utc)
+
+    first = ingestion.get_export_filter()["ingested_at"]
+    assert "$gt" not in first
+    assert started - timedelta(seconds=600) <= first["$lte"] <= datetime.now(timezone.utc) - timedelta(seconds=600)
+    ingestion.save_export_state()
+
+    # The next export resumes at the previous cutoff, not at the newest document it saw
+    second = make_ingestion(incremental=True, state_file=str(state_file), watermark_lag_seconds=600).get_export_filter()["ingested_at"]
+    assert second["$gt"] == first["$lte"] and second["$lte"] > first["$lte"]
@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import DataTransformation
+from src.components.data_validation import DataValidation
+from src.config.configuration import Configuration
+from src.utils.utils import load_numpy_array_data, load_object, save_dataframe, save_object
+
+
+def make_train_file(tmp_path, n_rows=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    dataframe = pd.DataFrame({
+        "Destination Port": rng.integers(0, 65536, n_rows),
+        "Flow Duration": rng.integers(0, 10 ** 7, n_rows),
+        "Flow Bytes/s": rng.lognormal(5.0, 2.0, n_rows),
+        "Label": rng.choice(["BENIGN", "DDoS", "PortScan"], n_rows),
+    })
+    dataframe.loc[::9, "Flow Bytes/s"] = np.nan
+    path = str(tmp_path / "train.parquet")
+    save_dataframe(path, dataframe)
+    return path
+
+
+def test_out_of_core_fit_matches_in_memory_fit(tmp_path):
+    train_path = make_train_file(tmp_path)
+    transformation = DataTransformation(Configuration("config/config.yaml"))
+
+    train_df = transformation.read_data(train_path)
+    features = train_df.drop(columns=["Label"])
+    expected = transformation.get_data_transformer_object(features).fit(features)
+    preprocessor, encoder, n_rows = transformation.fit_transformer_in_chunks(train_path, "Label", chunk_size=3000)
+
+    assert n_rows == len(train_df)
+    assert list(encoder.classes_) == ["BENIGN", "DDoS", "PortScan"]
+
+    # Medians are approximate: each must sit within the sketch's rank error of the true median
+    medians = preprocessor.named_transformers_["num_pipeline"].named_steps["imputer"].statistics_
+    for column, median in zip(features.columns, medians):
+        values = features[column].dropna().to_numpy()
+        assert abs((values <= median).mean() - 0.5) < 0.01
+
+    expected_scaler = expected.named_transformers_["num_pipeline"].named_steps["scaler"]
+    scaler = preprocessor.named_transformers_["num_pipeline"].named_steps["scaler"]
+    assert np.allclose(scaler.mean_, expected_scaler.mean_, rtol=1e-2)
+    assert np.allclose(scaler.scale_, expected_scaler.scale_, rtol=1e-2)
+
+    features_path, labels_path = str(tmp_path / "features.npy"), str(tmp_path / "labels.npy")
+    transformation.transform_in_chunks(
+        transformation.read_data_in_chunks(train_path, 3000), n_rows, preprocessor, encoder, "Label",
+        features_path, labels_path
+    )
+    transformed = load_numpy_array_data(features_path, mmap_mode="r")
+    labels = load_numpy_array_data(labels_path, mmap_mode="r")
+    assert isinstance(transformed, np.memmap) and transformed.shape == features.shape
+    assert np.allclose(transformed, expected.transform(features), atol=0.05)
+    assert np.array_equal(labels, encoder.transform(train_df["Label"].astype(str)))
+
+
+def test_combined_layout_keeps_label_as_last_column(tmp_path):
+    train_path = make_train_file(tmp_path, n_rows=1000)
+    transformation = DataTransformation(Configuration("config/config.yaml"))
+    train_df = transformation.read_data(train_path)
+    preprocessor, encoder, n_rows = transformation.fit_transformer_in_chunks(train_path, "Label", chunk_size=300)
+
+    output_path = str(tmp_path / "transformed_train.npy")
+    transformation.transform_in_chunks(
+        transformation.read_data_in_chunks(train_path, 300), n_rows, preprocessor, encoder, "Label", output_path
+    )
+    transformed = load_numpy_array_data(output_path)
+    assert transformed.shape == (1000, train_df.shape[1])
+    assert np.array_equal(transformed[:, -1], encoder.transform(train_df["Label"].astype(str)))
+
+
+def test_float32_precision_survives_pickling(tmp_path):
+    train_path = make_train_file(tmp_path, n_rows=1000)
+    configuration = Configuration("config/config.yaml")
+    configuration.config["transformation"]["precision"] = "float32"
+    transformation = DataTransformation(configuration)
+
+    features = transformation.read_data(train_path).drop(columns=["Label"])
+    preprocessor = transformation.get_data_transformer_object(features).fit(features)
+
+    object_path = str(tmp_path / "transformer.pkl")
+    save_object(object_path, preprocessor)
+    transformed = load_object(object_path).transform(features)
+    assert transformed.dtype == np.float32
+
+    configuration.config["transformation"]["precision"] = "float64"
+    reference = transformation.get_data_transformer_object(features).fit_transform(features)
+    assert np.allclose(transformed, reference, rtol=1e-5, atol=1e-5)
+
+
+def test_quarantined_rows_do_not_reach_the_transformed_arrays(tmp_path):
+    configuration = Configuration("config/config.yaml")
+    configuration.config["cache"] = {"enabled": False}
+    for section in ("file_paths", "validation", "transformation"):
+        for key, value in configuration.config[section].items():
+            if isinstance(value, str) and value.startswith("artifacts/"):
+                configuration.config[section][key] = str(tmp_path / section / os.path.basename(value))
+    transformation = DataTransformation(configuration)
+
+    rng = np.random.default_rng(0)
+    frames = {}
+    for split, n_rows in (("train", 2000), ("test", 500)):
+        columns = {}
+        for column, spec in transformation.schema.columns.items():
+            if spec["dtype"] == "object":
+                columns[column] = rng.choice(["BENIGN", "DDoS"], n_rows)
+            elif spec["dtype"] == "int64":
+                columns[column] = rng.integers(0, 1000, n_rows)
+            else:
+                columns[column] = rng.exponential(100.0, n_rows)
+        frames[split] = pd.DataFrame(columns)
+        save_dataframe(configuration.get_artifact_path("file_paths", f"{split}_data"), frames[split])
+    # A flow longer than the 120 s flow timeout breaks the schema's range, so this train row is quarantined
+    frames["train"].loc[7, "Flow Duration"] = 200000000
+    save_dataframe(configuration.get_artifact_path("file_paths", "train_data"), frames["train"])
+
+    DataValidation(configuration).initiate_data_validation()
+    transformation.initiate_data_transformation()
+
+    features_path, labels_path = transformation.get_output_paths("train")
+    assert load_numpy_array_data(features_path, mmap_mode="r").shape[0] == len(frames["train"]) - 1
+    assert load_numpy_array_data(labels_path, mmap_mode="r").shape[0] == len(frames["train"]) - 1
+    # Clean splits are still read from the split files themselves
+    assert transformation.get_input_paths()[1] == configuration.get_artifact_path("file_paths", "test_data")
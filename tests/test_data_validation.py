@@ -0,0 +1,100 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_validation import DataValidation
+from src.config.configuration import Configuration
+from src.utils.utils import read_dataframe, read_yaml_file, save_dataframe, write_yaml_file
+from src.validation.schema_validator import SchemaValidator
+
+
+def make_validation(tmp_path, **validation_settings):
+    configuration = Configuration("config/config.yaml")
+    configuration.config["validation"].update({
+        "manifest_file": str(tmp_path / "manifest.json"),
+        "valid_train_file_path": str(tmp_path / "train_valid.parquet"),
+        "quarantine_train_file_path": str(tmp_path / "train_quarantine.parquet"),
+        **validation_settings
+    })
+    return DataValidation(configuration)
+
+
+def make_source(tmp_path, n_rows=1000, bad_ports=()):
+    dataframe = pd.DataFrame({
+        "Destination Port": np.arange(n_rows) % 1000,
+        "Flow Bytes/s": np.linspace(0.0, 1.0, n_rows),
+        "Label": "BENIGN",
+    })
+    for row in bad_ports:
+        dataframe.loc[row, "Destination Port"] = -1
+    path = str(tmp_path / "train.parquet")
+    save_dataframe(path, dataframe)
+    return path, dataframe
+
+
+def test_clean_data_is_linked_instead_of_rewritten(tmp_path):
+    source_path, dataframe = make_source(tmp_path)
+    validation = make_validation(tmp_path, valid_copy_mode="hardlink")
+
+    entry = validation.write_validated_artifact("train", source_path, dataframe)
+    assert entry["mode"] == "hardlink" and entry["quarantined_rows"] == 0
+    assert os.path.samefile(entry["path"], source_path)
+    # No invalid rows means no quarantine file and no manifest entry for one
+    assert "quarantine_file" not in entry and not os.path.exists(str(tmp_path / "train_quarantine.parquet"))
+
+    entry = make_validation(tmp_path, valid_copy_mode="reference").write_validated_artifact("train", source_path, dataframe)
+    assert entry["path"] == source_path and not os.path.exists(str(tmp_path / "train_valid.parquet"))
+
+
+def test_only_failing_rows_are_quarantined(tmp_path):
+    source_path, dataframe = make_source(tmp_path, bad_ports=[3, 500])
+    validation = make_validation(tmp_path, valid_copy_mode="hardlink")
+
+    entry = validation.write_validated_artifact("train", source_path, dataframe)
+    assert entry["mode"] == "copy" and entry["quarantined_rows"] == 2 and entry["rows"] == 998
+    assert read_dataframe(entry["quarantine_file"])["Destination Port"].tolist() == [-1, -1]
+    assert len(read_dataframe(entry["path"])) == 998
+
+    with open(validation.config.get_value("validation", "manifest_file"), "w") as file:
+        json.dump({"artifacts": {"train": entry}}, file)
+    assert validation.get_validated_artifact_path("train") == entry["path"]
+
+    # A clean rerun removes the earlier quarantine file
+    entry = validation.write_validated_artifact("train", source_path, dataframe.drop(index=[3, 500]))
+    assert entry["quarantined_rows"] == 0 and not os.path.exists(str(tmp_path / "train_quarantine.parquet"))
+
+
+def test_batch_drift_check_uses_the_saved_baseline(tmp_path):
+    source_path, dataframe = make_source(tmp_path)
+    validation = make_validation(
+        tmp_path,
+        baseline_file=str(tmp_path / "drift_baseline.npz"),
+        batch_report_file=str(tmp_path / "batch_drift_report.yaml")
+    )
+    validation.build_drift_baseline(dataframe)
+
+    # The command line check loads the baseline written by the validation stage
+    config_path = str(tmp_path / "config.yaml")
+    write_yaml_file(config_path, validation.config.config, replace=True)
+    result = subprocess.run(
+        [sys.executable, "-m", "src.components.data_validation", source_path, "--config", config_path],
+        capture_output=True
+    )
+    assert result.returncode == 0, result.stderr.decode()
+    report = read_yaml_file(str(tmp_path / "batch_drift_report.yaml"))
+    assert set(report) >= {"Destination Port", "Flow Bytes/s"} and not report["Flow Bytes/s"]["drift_status"]
+
+
+def test_schema_is_validated_from_the_files_in_chunks(tmp_path):
+    source_path, dataframe = make_source(tmp_path, bad_ports=[3, 500])
+    validation = make_validation(tmp_path, schema_chunk_size=128, schema_report_file=str(tmp_path / "schema_report.json"))
+
+    report = validation.validate_schema({"train": source_path})
+    assert report["train"] == SchemaValidator(validation.schema).validate_frame(dataframe, chunk_size=128)
+    assert report["train"]["rows"] == 1000 and report["train"]["columns"]["Destination Port"]["below_min"] == 2
+    with open(tmp_path / "schema_report.json") as file:
+        assert json.load(file) == json.loads(json.dumps(report))
@@ -1,20 +1,33 @@
+import os
 
-from pymongo.mongo_client import MongoClient
+import pytest
 from dotenv import load_dotenv
-import os
-import ssl
+
+from src.config.configuration import Configuration
+from src.utils.mongo_client import get_client_options, get_mongo_client
 
 # Load environment variables
 load_dotenv()
 
-mongo_uri = os.getenv("MONGO_URI")
 
-# Create a new client and connect to the server
-client = MongoClient(mongo_uri)
+def test_client_options_come_from_config():
+    options = get_client_options(Configuration("config/config.yaml"))
+    assert options["maxPoolSize"] == 100
+    assert options["readPreference"] == "secondaryPreferred"
+    assert options["compressors"].startswith("zstd")
+    assert "tlsCAFile" in options
+
+
+def test_client_is_shared_within_a_process(monkeypatch):
+    # MongoClient connects lazily, so no server is needed here
+    monkeypatch.setenv("MONGO_URI", os.getenv("MONGO_URI") or "mongodb://localhost:27017")
+    configuration = Configuration("config/config.yaml")
+    assert get_mongo_client(configuration) is get_mongo_client(configuration)
+
 
-# Send a ping to confirm a successful connection
-try:
+@pytest.mark.skipif(not os.getenv("MONGO_URI"), reason="MONGO_URI is not set")
+def test_db_connection():
+    # Send a ping to confirm a successful connection
+    client = get_mongo_client(Configuration("config/config.yaml"))
     client.admin.command('ping')
     print("Pinged your deployment. You successfully connected to MongoDB!")
-except Exception as e:
-    print(e)
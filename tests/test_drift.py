@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import ks_2samp
+
+from src.drift.baseline import DriftBaseline
+from src.drift.ks import KSDriftEngine
+from src.drift.metrics import DriftTestConfig, categorical_histograms, histogram_metrics, numeric_histograms
+from src.utils.sketch import QuantileSketch
+
+
+def make_frames(n_base, n_current, seed=0):
+    rng = np.random.default_rng(seed)
+    base_df = pd.DataFrame({
+        "Flow Duration": rng.integers(0, 1000, n_base),
+        "Flow Bytes/s": rng.exponential(100.0, n_base),
+        "Label": rng.choice(["BENIGN", "DDoS"], n_base),
+    })
+    current_df = pd.DataFrame({
+        "Flow Duration": rng.integers(0, 1100, n_current),
+        "Flow Bytes/s": rng.exponential(100.0, n_current),
+        "Label": rng.choice(["BENIGN", "DDoS", "PortScan"], n_current),
+    })
+    current_df.loc[::7, "Flow Bytes/s"] = np.nan
+    return base_df, current_df
+
+
+def test_batched_ks_matches_scipy_on_large_frames():
+    base_df, current_df = make_frames(70000, 50000)
+    report = KSDriftEngine(n_workers=2).compute(base_df, current_df)
+
+    for column in ["Flow Duration", "Flow Bytes/s"]:
+        expected = ks_2samp(base_df[column].dropna(), current_df[column].dropna(), method="asymp")
+        assert np.isclose(report[column]["statistic"], expected.statistic)
+        assert np.isclose(report[column]["p_value"], expected.pvalue)
+
+    expected = ks_2samp(base_df["Label"].to_numpy(), current_df["Label"].to_numpy(), method="asymp")
+    assert np.isclose(report["Label"]["statistic"], expected.statistic)
+
+
+def test_small_frames_use_exact_p_values():
+    base_df, current_df = make_frames(300, 200)
+    report = KSDriftEngine(n_workers=1).compute(base_df, current_df, columns=["Flow Duration"])
+
+    expected = ks_2samp(base_df["Flow Duration"], current_df["Flow Duration"])
+    assert np.isclose(report["Flow Duration"]["p_value"], expected.pvalue)
+    assert report["Flow Duration"]["n_current"] == 200
+
+
+def test_sampling_reports_error_bound():
+    base_df, current_df = make_frames(20000, 20000)
+    exact = KSDriftEngine(n_workers=1).compute(base_df, current_df)
+    sampled = KSDriftEngine(n_workers=1, sample_size=5000).compute(base_df, current_df)
+
+    for column, result in sampled.items():
+        assert result["n_base"] <= 5000
+        assert abs(result["statistic"] - exact[column]["statistic"]) <= result["error_bound"]
+
+
+def test_histogram_metrics_share_one_binning():
+    rng = np.random.default_rng(1)
+    base = rng.exponential(100.0, 50000)
+    same = rng.exponential(100.0, 50000)
+    shifted = rng.exponential(150.0, 50000)
+    shifted[:10] = np.inf
+
+    base_counts, same_counts = numeric_histograms(base, same, n_bins=10)
+    _, shifted_counts = numeric_histograms(base, shifted, n_bins=10)
+    assert base_counts.size == shifted_counts.size == 11
+
+    stable = histogram_metrics(base_counts, same_counts)
+    drifted = histogram_metrics(base_counts, shifted_counts)
+    assert stable["psi"] < 0.01 and drifted["psi"] > 0.1
+    assert drifted["js"] > stable["js"]
+    assert drifted["chi2"] < 0.05
+
+
+def test_drift_test_config_resolves_per_column():
+    tests = DriftTestConfig({
+        "default": {"method": "psi", "threshold": 0.2},
+        "columns": {"Label": {"method": "chi2", "threshold": 0.01}},
+    })
+    assert tests.resolve("Flow Duration") == ("psi", 0.2)
+    assert tests.resolve("Label") == ("chi2", 0.01)
+    assert tests.is_drift("psi", 0.3, 0.2) and not tests.is_drift("chi2", 0.3, 0.01)
+
+    # Switching method without a threshold uses that method's default, not the inherited one
+    tests = DriftTestConfig({
+        "default": {"method": "psi", "threshold": 0.25},
+        "columns": {"Flow Duration": {"method": "ks"}, "Label": {"method": "js"}, "Flow Bytes/s": {"method": "psi"}},
+    })
+    assert tests.resolve("Flow Duration") == ("ks", 0.05)
+    assert tests.resolve("Label") == ("js", 0.1)
+    assert tests.resolve("Flow Bytes/s") == ("psi", 0.25)
+    assert DriftTestConfig({"default": {"method": "psi"}}, default_threshold=0.01).resolve("Label") == ("psi", 0.2)
+    assert DriftTestConfig(default_threshold=0.01).resolve("Label") == ("ks", 0.01)
+
+    base_df, current_df = make_frames(5000, 5000)
+    base_counts, current_counts = categorical_histograms(base_df["Label"], current_df["Label"])
+    assert histogram_metrics(base_counts, current_counts)["chi2"] < 0.01
+
+
+def test_quantile_sketch_rank_error_and_merge():
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=400000)
+    whole = QuantileSketch(k=256, seed=0).update(values)
+    left, right = QuantileSketch(k=256, seed=1), QuantileSketch(k=256, seed=2)
+    for chunk in np.array_split(values[:200000], 10):
+        left.update(chunk)
+    right.update(values[200000:])
+    merged = left.merge(right)
+
+    points = np.quantile(values, np.linspace(0.01, 0.99, 99))
+    exact = np.searchsorted(np.sort(values), points, side="right") / values.size
+    for sketch in (whole, merged):
+        assert sketch.n == values.size and 0 < sketch.rank_error < 0.02
+        assert np.abs(sketch.cdf(points) - exact).max() <= sketch.rank_error
+    assert QuantileSketch(k=256).update(values[:100]).rank_error == 0.0
+
+
+def test_drift_baseline_round_trip_and_compare(tmp_path):
+    rng = np.random.default_rng(4)
+    reference = pd.DataFrame({
+        "Flow Duration": rng.normal(size=2000000),
+        "Label": rng.choice(["BENIGN", "DDoS"], 2000000, p=[0.8, 0.2]),
+    })
+    baseline = DriftBaseline()
+    for start in range(0, len(reference), 500000):
+        baseline.update(reference.iloc[start:start + 500000])
+    baseline.save(str(tmp_path / "baseline.npz"))
+    loaded = DriftBaseline.load(str(tmp_path / "baseline.npz"))
+    assert loaded.row_counts == baseline.row_counts and loaded.value_counts == baseline.value_counts
+    assert np.array_equal(loaded.sketches["Flow Duration"].cdf([-1.0, 0.0, 1.0]), baseline.sketches["Flow Duration"].cdf([-1.0, 0.0, 1.0]))
+
+    # A large fresh sample of the same distribution is not drift, despite the sketch's rank error
+    same = pd.DataFrame({"Flow Duration": rng.normal(size=200000), "Label": rng.choice(["BENIGN", "DDoS"], 200000, p=[0.8, 0.2])})
+    report = loaded.compare(same)
+    assert not report["Flow Duration"]["drift_status"] and not report["Label"]["drift_status"]
+
+    shifted = pd.DataFrame({"Flow Duration": rng.normal(0.05, 1.0, 200000), "Label": rng.choice(["BENIGN", "DDoS"], 200000, p=[0.5, 0.5])})
+    report = loaded.compare(shifted)
+    assert report["Flow Duration"]["drift_status"] and report["Flow Duration"]["p_value"] < 1e-6
+    assert report["Label"]["method"] == "chi2" and report["Label"]["drift_status"]
+
+
+def test_drift_baseline_reports_columns_that_went_missing():
+    rng = np.random.default_rng(5)
+    baseline = DriftBaseline().update(pd.DataFrame({"Flow Bytes/s": rng.exponential(100.0, 50000), "Flow Duration": rng.normal(size=50000)}))
+    current = pd.DataFrame({"Flow Bytes/s": np.full(5000, np.nan), "Flow Duration": rng.normal(size=5000)})
+
+    report = baseline.compare(current)
+    missing = report["Flow Bytes/s"]
+    assert missing["null_rate"] == 1.0 and missing["reference_null_rate"] == 0.0
+    assert "statistic" not in missing and missing["method"] == "chi2" and missing["drift_status"]
+    assert report["Flow Duration"]["method"] == "ks" and not report["Flow Duration"]["drift_status"]
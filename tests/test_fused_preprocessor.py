@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import DataTransformation
+from src.config.configuration import Configuration
+from src.models.fused_preprocessor import FusedPreprocessor
+
+
+def make_frame(n_rows=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "Flow Duration": rng.integers(0, 10 ** 6, n_rows),
+        "Flow Bytes/s": rng.lognormal(8.0, 3.0, n_rows),
+        "Flow IAT Mean": rng.normal(100.0, 20.0, n_rows),
+        "Empty": np.nan,
+    })
+    frame.loc[::7, "Flow Bytes/s"] = np.inf
+    frame.loc[::11, "Flow Bytes/s"] = -np.inf
+    frame.loc[::5, "Flow IAT Mean"] = np.nan
+    return frame
+
+
+def test_fused_kernel_matches_sklearn(tmp_path):
+    frame = make_frame()
+    transformation = DataTransformation(Configuration("config/config.yaml"))
+    preprocessor = transformation.get_data_transformer_object(frame).fit(frame)
+
+    # Scoring columns arrive in a different order; the all-missing column is dropped by the imputer
+    input_columns = ["Empty", "Flow IAT Mean", "Flow Bytes/s", "Flow Duration"]
+    fused = FusedPreprocessor.from_column_transformer(preprocessor, input_columns)
+    assert fused.feature_columns == ["Flow Duration", "Flow Bytes/s", "Flow IAT Mean"]
+
+    path = str(tmp_path / "fused.npz")
+    fused.save(path)
+    fused = FusedPreprocessor.load(path)
+
+    expected = preprocessor.transform(frame)
+    values = frame[input_columns].to_numpy()
+    for batch in (values, values.astype(np.float32)):
+        result = fused.transform(batch)
+        assert result.dtype == np.float32 and result.shape == expected.shape
+        assert np.all(np.isfinite(result))
+        assert np.allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_buffers_are_reused():
+    frame = make_frame(n_rows=100)
+    transformation = DataTransformation(Configuration("config/config.yaml"))
+    preprocessor = transformation.get_data_transformer_object(frame).fit(frame)
+    fused = FusedPreprocessor.from_column_transformer(preprocessor, list(frame.columns))
+    values = frame.to_numpy()
+
+    first = fused.transform(values)
+    second = fused.transform(values[:50])
+    assert np.shares_memory(first, second)
+
+    out = np.empty((100, fused.n_features), dtype=np.float32)
+    assert fused.transform(values, out=out) is out
+    assert np.array_equal(out, first)
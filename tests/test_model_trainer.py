@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+from src.components.model_search import HyperparameterSearch
+from src.components.model_trainer import ModelTrainer
+from src.config.configuration import Configuration
+from src.models.xgboost_model import balanced_class_weights, stratified_holdout_mask
+from src.utils.utils import create_numpy_memmap, load_object, save_object
+
+
+def test_holdout_and_class_weights():
+    labels = np.repeat([0, 1, 2], [900, 90, 1])
+    holdout = stratified_holdout_mask(labels, 0.1, random_state=0)
+    assert np.bincount(labels[holdout], minlength=3).tolist() == [90, 9, 0]
+    assert np.array_equal(holdout, stratified_holdout_mask(labels, 0.1, random_state=0))
+
+    weights = balanced_class_weights(labels, 4, max_weight=50)
+    assert np.isclose(weights[0], 991 / (3 * 900)) and weights[2] == 50 and weights[3] == 0
+
+
+def make_arrays(tmp_path, split, n_rows, rng):
+    features = create_numpy_memmap(str(tmp_path / f"{split}_features.npy"), (n_rows, 4), dtype=np.float32)
+    labels = create_numpy_memmap(str(tmp_path / f"{split}_labels.npy"), (n_rows,), dtype=np.int32)
+    labels[:] = rng.choice(3, n_rows, p=[0.9, 0.08, 0.02])
+    features[:] = rng.normal(size=(n_rows, 4)) + labels[:, None] * 3
+    features[::7, 1] = np.nan
+    features.flush()
+    labels.flush()
+
+
+def test_trainer_learns_from_memory_mapped_arrays(tmp_path):
+    rng = np.random.default_rng(0)
+    make_arrays(tmp_path, "train", 3000, rng)
+    make_arrays(tmp_path, "test", 1000, rng)
+
+    configuration = Configuration("config/config.yaml")
+    configuration.config["transformation"].update({
+        "array_layout": "separate",
+        "target_object": str(tmp_path / "target_encoder.pkl"),
+        **{f"transformed_{split}_{kind}": str(tmp_path / f"{split}_{kind}.npy")
+           for split in ("train", "test") for kind in ("features", "labels")},
+    })
+    configuration.config["training"].update({
+        "model_output": str(tmp_path / "model.pkl"),
+        "metrics_output": str(tmp_path / "metrics.json"),
+        "num_boost_round": 50,
+        "early_stopping_rounds": 5,
+        "batch_size": 700,
+    })
+    save_object(configuration.get_value("transformation", "target_object"), LabelEncoder().fit(["BENIGN", "Bot", "DDoS"]))
+
+    metrics = ModelTrainer(configuration).initiate_model_trainer()
+    assert metrics["test"]["accuracy"] > 0.95
+    assert metrics["training"]["validation_rows"] == sum(int(0.1 * c) for c in np.bincount(np.load(tmp_path / "train_labels.npy")))
+    assert metrics["training"]["rounds"] >= metrics["training"]["best_iteration"] + 1
+    with open(tmp_path / "metrics.json") as file:
+        assert json.load(file)["test"]["classification_report"]["Bot"]["support"] > 0
+
+    booster = load_object(str(tmp_path / "model.pkl"))
+    assert booster.num_boosted_rounds() == metrics["training"]["best_iteration"] + 1
+
+
+def test_successive_halving_search(tmp_path):
+    rng = np.random.default_rng(1)
+    make_arrays(tmp_path, "train", 2000, rng)
+    make_arrays(tmp_path, "test", 500, rng)
+
+    configuration = Configuration("config/config.yaml")
+    configuration.config["transformation"].update({
+        "array_layout": "separate",
+        "target_object": str(tmp_path / "target_encoder.pkl"),
+        **{f"transformed_{split}_{kind}": str(tmp_path / f"{split}_{kind}.npy")
+           for split in ("train", "test") for kind in ("features", "labels")},
+    })
+    configuration.config["training"].update({
+        "model_output": str(tmp_path / "model.pkl"),
+        "metrics_output": str(tmp_path / "metrics.json"),
+        "num_boost_round": 20,
+        "early_stopping_rounds": 5,
+        "search": {
+            "enabled": True, "n_candidates": 4, "eta": 2, "min_fraction": 0.5, "max_workers": 2,
+            "space": {"max_depth": [2, 4], "learning_rate": [0.1, 0.3]},
+        },
+    })
+    save_object(configuration.get_value("transformation", "target_object"), LabelEncoder().fit(["BENIGN", "Bot", "DDoS"]))
+
+    metrics = HyperparameterSearch(configuration).initiate_model_search()
+    rungs = metrics["search"]["rungs"]
+    assert [rung["fraction"] for rung in rungs] == [0.5, 1.0]
+    assert [len(rung["results"]) for rung in rungs] == [4, 2]
+    assert rungs[0]["results"][0]["train_rows"] < rungs[1]["results"][0]["train_rows"]
+    # Only the better half of the first rung is trained on all rows
+    survivors = [result["params"] for result in rungs[0]["results"][:2]]
+    assert sorted(map(str, survivors)) == sorted(str(result["params"]) for result in rungs[1]["results"])
+    # The final model is the last rung's winner, not a second training run
+    assert metrics["training"]["reused_from_search"]
+    assert metrics["training"]["best_iteration"] == rungs[1]["results"][0]["best_iteration"]
+    assert load_object(str(tmp_path / "model.pkl")).num_boosted_rounds() == metrics["training"]["best_iteration"] + 1
+
+    with open(tmp_path / "metrics.json") as file:
+        assert json.load(file)["search"]["best_params"] == metrics["search"]["best_params"]
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.components.data_validation import DataValidation
+from src.config.configuration import Configuration
+from src.pipeline.runner import PipelineRunner, PipelineStage
+
+
+def make_configuration():
+    configuration = Configuration("config/config.yaml")
+    configuration.config["cache"] = {"enabled": False}
+    return configuration
+
+
+def writer(path, log, delay=0.0, barrier=None):
+    def run():
+        if barrier is not None:
+            # Only passes if the sibling stage is running at the same time
+            barrier.wait(timeout=5)
+        time.sleep(delay)
+        with open(path, "w") as file:
+            file.write("done")
+        log.append(path)
+    return run
+
+
+def test_independent_stages_run_concurrently_after_their_inputs(tmp_path):
+    log = []
+    barrier = threading.Barrier(2)
+    source, left, right, joined = (str(tmp_path / name) for name in ["source", "left", "right", "joined"])
+    stages = [
+        PipelineStage("source", writer(source, log), outputs=[source]),
+        PipelineStage("left", writer(left, log, barrier=barrier), inputs=[source], outputs=[left]),
+        PipelineStage("right", writer(right, log, barrier=barrier), inputs=[source], outputs=[right]),
+        PipelineStage("join", writer(joined, log), inputs=[left, right], outputs=[joined]),
+    ]
+
+    report = PipelineRunner(make_configuration(), stages, max_workers=2).run()
+
+    assert log[0] == source and log[-1] == joined
+    assert set(report) == {"source", "left", "right", "join"}
+    assert all(metrics["seconds"] >= 0 and metrics["peak_rss_mb"] > 0 for metrics in report.values())
+
+
+def test_resume_runs_only_downstream_stages(tmp_path):
+    log = []
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    stages = [
+        PipelineStage("first", writer(first, log), outputs=[first]),
+        PipelineStage("second", writer(second, log), inputs=[first], outputs=[second]),
+    ]
+    runner = PipelineRunner(make_configuration(), stages)
+
+    # The skipped stage's outputs must exist
+    with pytest.raises(Exception, match="outputs are missing"):
+        runner.run(from_stage="second")
+
+    runner.run()
+    log.clear()
+    assert list(runner.run(from_stage="second")) == ["second"]
+    assert log == [second]
+
+
+def test_cycles_are_rejected(tmp_path):
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+    stages = [
+        PipelineStage("a", lambda: None, inputs=[b], outputs=[a]),
+        PipelineStage("b", lambda: None, inputs=[a], outputs=[b]),
+    ]
+    with pytest.raises(Exception, match="cycle"):
+        PipelineRunner(make_configuration(), stages)
+
+
+def test_resume_after_validation_that_quarantined_nothing(tmp_path):
+    configuration = make_configuration()
+    configuration.config["validation"].update({
+        name: str(tmp_path / os.path.basename(configuration.config["validation"][name]))
+        for name in [
+            "valid_train_file_path", "valid_test_file_path", "quarantine_train_file_path", "quarantine_test_file_path",
+            "manifest_file", "report_file", "schema_report_file", "baseline_file",
+        ]
+    })
+    validation = DataValidation(configuration)
+    required, optional = validation.get_output_paths(), validation.get_optional_output_paths()
+    assert str(tmp_path / "train_quarantine.parquet") in optional and not set(required) & set(optional)
+
+    def clean_validation():
+        # A run with no invalid rows writes no quarantine files
+        for path in required:
+            with open(path, "w") as file:
+                file.write("done")
+
+    log = []
+    transformed = str(tmp_path / "transformed")
+    stages = [
+        PipelineStage("data_validation", clean_validation, outputs=required, optional_outputs=optional),
+        PipelineStage("data_transformation", writer(transformed, log), outputs=[transformed], depends_on=["data_validation"]),
+    ]
+    runner = PipelineRunner(configuration, stages)
+    runner.run()
+
+    log.clear()
+    assert list(runner.run(from_stage="data_transformation")) == ["data_transformation"]
+    assert log == [transformed]
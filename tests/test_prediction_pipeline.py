@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.preprocessing import LabelEncoder
+
+from src.components.data_transformation import DataTransformation
+from src.config.configuration import Configuration
+from src.config.schema import Schema
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.utils import save_object
+
+
+def make_artifacts(tmp_path, n_rows=2000, seed=0):
+    configuration = Configuration("config/config.yaml")
+    configuration.config["transformation"].update({
+        "transformer_object": str(tmp_path / "transformer.pkl"),
+        "target_object": str(tmp_path / "target_encoder.pkl"),
+        "fused_preprocessor_object": str(tmp_path / "fused_preprocessor.npz"),
+    })
+    configuration.config["training"]["model_output"] = str(tmp_path / "model.pkl")
+
+    rng = np.random.default_rng(seed)
+    columns = [column for column in Schema("config/schema.yaml").column_names if column != "Label"]
+    labels = rng.choice(["BENIGN", "DDoS", "PortScan"], n_rows)
+    frame = pd.DataFrame(rng.lognormal(3.0, 1.0, (n_rows, len(columns))), columns=columns)
+    frame["Flow Duration"] += (labels == "DDoS") * 100
+    frame.iloc[::5, 3] = np.nan
+
+    transformation = DataTransformation(configuration)
+    preprocessor = transformation.get_data_transformer_object(frame).fit(frame)
+    encoder = LabelEncoder().fit(labels)
+    booster = xgb.train(
+        {"objective": "multi:softprob", "num_class": 3, "tree_method": "hist", "max_depth": 3},
+        xgb.DMatrix(preprocessor.transform(frame), label=encoder.transform(labels)),
+        num_boost_round=10
+    )
+    save_object(configuration.get_value("transformation", "transformer_object"), preprocessor)
+    save_object(configuration.get_value("transformation", "target_object"), encoder)
+    save_object(configuration.get_value("training", "model_output"), booster)
+    return configuration, frame, preprocessor, booster
+
+
+def test_matches_sklearn_transformer_and_model(tmp_path):
+    configuration, frame, preprocessor, booster = make_artifacts(tmp_path)
+    pipeline = PredictionPipeline(configuration)
+    batch = frame.iloc[:1000]
+
+    expected = preprocessor.transform(batch)
+    assert np.allclose(pipeline.transform(batch), expected, rtol=1e-5, atol=1e-5)
+    assert np.allclose(pipeline.transform(batch.to_numpy()), expected, rtol=1e-5, atol=1e-5)
+
+    # Reference: the sklearn transformer and the booster, independent of the fused kernel
+    probabilities = booster.predict(xgb.DMatrix(preprocessor.transform(batch)))
+    expected_labels = pipeline.classes[probabilities.argmax(axis=1)]
+    for flows in (batch, batch.to_numpy(), batch.to_dict("records")):
+        labels, scores = pipeline.predict(flows)
+        # float32 features can land on the other side of a split threshold than the
+        # float64 reference, so a few rows in a thousand may differ; the rest match to 1e-5
+        close = np.abs(pipeline.predict_proba(flows) - probabilities).max(axis=1) <= 1e-5
+        assert close.mean() >= 0.99
+        assert (labels == expected_labels).mean() >= 0.99
+        assert np.allclose(scores[close], probabilities[close].max(axis=1), atol=1e-5)
+
+
+def test_accepts_partial_flow_dicts(tmp_path):
+    configuration, frame, preprocessor, _ = make_artifacts(tmp_path)
+    pipeline = PredictionPipeline(configuration)
+
+    flows = frame.iloc[:3].to_dict("records")
+    del flows[1]["Flow Duration"]
+    flows[2]["Flow IAT Mean"] = None
+
+    expected = frame.iloc[:3].copy()
+    expected.loc[expected.index[1], "Flow Duration"] = np.nan
+    expected.loc[expected.index[2], "Flow IAT Mean"] = np.nan
+    assert np.allclose(pipeline.transform(flows), preprocessor.transform(expected), rtol=1e-5, atol=1e-5)
+    assert pipeline.predict([])[0].shape == (0,)
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from pymongo import errors
+
+import src.utils.push_data_to_db as push_data_to_db
+
+
+class FakeInsertResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class FakeCollection:
+    """
+    Thread-safe stand-in for a MongoDB collection with a fixed round-trip latency,
+    a unique `_id` index and a number of transient failures before inserts start
+    succeeding. With `rendezvous`, the first that many calls wait for each other,
+    so they only complete if they are in flight at the same time.
+    """
+
+    def __init__(self, latency=0.02, transient_failures=0, rendezvous=0):
+        self.latency = latency
+        self.transient_failures = transient_failures
+        self.documents = []
+        self.ids = set()
+        self.calls = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._barrier = threading.Barrier(rendezvous) if rendezvous else None
+        self._lock = threading.Lock()
+
+    def insert_many(self, documents, ordered=True):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            wait = self._barrier is not None and self.calls <= self._barrier.parties
+            fail = self.transient_failures > 0
+            if fail:
+                self.transient_failures -= 1
+        try:
+            if wait:
+                self._barrier.wait(timeout=10)
+            time.sleep(self.latency)
+            if fail:
+                raise errors.AutoReconnect("transient network error")
+            with self._lock:
+                write_errors = []
+                for index, document in enumerate(documents):
+                    if "_id" in document and document["_id"] in self.ids:
+                        write_errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key"})
+                        continue
+                    self.ids.add(document.get("_id"))
+                    self.documents.append(document)
+            if write_errors:
+                raise errors.BulkWriteError({
+                    "writeErrors": write_errors,
+                    "nInserted": len(documents) - len(write_errors)
+                })
+            return FakeInsertResult(list(range(len(documents))))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+
+class FakeClient:
+    """
+    Serves the fake collection as `client[<any database>]["flows"]`.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getitem__(self, database_name):
+        return {"flows": self.collection}
+
+
+def make_handler(monkeypatch, collection, **kwargs):
+    monkeypatch.setattr(push_data_to_db, "get_mongo_client", lambda *args, **kw: FakeClient(collection))
+    return push_data_to_db.NetworkDataHandler(**kwargs)
+
+
+def test_batches_are_inserted_concurrently_with_bounded_parallelism(monkeypatch):
+    # The first four inserts only return once all four are in flight together
+    collection = FakeCollection(latency=0.01, rendezvous=4)
+    handler = make_handler(monkeypatch, collection, max_workers=4, max_queued_batches=2)
+
+    held = []
+
+    def batches():
+        for number, start in enumerate(range(0, 2000, 100)):
+            # Batches handed out but not yet finished, when the next one is requested
+            held.append(number - collection.completed)
+            yield [{"Destination Port": i, "Label": "BENIGN"} for i in range(start, start + 100)]
+
+    inserted = handler.insert_record_batches_to_db(batches(), "db", "flows")
+
+    assert inserted == 2000
+    assert len(collection.documents) == 2000
+    assert collection.max_in_flight == 4
+    assert max(held) <= 4 + 2
+    assert handler.last_insert_stats["records_per_second"] > 0
+
+
+def test_transient_failures_are_retried_with_backoff(monkeypatch):
+    collection = FakeCollection(latency=0.0, transient_failures=3)
+    delays = []
+    handler = make_handler(
+        monkeypatch, collection, max_workers=1, max_retries=5, backoff_base=1.0, backoff_cap=3.0, sleep=delays.append
+    )
+
+    records = [{"Destination Port": i} for i in range(50)]
+    assert handler.insert_records_to_db(records, "db", "flows", batch_size=10) == 50
+    assert collection.calls == 5 + 3
+    # One jittered wait per failed attempt, growing with the attempt and capped
+    assert len(delays) == 3
+    assert all(0 <= delay <= limit for delay, limit in zip(delays, [1.0, 2.0, 3.0]))
+    # Documents are stamped when their batch is sent, not when it was built
+    assert all(isinstance(document["ingested_at"], datetime) for document in collection.documents)
+
+
+def test_backoff_delay_grows_and_is_capped(monkeypatch):
+    handler = make_handler(monkeypatch, FakeCollection(), backoff_base=1.0, backoff_cap=5.0)
+    for attempt in range(6):
+        assert 0 <= handler._backoff_delay(attempt) <= min(5.0, 2 ** attempt)
+
+
+def test_csv_is_streamed_in_batches(monkeypatch, tmp_path):
+    collection = FakeCollection(latency=0.0)
+    handler = make_handler(monkeypatch, collection, max_workers=2, max_queued_batches=1)
+
+    csv_path = tmp_path / "flows.csv"
+    pd.DataFrame({"Destination Port": range(2500), "Flow Bytes/s": 1.5, "Label": "DDoS"}).to_csv(csv_path, index=False)
+
+    assert handler.load_csv_to_db(str(csv_path), "db", "flows", batch_size=1000) == 2500
+    assert collection.calls == 3
+    assert isinstance(collection.documents[0]["Destination Port"], int)
+
+
+def test_interrupted_load_resumes_from_checkpoint(monkeypatch, tmp_path):
+    collection = FakeCollection(latency=0.0)
+    handler = make_handler(monkeypatch, collection, max_workers=1, max_retries=1)
+
+    csv_path = tmp_path / "flows.csv"
+    pd.DataFrame({"Destination Port": [80, 443] * 1250, "Label": "BENIGN"}).to_csv(csv_path, index=False)
+    checkpoint_path = str(tmp_path / "flows.checkpoint.json")
+
+    # Fail every insert after the second batch, as if the loader crashed mid-way
+    insert_many = collection.insert_many
+    calls = {"count": 0}
+
+    def flaky_insert_many(documents, ordered=True):
+        calls["count"] += 1
+        if calls["count"] > 2:
+            raise errors.AutoReconnect("connection lost")
+        return insert_many(documents, ordered=ordered)
+
+    monkeypatch.setattr(collection, "insert_many", flaky_insert_many)
+    with pytest.raises(Exception):
+        handler.load_csv_to_db(str(csv_path), "db", "flows", batch_size=500, checkpoint_path=checkpoint_path)
+    assert len(collection.documents) == 1000
+
+    # The rerun only sends the remaining rows; repeated flows keep distinct IDs
+    monkeypatch.setattr(collection, "insert_many", insert_many)
+    assert handler.load_csv_to_db(str(csv_path), "db", "flows", batch_size=500, checkpoint_path=checkpoint_path) == 1500
+    assert len(collection.documents) == 2500
+
+    # Without the checkpoint every row is re-sent, but content-hash IDs keep the load idempotent
+    os.remove(checkpoint_path)
+    assert handler.load_csv_to_db(str(csv_path), "db", "flows", batch_size=500, checkpoint_path=checkpoint_path) == 0
+    assert len(collection.documents) == 2500
+
+
+def test_skipped_rows_match_the_unskipped_stream(monkeypatch, tmp_path):
+    handler = make_handler(monkeypatch, FakeCollection(latency=0.0))
+    csv_path = tmp_path / "flows.csv"
+    pd.DataFrame({"Destination Port": [80, 443] * 1250, "Label": "BENIGN"}).to_csv(csv_path, index=False)
+
+    full = [record for batch in handler.iter_csv_record_batches(str(csv_path), batch_size=500) for record in batch]
+    # An offset inside a chunk drops only the rows before it
+    resumed = [record for batch in handler.iter_csv_record_batches(str(csv_path), batch_size=500, skip_rows=1234) for record in batch]
+    assert resumed == full[1234:]
+    assert list(handler.iter_csv_record_batches(str(csv_path), batch_size=500, skip_rows=2500)) == []
+
+
+def test_document_ids_do_not_depend_on_batch_size(monkeypatch, tmp_path):
+    handler = make_handler(monkeypatch, FakeCollection(latency=0.0))
+    csv_path = tmp_path / "flows.csv"
+    # The missing value makes "Flow Duration" float64 only in the chunk that holds it
+    csv_path.write_text("Flow Duration,Label\n10,BENIGN\n20,DDoS\n,BENIGN\n40,DDoS\n50,BENIGN\n60,DDoS\n")
+
+    def document_ids(batch_size):
+        return [record["_id"] for batch in handler.iter_csv_record_batches(str(csv_path), batch_size=batch_size) for record in batch]
+
+    assert document_ids(2) == document_ids(3) == document_ids(6)
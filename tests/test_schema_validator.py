@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from src.config.schema import Schema
+from src.utils.utils import save_dataframe, write_yaml_file
+from src.validation.schema_validator import SchemaValidator
+
+
+def make_schema(tmp_path):
+    path = str(tmp_path / "schema.yaml")
+    write_yaml_file(path, {"columns": {
+        "Total Fwd Packets": {"dtype": "int64", "min": 0},
+        "Flow Bytes/s": {"dtype": "float64", "allow_inf": True},
+        "Flow IAT Mean": {"dtype": "float64", "min": 0, "max": 100},
+        "Label": {"dtype": "object", "allowed_values": ["BENIGN", "DDoS"]},
+    }}, replace=True)
+    return Schema(path)
+
+
+def make_frame():
+    return pd.DataFrame({
+        "Total Fwd Packets": np.array([1, 2, -3, 4, 5, 6], dtype=np.int32),
+        "Flow Bytes/s": [1.0, np.inf, np.nan, -np.inf, 2.0, 3.0],
+        "Flow IAT Mean": [0.0, 50.0, 150.0, np.inf, np.nan, -1.0],
+        "Label": pd.Categorical(["BENIGN", "DDoS", "PortScan", "BENIGN", None, "Bot"]),
+    })
+
+
+def test_chunked_summary_matches_whole_frame_and_file(tmp_path):
+    schema = make_schema(tmp_path)
+    dataframe = make_frame()
+    path = str(tmp_path / "flows.parquet")
+    save_dataframe(path, dataframe)
+
+    validator = SchemaValidator(schema)
+    whole = validator.validate_frame(dataframe, chunk_size=100)
+    assert validator.validate_frame(dataframe, chunk_size=2) == whole
+    assert validator.validate_file(path, chunk_size=4) == whole
+
+    columns = whole["columns"]
+    assert whole["rows"] == 6 and not whole["structural_errors"] and not whole["valid"]
+    assert columns["Total Fwd Packets"]["below_min"] == 1 and columns["Total Fwd Packets"]["min"] == -3
+    # Infinite values only count against columns without allow_inf
+    assert columns["Flow Bytes/s"]["posinf"] == 1 and columns["Flow Bytes/s"]["valid"]
+    assert columns["Flow Bytes/s"]["nulls"] == 1
+    assert columns["Flow IAT Mean"]["above_max"] == 2 and columns["Flow IAT Mean"]["below_min"] == 1
+    assert columns["Label"]["disallowed_values"] == 2 and columns["Label"]["unexpected_values"] == ["Bot", "PortScan"]
+    assert columns["Label"]["nulls"] == 1
+    # 1 below min, 1 inf + 2 above max + 1 below min, 2 unseen labels
+    assert whole["invalid_values"] == 7
+
+
+def test_structural_errors(tmp_path):
+    schema = make_schema(tmp_path)
+    dataframe = make_frame().drop(columns=["Flow IAT Mean"]).assign(Extra=1.0)
+    dataframe["Total Fwd Packets"] = dataframe["Total Fwd Packets"] + 0.5
+
+    summary = SchemaValidator(schema).validate_frame(dataframe)
+    assert summary["structural_errors"]
+    assert summary["missing_columns"] == ["Flow IAT Mean"] and summary["unexpected_columns"] == ["Extra"]
+    assert not summary["columns"]["Total Fwd Packets"]["dtype_ok"]
+    assert summary["columns"]["Total Fwd Packets"]["stored_dtype"] == "float64"
+
+    # An int64 column stored as float because of missing values still matches
+    dataframe = make_frame()
+    dataframe["Total Fwd Packets"] = dataframe["Total Fwd Packets"].astype("float64")
+    dataframe.loc[0, "Total Fwd Packets"] = np.nan
+    assert SchemaValidator(schema).validate_frame(dataframe)["columns"]["Total Fwd Packets"]["dtype_ok"]
@@ -0,0 +1,121 @@
+import os
+
+from src.config.configuration import Configuration
+from src.pipeline.stage_cache import StageCache
+
+
+def make_cache(tmp_path, **cache_settings):
+    configuration = Configuration("config/config.yaml")
+    configuration.config["cache"] = {"enabled": True, "cache_dir": str(tmp_path / "cache"), **cache_settings}
+    return configuration, StageCache(configuration)
+
+
+def make_stage(input_path, output_path, calls):
+    def stage():
+        calls.append(1)
+        with open(input_path) as source, open(output_path, "w") as destination:
+            destination.write(source.read().upper())
+    return stage
+
+
+def test_unchanged_stage_is_skipped_and_changes_invalidate(tmp_path):
+    configuration, cache = make_cache(tmp_path)
+    input_path, output_path = str(tmp_path / "train.csv"), str(tmp_path / "out" / "report.txt")
+    os.makedirs(os.path.dirname(output_path))
+    with open(input_path, "w") as file:
+        file.write("a,b\n1,2\n")
+
+    calls = []
+    run = lambda: cache.run("stage", make_stage(input_path, output_path, calls), [input_path], [output_path], ["validation"])
+
+    assert run() is False and run() is True
+    assert len(calls) == 1
+
+    # A deleted output is restored from the cache without running the stage
+    os.remove(output_path)
+    assert run() is True and open(output_path).read() == "A,B\n1,2\n"
+
+    # Changing the input contents or the config section misses
+    with open(input_path, "w") as file:
+        file.write("a,b\n3,4\n")
+    assert run() is False and open(output_path).read() == "A,B\n3,4\n"
+    configuration.config["validation"]["drift_threshold"] = 0.01
+    assert run() is False
+    assert len(calls) == 3
+
+    # The rewritten output never clobbered the first cached copy
+    with open(input_path, "w") as file:
+        file.write("a,b\n1,2\n")
+    configuration.config["validation"]["drift_threshold"] = 0.05
+    assert run() is True and open(output_path).read() == "A,B\n1,2\n"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    _, cache = make_cache(tmp_path, max_entries=2)
+    output_path = str(tmp_path / "out.txt")
+    calls = []
+    for index in range(4):
+        input_path = str(tmp_path / f"input_{index}.csv")
+        with open(input_path, "w") as file:
+            file.write(str(index))
+        cache.run("stage", make_stage(input_path, output_path, calls), [input_path], [output_path], [])
+
+    entries = [name for name in os.listdir(cache.cache_dir) if os.path.isdir(os.path.join(cache.cache_dir, name))]
+    assert len(entries) == 2
+
+
+def test_artifact_writers_never_write_through_cached_links(tmp_path):
+    from src.utils.utils import load_object, save_object
+
+    configuration, cache = make_cache(tmp_path)
+    output_path = str(tmp_path / "model.pkl")
+    stage = lambda: save_object(output_path, {"version": 1})
+    assert cache.run("stage", stage, [], [output_path], ["training.random_state"]) is False
+
+    # A hit links the cached file back into place; rewriting it outside the cache,
+    # or with the cache disabled, must leave the cached copy intact
+    assert cache.run("stage", stage, [], [output_path], ["training.random_state"]) is True
+    save_object(output_path, {"version": 2})
+    cache.enabled = False
+    cache.run("stage", lambda: save_object(output_path, {"version": 3}), [], [output_path], [])
+    cache.enabled = True
+    assert cache.run("stage", stage, [], [output_path], ["training.random_state"]) is True
+    assert load_object(output_path) == {"version": 1}
+
+    # Single config values take part in the key
+    configuration.config["training"]["random_state"] += 1
+    assert cache.run("stage", stage, [], [output_path], ["training.random_state"]) is False
+
+
+def test_key_covers_the_code_a_stage_imports(tmp_path, monkeypatch):
+    import src.pipeline.stage_cache as stage_cache
+
+    # A stand-in package: the stage's module and a helper it imports
+    package_dir = tmp_path / "src"
+    (package_dir / "components").mkdir(parents=True)
+    (package_dir / "components" / "stage.py").write_text("from src.utils.helpers import scale\n")
+    helper = package_dir / "helpers.py"
+    helper.write_text("def scale(x):\n    return x\n")
+    monkeypatch.setattr(stage_cache, "PACKAGE_DIR", str(package_dir))
+
+    _, cache = make_cache(tmp_path)
+    key = cache.compute_key("stage", [], [])
+    assert cache.compute_key("stage", [], []) == key
+    helper.write_text("def scale(x):\n    return 2 * x\n")
+    assert cache.compute_key("stage", [], []) != key
+
+
+def test_outputs_a_run_did_not_write_are_restored_as_absent(tmp_path):
+    _, cache = make_cache(tmp_path)
+    report_path, quarantine_path = str(tmp_path / "report.json"), str(tmp_path / "quarantine.parquet")
+
+    def stage():
+        with open(report_path, "w") as file:
+            file.write("{}")
+
+    assert cache.run("stage", stage, [], [report_path, quarantine_path], []) is False
+    # A leftover optional output from another run is removed on a hit
+    with open(quarantine_path, "w") as file:
+        file.write("stale")
+    assert cache.run("stage", stage, [], [report_path, quarantine_path], []) is True
+    assert os.path.exists(report_path) and not os.path.exists(quarantine_path)
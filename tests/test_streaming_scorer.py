@@ -0,0 +1,124 @@
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.pipeline.streaming_scorer import StreamingScorer
+from tests.test_prediction_pipeline import make_artifacts
+
+
+def make_scorer(tmp_path, alerts, **settings):
+    configuration, frame, _, _ = make_artifacts(tmp_path)
+    configuration.config["streaming"].update({
+        "batch_size": 100, "max_batch_delay_ms": 20, "workers": 2, "alert_threshold": 0.0,
+        "id_fields": ["Flow ID"], "report_interval_seconds": 0.05, **settings
+    })
+    pipeline = PredictionPipeline(configuration)
+    return StreamingScorer(configuration, pipeline=pipeline, alert_sink=alerts.append), pipeline, frame
+
+
+def test_scores_ndjson_from_a_socket(tmp_path):
+    alerts = []
+    scorer, pipeline, frame = make_scorer(tmp_path, alerts)
+    flows = frame.iloc[:1000].to_dict("records")
+    for index, flow in enumerate(flows):
+        flow["Flow ID"] = f"flow-{index}"
+    flows[5]["Flow Bytes/s"] = float("inf")
+
+    # A local stand-in for the flow exporter: send some flows, pause longer than
+    # the batch deadline so a partial batch is cut, then send the rest
+    server = socket.create_server(("127.0.0.1", 0))
+    early_alerts = []
+
+    def export():
+        connection, _ = server.accept()
+        with connection:
+            connection.sendall(b"".join(json.dumps(flow).encode() + b"\n" for flow in flows[:30]))
+            time.sleep(0.3)
+            early_alerts.append(len(alerts))
+            connection.sendall(b"not json\n")
+            connection.sendall(b"".join(json.dumps(flow).encode() + b"\n" for flow in flows[30:]))
+
+    exporter = threading.Thread(target=export)
+    exporter.start()
+    metrics = scorer.run(f"tcp://127.0.0.1:{server.getsockname()[1]}")
+    exporter.join()
+    server.close()
+
+    assert metrics["flows_read"] == metrics["flows_scored"] == 1000
+    assert metrics["parse_errors"] == 1
+    assert metrics["flows_per_second"] > 0 and metrics["lag_ms"]["p99"] >= metrics["lag_ms"]["p50"]
+    # The first 30 flows were scored before the connection went quiet
+    labels, scores = pipeline.predict(flows)
+    expected = {f"flow-{index}": label for index, label in enumerate(labels) if label != "BENIGN"}
+    assert early_alerts[0] == sum(1 for index in range(30) if f"flow-{index}" in expected)
+    assert {alert["Flow ID"]: alert["label"] for alert in alerts} == expected
+
+
+def test_scores_csv_with_backpressure(tmp_path):
+    alerts = []
+    scorer, pipeline, frame = make_scorer(
+        tmp_path, alerts, format="csv", record_queue_size=50, batch_queue_size=1, alert_queue_size=5
+    )
+    sink_calls = []
+
+    def slow_sink(alert):
+        time.sleep(0.001)
+        sink_calls.append(scorer.metrics.flows_read - scorer.metrics.flows_scored)
+        alerts.append(alert)
+
+    scorer.alert_sink = slow_sink
+    batch = frame.iloc[:600]
+    columns = [column for column in batch.columns if column != "Flow Duration"]
+    path = tmp_path / "flows.csv"
+    with open(path, "w") as file:
+        # CICFlowMeter-style header with padded names; one column missing and one empty field
+        file.write(",".join(f" {column}" for column in columns) + "\n")
+        for index, row in enumerate(batch[columns].itertuples(index=False)):
+            values = ["" if index == 3 and position == 0 else repr(float(value)) for position, value in enumerate(row)]
+            file.write(",".join(values) + "\n")
+
+    metrics = scorer.run(str(path))
+    assert metrics["flows_scored"] == 600
+
+    expected_frame = batch.copy()
+    expected_frame["Flow Duration"] = np.nan
+    expected_frame.iloc[3, expected_frame.columns.get_loc(columns[0])] = np.nan
+    labels, _ = pipeline.predict(expected_frame)
+    assert sorted(alert["label"] for alert in alerts) == sorted(label for label in labels if label != "BENIGN")
+    # While the sink is slow, flows read but not yet scored stay bounded by the queues: the record
+    # queue, the reader's pending flow, the batch being cut, the batch queue and one batch per worker
+    assert max(sink_calls) <= 50 + 1 + 100 + 100 + 2 * 100 < len(batch)
+
+
+def test_malformed_ndjson_records_do_not_stop_the_stream(tmp_path):
+    alerts = []
+    scorer, pipeline, frame = make_scorer(tmp_path, alerts)
+    flows = frame.iloc[:300].to_dict("records")
+    for index, flow in enumerate(flows):
+        flow["Flow ID"] = f"flow-{index}"
+    # Empty, non-numeric and non-scalar values are imputed like missing ones
+    flows[10]["Flow Duration"] = ""
+    flows[150]["Flow Duration"] = "x"
+    flows[250]["Flow Duration"] = [1, 2]
+
+    path = tmp_path / "flows.ndjson"
+    with open(path, "w") as file:
+        for index, flow in enumerate(flows):
+            if index in (50, 200):
+                # Valid JSON that is not a flow record
+                file.write("[1, 2, 3]\n" if index == 50 else "\"flow\"\n")
+            file.write(json.dumps(flow) + "\n")
+
+    metrics = scorer.run(str(path))
+    assert metrics["parse_errors"] == 2
+    assert metrics["flows_read"] == metrics["flows_scored"] == 300
+
+    expected_frame = frame.iloc[:300].copy()
+    expected_frame.iloc[[10, 150, 250], expected_frame.columns.get_loc("Flow Duration")] = np.nan
+    labels, _ = pipeline.predict(expected_frame)
+    expected = {f"flow-{index}": label for index, label in enumerate(labels) if label != "BENIGN"}
+    assert {alert["Flow ID"]: alert["label"] for alert in alerts} == expected